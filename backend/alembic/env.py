@@ -36,6 +36,14 @@ def get_url():
     return settings.database_url
 
 
+def include_name(name, type_, parent_names):
+    # Monthly borrowing_records partitions are managed by app.partitions,
+    # not by autogenerate.
+    if type_ == "table" and name and name.startswith("borrowing_records_"):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -54,6 +62,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -82,7 +91,11 @@ def run_migrations_online() -> None:
         await connection.run_sync(do_migrations)
 
     def do_migrations(connection: Connection) -> None:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
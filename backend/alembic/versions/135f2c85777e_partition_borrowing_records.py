@@ -0,0 +1,125 @@
+"""partition borrowing_records by borrowed_date
+
+Revision ID: 135f2c85777e
+Revises: 98790c5a10ba
+Create Date: 2026-10-19 09:12:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '135f2c85777e'
+down_revision: Union[str, Sequence[str], None] = '98790c5a10ba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions created up front beyond the current month; later months
+# are created by `python -m app.partitions ensure` / application startup.
+MONTHS_AHEAD = 3
+
+
+def _drop_legacy_indexes() -> None:
+    op.drop_index(op.f('ix_borrowing_records_member_id'), table_name='borrowing_records')
+    op.drop_index(op.f('ix_borrowing_records_id'), table_name='borrowing_records')
+    op.drop_index(op.f('ix_borrowing_records_book_id'), table_name='borrowing_records')
+
+
+def _create_indexes() -> None:
+    op.create_index(op.f('ix_borrowing_records_book_id'), 'borrowing_records', ['book_id'], unique=False)
+    op.create_index(op.f('ix_borrowing_records_id'), 'borrowing_records', ['id'], unique=False)
+    op.create_index(op.f('ix_borrowing_records_member_id'), 'borrowing_records', ['member_id'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _drop_legacy_indexes()
+    op.rename_table('borrowing_records', 'borrowing_records_legacy')
+    op.execute("ALTER TABLE borrowing_records_legacy RENAME CONSTRAINT borrowing_records_pkey TO borrowing_records_legacy_pkey")
+    op.execute("ALTER SEQUENCE borrowing_records_id_seq OWNED BY NONE")
+
+    op.create_table('borrowing_records',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('borrowing_records_id_seq')"), nullable=False),
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('member_id', sa.Integer(), nullable=False),
+    sa.Column('borrowed_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('returned_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['book_id'], ['books.id'], ),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+    sa.PrimaryKeyConstraint('id', 'borrowed_date'),
+    postgresql_partition_by='RANGE (borrowed_date)',
+    )
+    op.execute("ALTER SEQUENCE borrowing_records_id_seq OWNED BY borrowing_records.id")
+    _create_indexes()
+    op.create_index('ix_borrowing_records_borrowed_date', 'borrowing_records', ['borrowed_date'], unique=False)
+
+    op.execute("CREATE TABLE borrowing_records_default PARTITION OF borrowing_records DEFAULT")
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month_start timestamptz;
+        BEGIN
+            FOR month_start IN
+                SELECT generate_series(
+                    date_trunc('month', COALESCE(
+                        (SELECT min(COALESCE(borrowed_date, created_at)) FROM borrowing_records_legacy),
+                        now()
+                    ), 'UTC'),
+                    date_trunc('month', now(), 'UTC') + interval '{MONTHS_AHEAD} months',
+                    interval '1 month'
+                )
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF borrowing_records FOR VALUES FROM (%L) TO (%L)',
+                    'borrowing_records_' || to_char(month_start AT TIME ZONE 'UTC', 'YYYY_MM'),
+                    month_start,
+                    month_start + interval '1 month'
+                );
+            END LOOP;
+        END $$;
+    """)
+
+    op.execute("""
+        INSERT INTO borrowing_records (id, book_id, member_id, borrowed_date, returned_date, created_at, updated_at)
+        SELECT id, book_id, member_id, COALESCE(borrowed_date, created_at), returned_date, created_at, updated_at
+        FROM borrowing_records_legacy
+    """)
+    op.drop_table('borrowing_records_legacy')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('borrowing_records', 'borrowing_records_partitioned')
+    op.execute("ALTER TABLE borrowing_records_partitioned RENAME CONSTRAINT borrowing_records_pkey TO borrowing_records_partitioned_pkey")
+    for name in ('ix_borrowing_records_member_id', 'ix_borrowing_records_id', 'ix_borrowing_records_book_id', 'ix_borrowing_records_borrowed_date'):
+        op.drop_index(name, table_name='borrowing_records_partitioned')
+    op.execute("ALTER SEQUENCE borrowing_records_id_seq OWNED BY NONE")
+
+    op.create_table('borrowing_records',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('borrowing_records_id_seq')"), nullable=False),
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('member_id', sa.Integer(), nullable=False),
+    sa.Column('borrowed_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('returned_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['book_id'], ['books.id'], ),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("ALTER SEQUENCE borrowing_records_id_seq OWNED BY borrowing_records.id")
+    _create_indexes()
+
+    op.execute("""
+        INSERT INTO borrowing_records (id, book_id, member_id, borrowed_date, returned_date, created_at, updated_at)
+        SELECT id, book_id, member_id, borrowed_date, returned_date, created_at, updated_at
+        FROM borrowing_records_partitioned
+    """)
+    # Drops the attached partitions too; partitions already moved to the
+    # borrowing_archive schema are left untouched.
+    op.drop_table('borrowing_records_partitioned')
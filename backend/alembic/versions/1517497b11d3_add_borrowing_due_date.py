@@ -0,0 +1,33 @@
+"""add borrowing due_date
+
+Revision ID: 1517497b11d3
+Revises: 135f2c85777e
+Create Date: 2026-10-19 11:40:02.815339
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1517497b11d3'
+down_revision: Union[str, Sequence[str], None] = '135f2c85777e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('borrowing_records', sa.Column('due_date', sa.DateTime(timezone=True), nullable=True))
+    # Existing loans used the fixed 14 day loan period
+    op.execute("UPDATE borrowing_records SET due_date = borrowed_date + interval '14 days'")
+    op.alter_column('borrowing_records', 'due_date', nullable=False)
+    op.create_index('ix_borrowing_records_active_due_date', 'borrowing_records', ['due_date', 'id'], unique=False, postgresql_where=sa.text('returned_date IS NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_borrowing_records_active_due_date', table_name='borrowing_records', postgresql_where=sa.text('returned_date IS NULL'))
+    op.drop_column('borrowing_records', 'due_date')
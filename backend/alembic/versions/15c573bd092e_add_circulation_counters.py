@@ -0,0 +1,49 @@
+"""add circulation counters to books and members
+
+Revision ID: 15c573bd092e
+Revises: 1517497b11d3
+Create Date: 2026-10-19 14:03:27.552091
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '15c573bd092e'
+down_revision: Union[str, Sequence[str], None] = '1517497b11d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, key in (('books', 'book_id'), ('members', 'member_id')):
+        op.add_column(table, sa.Column('total_borrows', sa.Integer(), server_default='0', nullable=False))
+        op.add_column(table, sa.Column('active_loans', sa.Integer(), server_default='0', nullable=False))
+        op.add_column(table, sa.Column('last_borrowed_at', sa.DateTime(timezone=True), nullable=True))
+        op.execute(f"""
+            UPDATE {table}
+            SET total_borrows = stats.total_borrows,
+                active_loans = stats.active_loans,
+                last_borrowed_at = stats.last_borrowed_at
+            FROM (
+                SELECT {key},
+                       count(*) AS total_borrows,
+                       count(*) FILTER (WHERE returned_date IS NULL) AS active_loans,
+                       max(borrowed_date) AS last_borrowed_at
+                FROM borrowing_records
+                GROUP BY {key}
+            ) AS stats
+            WHERE {table}.id = stats.{key}
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('members', 'books'):
+        op.drop_column(table, 'last_borrowed_at')
+        op.drop_column(table, 'active_loans')
+        op.drop_column(table, 'total_borrows')
@@ -0,0 +1,34 @@
+"""add book copies
+
+Revision ID: 1f62c0784de5
+Revises: 15c573bd092e
+Create Date: 2026-10-19 16:21:50.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1f62c0784de5'
+down_revision: Union[str, Sequence[str], None] = '15c573bd092e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('books', sa.Column('total_copies', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('books', sa.Column('available_copies', sa.Integer(), server_default='1', nullable=False))
+    # Every existing row is a single copy
+    op.execute("UPDATE books SET available_copies = GREATEST(total_copies - active_loans, 0)")
+    op.create_check_constraint('ck_books_available_copies', 'books', 'available_copies >= 0 AND available_copies <= total_copies')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ck_books_available_copies', 'books', type_='check')
+    op.drop_column('books', 'available_copies')
+    op.drop_column('books', 'total_copies')
@@ -0,0 +1,30 @@
+"""add version to books and members
+
+Revision ID: 20293172f45f
+Revises: 1f62c0784de5
+Create Date: 2026-10-19 18:47:13.220954
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20293172f45f'
+down_revision: Union[str, Sequence[str], None] = '1f62c0784de5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('books', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('members', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('members', 'version')
+    op.drop_column('books', 'version')
@@ -0,0 +1,28 @@
+"""index refresh_tokens.expires_at for expiry cleanup
+
+Revision ID: 5d3e8f1a2b7c
+Revises: 42c721ef02b8
+Create Date: 2026-10-19 23:40:12.519304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d3e8f1a2b7c'
+down_revision: Union[str, Sequence[str], None] = '42c721ef02b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_refresh_tokens_expires_at'), 'refresh_tokens', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refresh_tokens_expires_at'), table_name='refresh_tokens')
@@ -0,0 +1,32 @@
+"""add member ordering and prefix search indexes
+
+Revision ID: a07ab448d81d
+Revises: 20293172f45f
+Create Date: 2026-10-19 20:05:31.482166
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a07ab448d81d'
+down_revision: Union[str, Sequence[str], None] = '20293172f45f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_members_lower_name_id', 'members', [sa.text('lower(name)'), 'id'], unique=False)
+    op.create_index('ix_members_name_prefix', 'members', [sa.text('lower(name) text_pattern_ops')], unique=False)
+    op.create_index('ix_members_email_prefix', 'members', [sa.text('lower(email) text_pattern_ops')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_members_email_prefix', table_name='members')
+    op.drop_index('ix_members_name_prefix', table_name='members')
+    op.drop_index('ix_members_lower_name_id', table_name='members')
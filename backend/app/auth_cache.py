@@ -0,0 +1,57 @@
+"""
+In-process caches for authentication.
+
+Verifying a JWT and resolving its staff member give the same answer for the
+life of the token, so both are kept in small bounded LRU maps whose entries
+expire on their own deadline. Authorizing a repeat caller is then a dict
+lookup instead of an HMAC check and a Postgres round trip.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.config import settings
+
+
+class TTLCache:
+    """LRU map whose entries also expire at a wall-clock deadline."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Any, tuple[Any, float]] = OrderedDict()
+
+    def get(self, key) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, expires_at: float) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# sha256(token) -> (subject, jti), expiring at min(exp, now + TOKEN_CACHE_TTL_SECONDS)
+TOKEN_CACHE = TTLCache(settings.token_cache_size)
+
+# staff id -> StaffResponse, the L1 in front of the Redis staff:id:* keys
+STAFF_CACHE = TTLCache(settings.staff_cache_size)
@@ -14,6 +14,68 @@ class Settings(BaseSettings):
     rabbitmq_url: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # Each refresh slides the session forward by this much
+    refresh_token_expire_days: int = 14
+    # Expired refresh tokens deleted each time one is issued (0 disables)
+    refresh_token_cleanup_batch: int = 100
+    # Verified tokens and resolved staff are cached in process (0 disables)
+    token_cache_size: int = 10_000
+    token_cache_ttl_seconds: int = 300
+    staff_cache_size: int = 1_000
+    staff_cache_ttl_seconds: int = 300
+    # Expected number of live revoked tokens; the filter grows past it
+    revocation_filter_capacity: int = 100_000
+    # Requests in flight per process adapt between these; the rest are shed
+    # with 503 / RESOURCE_EXHAUSTED instead of queueing on the pool
+    concurrency_limit_enabled: bool = True
+    concurrency_limit_initial: int = 20
+    concurrency_limit_min: int = 4
+    concurrency_limit_max: int = 200
+    # gRPC list and stream responses of at least this size are gzipped for
+    # clients that accept it
+    grpc_compression_enabled: bool = True
+    grpc_gzip_min_bytes: int = 1024
+    # Serialized books and members kept per gRPC process, per (id, updated_at)
+    grpc_message_cache_size: int = 10_000
+    # Argon2 runs on this many threads; calls beyond the queue limit get a 503
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 64
+    # Server processes for `python -m app.main` and `python -m app.grpc_server`
+    web_workers: int = 1
+    grpc_workers: int = 1
+    # Connection pool, per process
+    db_pool_size: int = 20
+    db_max_overflow: int = 30
+    # Optional cap on connections (pool + overflow) for a whole server; each
+    # of its db_pool_workers processes gets an even share, set by the server
+    db_connection_budget: int | None = None
+    db_pool_workers: int = 1
+    db_pool_timeout: float = 60
+    db_pool_recycle: int = -1
+    db_pool_pre_ping: bool = True
+    # Set when DATABASE_URL points at PgBouncer in transaction pooling mode
+    db_pgbouncer: bool = False
+    # Unfiltered list totals use the planner's row estimate above this size
+    count_estimate_threshold: int = 100_000
+    borrowing_partitions_ahead: int = 3
+    # Running servers re-check upcoming partitions this often
+    borrowing_partitions_check_hours: float = 6
+    borrowing_archive_after_years: int = 5
+    debug: bool = False
+    # In debug mode, warn when one request runs the same SQL more often than this
+    sql_repeat_warning_threshold: int = 10
+    # Slow query log: disabled unless a threshold is set
+    slow_query_threshold_ms: float | None = None
+    slow_query_log_size: int = 100
+    slow_query_explain: bool = True
+    slow_query_explain_analyze: bool = False
+    # EXPLAINs borrow pooled connections, so they're capped, skipped when the
+    # pool has no idle connection, and done once per statement per interval
+    slow_query_explain_max_in_flight: int = 2
+    slow_query_explain_interval_seconds: float = 60
+    # Bind values can hold secrets; values for staff and refresh token
+    # statements are redacted even when this is on
+    slow_query_log_parameters: bool = False
 
 
 settings = Settings()  # type: ignore
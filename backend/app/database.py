@@ -1,20 +1,124 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from uuid import uuid4
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, exc, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
+from app.metrics import multiprocess_enabled
+
+logger = logging.getLogger(__name__)
 
 SQLALCHEMY_DATABASE_URL = settings.database_url
 
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to check a connection out of the pool, including waiting for one",
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Connection checkouts that gave up after pool_timeout",
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start)
+
+
+connect_args = {}
+if settings.db_pgbouncer:
+    # PgBouncer in transaction mode may hand each transaction a different
+    # server connection, so named prepared statements must not be reused
+    # across transactions: disable both asyncpg's and SQLAlchemy's statement
+    # caches and give every prepared statement a unique name.
+    connect_args = {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+
+def _pool_limits() -> tuple[int, int]:
+    """pool_size and max_overflow for this process."""
+    if settings.db_connection_budget is None:
+        return settings.db_pool_size, settings.db_max_overflow
+
+    # Split the server's budget between its workers, keeping the configured
+    # ratio of persistent to overflow connections
+    share = max(settings.db_connection_budget // max(settings.db_pool_workers, 1), 1)
+    total = settings.db_pool_size + settings.db_max_overflow
+    pool_size = max(share * settings.db_pool_size // total, 1)
+    return pool_size, share - pool_size
+
+
+POOL_SIZE, MAX_OVERFLOW = _pool_limits()
 
 engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
     echo=False,  # disable SQL query logging
-    pool_pre_ping=True,  # ensure connections are alive before using
-    pool_size=20,  # Increase from default 5
-    max_overflow=30,  # Increase from default 10
-    pool_timeout=60,  # Wait longer before failing
+    poolclass=InstrumentedQueuePool,
+    pool_pre_ping=settings.db_pool_pre_ping,  # ensure connections are alive
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    connect_args=connect_args,
+)
+
+# livesum: with several worker processes, report the total across live ones
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Configured number of persistent pool connections",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size",
+    multiprocess_mode="livesum",
 )
 
+if multiprocess_enabled():
+    # Scrapes are answered by the supervisor, which can't call into this
+    # process, so the gauges are written as the pool changes instead
+    DB_POOL_SIZE.set(engine.pool.size())
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _pool_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+        DB_POOL_OVERFLOW.set(max(engine.pool.overflow(), 0))
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _pool_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+        DB_POOL_OVERFLOW.set(max(engine.pool.overflow(), 0))
+
+else:
+    DB_POOL_SIZE.set_function(lambda: engine.pool.size())
+    DB_POOL_CHECKED_OUT.set_function(lambda: engine.pool.checkedout())
+    DB_POOL_OVERFLOW.set_function(lambda: max(engine.pool.overflow(), 0))
+
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -29,6 +133,106 @@ class Base(DeclarativeBase):
     pass
 
 
+async def warm_pool() -> None:
+    """Open the persistent connections now rather than on first requests."""
+    # Each ping holds its connection until all are open, so none is reused
+    opened = asyncio.Barrier(POOL_SIZE)
+
+    async def ping():
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await opened.wait()
+        except Exception:
+            await opened.abort()
+            raise
+
+    await asyncio.gather(*(ping() for _ in range(POOL_SIZE)))
+
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+# ============================================
+# Per-request SQL instrumentation
+# ============================================
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "db_statements_per_request",
+    "SQL statements executed per HTTP request or RPC",
+    ["handler"],
+    buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21, 34, 55, 89),
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+    "db_seconds_per_request",
+    "Time spent executing SQL per HTTP request or RPC",
+    ["handler"],
+)
+DB_ROWS_PER_REQUEST = Histogram(
+    "db_rows_per_request",
+    "Rows affected by INSERT/UPDATE/DELETE per HTTP request or RPC "
+    "(rows returned by SELECT are not counted)",
+    ["handler"],
+    buckets=(0, 1, 10, 50, 100, 500, 1000, 5000, 10000),
+)
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    shapes: defaultdict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    def observe(self, handler: str) -> None:
+        DB_STATEMENTS_PER_REQUEST.labels(handler).observe(self.statements)
+        DB_SECONDS_PER_REQUEST.labels(handler).observe(self.seconds)
+        DB_ROWS_PER_REQUEST.labels(handler).observe(self.rows)
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries():
+    """Collect SQL stats for everything executed inside the block."""
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the context, not conn.info: a statement that raises never reaches
+    # after_cursor_execute, and nothing must be left behind on the connection
+    if context is not None and _query_stats.get() is not None:
+        context._query_start_time = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _query_stats.get()
+    start = getattr(context, "_query_start_time", None)
+    if stats is None or start is None:
+        return
+
+    stats.statements += 1
+    stats.seconds += time.perf_counter() - start
+    # Only writes report a row count; asyncpg gives -1 for SELECTs, whose rows
+    # are not tracked here
+    if cursor.rowcount >= 0:
+        stats.rows += cursor.rowcount
+
+    if settings.debug:
+        # The statement is already parameterised, so it identifies the query shape
+        stats.shapes[statement] += 1
+        if stats.shapes[statement] == settings.sql_repeat_warning_threshold + 1:
+            logger.warning(
+                f"Possible N+1: statement executed more than "
+                f"{settings.sql_repeat_warning_threshold} times in one request: "
+                f"{statement}"
+            )
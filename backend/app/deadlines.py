@@ -0,0 +1,72 @@
+"""
+Per-request deadlines.
+
+A gRPC call's deadline (context.time_remaining()) or a REST request's
+X-Request-Timeout header is stored for the request's task. Every database
+transaction it opens then starts with SET LOCAL statement_timeout set to the
+time left, and Redis commands are cut off at the same point, so a query whose
+caller has already given up is cancelled by Postgres instead of running on.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.exceptions import DeadlineExceededError
+
+# Absolute time.monotonic() by which the current request must finish
+_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+# Postgres' code for a statement cancelled by statement_timeout
+QUERY_CANCELED = "57014"
+
+
+@contextmanager
+def request_deadline(seconds: float | None):
+    """Bound everything inside the block to `seconds` from now (None: no limit)."""
+    token = _deadline.set(None if seconds is None else time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_remaining() -> float | None:
+    """Seconds left before the current request's deadline, if it has one."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def _set_statement_timeout(session, transaction, connection):
+    remaining = time_remaining()
+    if remaining is None:
+        return
+    if remaining <= 0:
+        raise DeadlineExceededError(message="Request deadline exceeded.")
+    # SET can't take bind parameters; the value is always an integer, and
+    # Postgres caps it at INT_MAX milliseconds
+    timeout_ms = min(max(int(remaining * 1000), 1), 2_147_483_647)
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+def _translate_timeout(context):
+    if (
+        _deadline.get() is not None
+        and getattr(context.original_exception, "sqlstate", None) == QUERY_CANCELED
+    ):
+        raise DeadlineExceededError(message="Request deadline exceeded.")
+
+
+def install_deadlines() -> None:
+    """Apply request deadlines to database transactions."""
+    # Session is the sync class behind every AsyncSession
+    if event.contains(Session, "after_begin", _set_statement_timeout):
+        return
+    event.listen(Session, "after_begin", _set_statement_timeout)
+    event.listen(engine.sync_engine, "handle_error", _translate_timeout)
@@ -2,5 +2,6 @@ from fastapi import Request
 import aio_pika
 
 
-def get_rmq_channel(request: Request) -> aio_pika.RobustChannel:
-    return request.app.state.rmq_channel
+def get_rmq_channel(request: Request) -> aio_pika.RobustChannel | None:
+    # Unset when RabbitMQ was unreachable at startup; services skip events then
+    return getattr(request.app.state, "rmq_channel", None)
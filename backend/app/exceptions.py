@@ -13,3 +13,15 @@ class ActionForbiddenError(LibraryException): ...
 
 
 class InvalidCredentialsError(LibraryException): ...
+
+
+class InvalidCursorError(LibraryException): ...
+
+
+class VersionConflictError(LibraryException): ...
+
+
+class ServiceUnavailableError(LibraryException): ...
+
+
+class DeadlineExceededError(LibraryException): ...
@@ -1,15 +1,29 @@
 from .auth_handler import AuthServicer
 from .books_handler import BookServicer
 from .borrowings_handler import BorrowingServicer
-from .helpers import AsyncPromServerInterceptor, datetime_to_timestamp, get_current_user
+from .helpers import (
+    AsyncPromServerInterceptor,
+    AuthInterceptor,
+    CompressionInterceptor,
+    ConcurrencyLimitInterceptor,
+    DeadlineInterceptor,
+    QueryStatsInterceptor,
+    datetime_to_timestamp,
+    get_current_user,
+)
 from .members_handler import MemberServicer
 
 __all__ = [
     "AsyncPromServerInterceptor",
+    "AuthInterceptor",
+    "CompressionInterceptor",
     "AuthServicer",
+    "DeadlineInterceptor",
     "BookServicer",
     "BorrowingServicer",
+    "ConcurrencyLimitInterceptor",
     "MemberServicer",
+    "QueryStatsInterceptor",
     "datetime_to_timestamp",
     "get_current_user",
 ]
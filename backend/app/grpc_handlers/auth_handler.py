@@ -1,21 +1,20 @@
-from datetime import timedelta
-
 import grpc
-from protos import auth_pb2, auth_pb2_grpc
-from sqlalchemy import func, select
+from protos import auth_pb2, auth_pb2_grpc, common_pb2
+from pydantic import ValidationError
 
 from app import models
-from app.config import settings
-from app.database import AsyncSessionLocal
-from app.grpc_handlers.helpers import get_current_user
-from app.utils import (
-    create_access_token,
-    hash_password,
-    verify_password,
+from app.exceptions import LibraryException, NotFoundError
+from app.grpc_handlers.helpers import (
+    abort_with_error,
+    get_bearer_token,
+    get_current_user,
 )
+from app.repositories.unit_of_work import unit_of_work
+from app.schemas import StaffCreate, StaffResponse, Token
+from app.services import AuthService
 
 
-def staff_to_proto(staff: models.Staff) -> auth_pb2.Staff:
+def staff_to_proto(staff: models.Staff | StaffResponse) -> auth_pb2.Staff:
     return auth_pb2.Staff(
         id=staff.id,
         username=staff.username,
@@ -24,45 +23,35 @@ def staff_to_proto(staff: models.Staff) -> auth_pb2.Staff:
     )
 
 
+def token_to_proto(token: Token) -> auth_pb2.LoginResponse:
+    return auth_pb2.LoginResponse(
+        access_token=token.access_token,
+        token_type=token.token_type,
+        refresh_token=token.refresh_token or "",
+    )
+
+
 class AuthServicer(auth_pb2_grpc.AuthServiceServicer):
     async def Register(
         self, request: auth_pb2.RegisterRequest, context: grpc.aio.ServicerContext
     ) -> auth_pb2.Staff:
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(models.Staff).where(
-                    func.lower(models.Staff.username) == request.username.lower()
-                )
-            )
-            existing_staff = result.scalars().first()
-            if existing_staff:
-                await context.abort(
-                    grpc.StatusCode.ALREADY_EXISTS,
-                    "Username taken",
-                )
-            result = await db.execute(
-                select(models.Staff).where(
-                    func.lower(models.Staff.email) == request.email.lower()
-                )
-            )
-            existing_email = result.scalars().first()
-            if existing_email:
-                await context.abort(
-                    grpc.StatusCode.ALREADY_EXISTS,
-                    "Email already registered",
-                )
-
-            new_staff = models.Staff(
-                email=request.email.lower(),
+        try:
+            staff = StaffCreate(
                 username=request.username,
-                hashed_password=hash_password(request.password),
-                full_name=request.full_name if request.HasField("full_name") else "",
+                email=request.email,
+                full_name=request.full_name if request.HasField("full_name") else None,
+                password=request.password,
             )
+        except ValidationError as e:
+            await abort_with_error(context, e)
+
+        async with unit_of_work() as uow:
+            try:
+                new_staff = await AuthService(uow).register_staff(staff)
+            except LibraryException as e:
+                await abort_with_error(context, e)
 
-            db.add(new_staff)
-            await db.commit()
-            await db.refresh(new_staff)
-            return staff_to_proto(new_staff)
+        return staff_to_proto(new_staff)
 
     async def GetCurrentUser(
         self,
@@ -70,13 +59,10 @@ class AuthServicer(auth_pb2_grpc.AuthServiceServicer):
         context: grpc.aio.ServicerContext,
     ) -> auth_pb2.Staff:
         staff_id = await get_current_user(context)
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(models.Staff).where(models.Staff.id == int(staff_id))
-            )
-            staff = result.scalars().first()
-
-            if not staff:
+        async with unit_of_work() as uow:
+            try:
+                staff = await AuthService(uow).get_staff_principal(staff_id)
+            except NotFoundError:
                 await context.abort(
                     grpc.StatusCode.UNAUTHENTICATED, "Missing or invalid token"
                 )
@@ -86,29 +72,34 @@ class AuthServicer(auth_pb2_grpc.AuthServiceServicer):
     async def Login(
         self, request: auth_pb2.LoginRequest, context: grpc.aio.ServicerContext
     ) -> auth_pb2.LoginResponse:
-        """Login and return a JWT access token"""
-        async with AsyncSessionLocal() as db:
-            # Find staff by email
-            result = await db.execute(
-                select(models.Staff).where(
-                    func.lower(models.Staff.email) == request.email.lower()
-                )
-            )
-            staff = result.scalars().first()
-            if not staff or not verify_password(
-                request.password, staff.hashed_password
-            ):
-                await context.abort(
-                    grpc.StatusCode.UNAUTHENTICATED, "Incorrect email or password"
-                )
-            # Generate token
-            access_token_expires = timedelta(
-                minutes=settings.access_token_expire_minutes
-            )
-            access_token = create_access_token(
-                data={"sub": str(staff.id)}, expires_delta=access_token_expires
-            )
+        """Login and return a JWT access token and a refresh token"""
+        async with unit_of_work() as uow:
+            try:
+                token = await AuthService(uow).login(request.email, request.password)
+            except LibraryException as e:
+                await abort_with_error(context, e)
+
+        return token_to_proto(token)
+
+    async def Refresh(
+        self, request: auth_pb2.RefreshRequest, context: grpc.aio.ServicerContext
+    ) -> auth_pb2.LoginResponse:
+        """Rotate a refresh token; no password check needed"""
+        async with unit_of_work() as uow:
+            try:
+                token = await AuthService(uow).refresh(request.refresh_token)
+            except LibraryException as e:
+                await abort_with_error(context, e)
+
+        return token_to_proto(token)
 
-            return auth_pb2.LoginResponse(
-                access_token=access_token, token_type="bearer"
+    async def Logout(
+        self, request: auth_pb2.LogoutRequest, context: grpc.aio.ServicerContext
+    ) -> common_pb2.Empty:
+        async with unit_of_work() as uow:
+            await AuthService(uow).logout(
+                request.refresh_token,
+                access_token=get_bearer_token(context.invocation_metadata()),
             )
+
+        return common_pb2.Empty()
@@ -1,98 +1,172 @@
+from operator import attrgetter
+
+import aio_pika
 import grpc
 from protos import books_pb2, books_pb2_grpc, common_pb2
-from sqlalchemy import select
 
 from app import models
-from app.database import AsyncSessionLocal
-from app.grpc_handlers.helpers import datetime_to_timestamp, get_current_user
+from app.config import settings
+from app.exceptions import LibraryException
+from app.grpc_handlers.helpers import (
+    MessageCache,
+    ReadMask,
+    abort_with_error,
+    get_batch_size,
+    get_page_size,
+    get_read_mask,
+    optional_timestamp,
+    select_fields,
+    timestamp_fields,
+)
+from app.repositories.unit_of_work import unit_of_work
+from app.schemas import BookCreate, BookResponse, BookUpdate
+from app.services import BookService
+
+# How each Book field is read, so a read_mask only builds what it names
+BOOK_FIELDS = {
+    "id": attrgetter("id"),
+    "title": attrgetter("title"),
+    "author": attrgetter("author"),
+    "isbn": attrgetter("isbn"),
+    "description": lambda book: book.description or "",
+    "is_available": attrgetter("is_available"),
+    "created_at": lambda book: timestamp_fields(book.created_at),
+    "updated_at": lambda book: timestamp_fields(book.updated_at),
+    "total_copies": attrgetter("total_copies"),
+    "available_copies": attrgetter("available_copies"),
+    "total_borrows": attrgetter("total_borrows"),
+    "active_loans": attrgetter("active_loans"),
+    "last_borrowed_at": lambda book: optional_timestamp(book.last_borrowed_at),
+    "version": attrgetter("version"),
+}
+
+
+BOOK_MESSAGES = MessageCache(books_pb2.Book, settings.grpc_message_cache_size)
+
+
+def book_to_proto(
+    book: models.Book | BookResponse | dict, mask: ReadMask | None = None
+) -> books_pb2.Book:
+    if mask is None:
+        return BOOK_MESSAGES.get_or_build(book, _build_book)
+    return _build_book(book, mask)
+
+
+def _build_book(
+    book: models.Book | BookResponse | dict, mask: ReadMask | None = None
+) -> books_pb2.Book:
+    if isinstance(book, dict):
+        # Served from the Redis cache as the service's JSON encoding
+        book = BookResponse.model_validate(book)
+    return books_pb2.Book(**select_fields(BOOK_FIELDS, book, mask))
 
 
-def book_to_proto(book: models.Book) -> books_pb2.Book:
-    return books_pb2.Book(
-        id=book.id,
-        title=book.title,
-        author=book.author,
-        isbn=book.isbn,
-        description=book.description or "",
-        is_available=book.is_available,
-        created_at=datetime_to_timestamp(book.created_at),
-        updated_at=datetime_to_timestamp(book.updated_at),
-    )
+class BookServicer(books_pb2_grpc.BookServiceServicer):
+    """
+    Thin transport over BookService, so gRPC shares the REST API's caching,
+    cache invalidation and RabbitMQ events
+    """
 
+    def __init__(self, rmq_channel: aio_pika.RobustChannel | None = None):
+        self.rmq_channel = rmq_channel
 
-class BookServicer(books_pb2_grpc.BookServiceServicer):
     async def GetBooks(
         self,
         request: books_pb2.GetBooksRequest,
         context: grpc.aio.ServicerContext,
     ) -> books_pb2.GetBooksResponse:
         """Get all books with optional filters"""
-        async with AsyncSessionLocal() as db:
-            query = select(models.Book)
-
-            if request.HasField("title"):
-                query = query.where(models.Book.title.ilike(f"%{request.title}%"))
-
-            if request.HasField("author"):
-                query = query.where(models.Book.author.ilike(f"%{request.author}%"))
-
-            result = await db.execute(query)
-            books = result.scalars().all()
+        page_size = await get_page_size(request, context)
+        mask = await get_read_mask(request, context, books_pb2.Book)
+        title = request.title if request.HasField("title") else None
+        author = request.author if request.HasField("author") else None
+
+        async with unit_of_work() as uow:
+            service = BookService(uow, self.rmq_channel)
+            try:
+                books, next_page_token = await service.get_books(
+                    title, author, page_size, cursor=request.page_token or None
+                )
+            except LibraryException as e:
+                await abort_with_error(context, e)
 
-            return books_pb2.GetBooksResponse(
-                books=[book_to_proto(book) for book in books]
+            response = books_pb2.GetBooksResponse(
+                books=[book_to_proto(book, mask) for book in books],
+                next_page_token=next_page_token or "",
             )
+            if request.include_total:
+                total, estimated = await service.count_books(title, author)
+                response.total_count = total
+                response.total_count_estimated = estimated
+            return response
+
+    async def StreamBooks(
+        self,
+        request: books_pb2.StreamBooksRequest,
+        context: grpc.aio.ServicerContext,
+    ):
+        """
+        Stream all matching books in batches
+        Each batch is sent as soon as it is read, so memory stays flat and
+        HTTP/2 flow control pauses the cursor when the client falls behind
+        """
+        batch_size = await get_batch_size(request, context)
+        mask = await get_read_mask(request, context, books_pb2.Book)
+        async with unit_of_work() as uow:
+            async for books in BookService(uow, self.rmq_channel).stream_books(
+                request.title or None, request.author or None, batch_size
+            ):
+                yield books_pb2.GetBooksResponse(
+                    books=[book_to_proto(book, mask) for book in books]
+                )
 
     async def GetBook(
         self,
         request: books_pb2.GetBookRequest,
         context: grpc.aio.ServicerContext,
     ) -> books_pb2.Book:
-        await get_current_user(context)
         if request.id <= 0:
             await context.abort(
                 grpc.StatusCode.INVALID_ARGUMENT, "book_id must be positive"
             )
+        mask = await get_read_mask(request, context, books_pb2.Book)
 
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(models.Book).where(models.Book.id == request.id)
-            )
-            book = result.scalars().first()
+        async with unit_of_work() as uow:
+            try:
+                book = await BookService(uow, self.rmq_channel).get_book_by_id(
+                    request.id
+                )
+            except LibraryException as e:
+                await abort_with_error(context, e)
 
-            if not book:
-                await context.abort(grpc.StatusCode.NOT_FOUND, "Book not found")
-            return book_to_proto(book)
+            return book_to_proto(book, mask)
 
     async def CreateBook(
         self,
         request: books_pb2.CreateBookRequest,
         context: grpc.aio.ServicerContext,
     ) -> books_pb2.Book:
-        await get_current_user(context)
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(models.Book).where(models.Book.isbn == request.isbn)
-            )
-            existing_book = result.scalars().first()
-
-            if existing_book:
-                await context.abort(
-                    grpc.StatusCode.ALREADY_EXISTS, "Book with this ISBN already exists"
-                )
-
-            new_book = models.Book(
-                title=request.title,
-                author=request.author,
-                isbn=request.isbn,
-                description=request.description
-                if request.HasField("description")
-                else None,
+        total_copies = request.total_copies if request.HasField("total_copies") else 1
+        if total_copies < 1:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT, "total_copies must be positive"
             )
 
-            db.add(new_book)
-            await db.commit()
-            await db.refresh(new_book)
+        book = BookCreate(
+            title=request.title,
+            author=request.author,
+            isbn=request.isbn,
+            description=request.description
+            if request.HasField("description")
+            else None,
+            total_copies=total_copies,
+        )
+
+        async with unit_of_work() as uow:
+            try:
+                new_book = await BookService(uow, self.rmq_channel).create_book(book)
+            except LibraryException as e:
+                await abort_with_error(context, e)
 
             return book_to_proto(new_book)
 
@@ -105,55 +179,36 @@ class BookServicer(books_pb2_grpc.BookServiceServicer):
         Update an existing book
         Equivalent to: PUT /api/books/{id}
         """
-        await get_current_user(context)
         # Validation
         if request.id <= 0:
             await context.abort(
                 grpc.StatusCode.INVALID_ARGUMENT, "book_id must be positive"
             )
-
-        async with AsyncSessionLocal() as db:
-            # Get existing book
-            result = await db.execute(
-                select(models.Book)
-                .where(models.Book.id == request.id)
-                .with_for_update()
-            )
-            book = result.scalars().first()
-
-            if not book:
-                await context.abort(grpc.StatusCode.NOT_FOUND, "Book not found")
-
-            # Check if book is currently borrowed (same as REST)
-            result = await db.execute(
-                select(models.Borrowing)
-                .where(
-                    models.Borrowing.book_id == request.id,
-                    models.Borrowing.returned_date.is_(None),
-                )
-                .with_for_update()
+        if request.HasField("total_copies") and request.total_copies < 1:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT, "total_copies must be positive"
             )
-            is_borrowed = result.scalars().first()
 
-            if is_borrowed:
-                await context.abort(
-                    grpc.StatusCode.FAILED_PRECONDITION, "Cannot update a borrowed book"
+        # Update only provided fields
+        fields = ("title", "author", "description", "is_available", "total_copies")
+        book = BookUpdate(
+            **{
+                field: getattr(request, field)
+                for field in fields
+                if request.HasField(field)
+            }
+        )
+        expected_version = request.version if request.HasField("version") else None
+
+        async with unit_of_work() as uow:
+            try:
+                updated_book = await BookService(uow, self.rmq_channel).update_book(
+                    request.id, book, expected_version
                 )
+            except LibraryException as e:
+                await abort_with_error(context, e)
 
-            # Update only provided fields
-            if request.HasField("title"):
-                book.title = request.title
-            if request.HasField("author"):
-                book.author = request.author
-            if request.HasField("description"):
-                book.description = request.description
-            if request.HasField("is_available"):
-                book.is_available = request.is_available
-
-            await db.commit()
-            await db.refresh(book)
-
-            return book_to_proto(book)
+            return book_to_proto(updated_book)
 
     async def DeleteBook(
         self,
@@ -164,47 +219,20 @@ class BookServicer(books_pb2_grpc.BookServiceServicer):
         Delete a book
         Equivalent to: DELETE /api/books/{id}
         """
-        await get_current_user(context)
         # Validation
         if request.id <= 0:
             await context.abort(
                 grpc.StatusCode.INVALID_ARGUMENT, "book_id must be positive"
             )
 
-        async with AsyncSessionLocal() as db:
-            # Get existing book
-            result = await db.execute(
-                select(models.Book)
-                .where(models.Book.id == request.id)
-                .with_for_update()
-            )
-            book = result.scalars().first()
-
-            if not book:
-                await context.abort(grpc.StatusCode.NOT_FOUND, "Book not found")
-
-            # Check if book is available (same as REST)
-            if not book.is_available:
-                await context.abort(
-                    grpc.StatusCode.FAILED_PRECONDITION,
-                    "Cannot delete book that is currently borrowed or marked as unavailable",
-                )
-
-            # Check borrowing history (same as REST)
-            result = await db.execute(
-                select(models.Borrowing)
-                .where(models.Borrowing.book_id == book.id)
-                .with_for_update()
-            )
-            has_history = result.scalars().first()
+        expected_version = request.version if request.HasField("version") else None
 
-            if has_history:
-                await context.abort(
-                    grpc.StatusCode.FAILED_PRECONDITION,
-                    "Cannot delete book with borrowing history",
+        async with unit_of_work() as uow:
+            try:
+                await BookService(uow, self.rmq_channel).delete_book(
+                    request.id, expected_version
                 )
-
-            await db.delete(book)
-            await db.commit()
+            except LibraryException as e:
+                await abort_with_error(context, e)
 
             return common_pb2.Empty()
@@ -1,35 +1,81 @@
-from datetime import UTC, datetime
+from operator import attrgetter
 
+import aio_pika
 import grpc
 from protos import borrowings_pb2, borrowings_pb2_grpc
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from pydantic import ValidationError
 
 from app import models
-from app.database import AsyncSessionLocal
+from app.exceptions import LibraryException
 from app.grpc_handlers.books_handler import book_to_proto
-from app.grpc_handlers.helpers import datetime_to_timestamp, get_current_user
+from app.grpc_handlers.helpers import (
+    ReadMask,
+    abort_with_error,
+    get_batch_size,
+    get_page_size,
+    get_read_mask,
+    optional_datetime,
+    optional_timestamp,
+    row_version,
+    select_fields,
+    timestamp_fields,
+)
 from app.grpc_handlers.members_handler import member_to_proto
-
-
-def borrowing_to_proto(borrowing: models.Borrowing) -> borrowings_pb2.BorrowResponse:
-    return borrowings_pb2.BorrowResponse(
-        id=borrowing.id,
-        book_id=borrowing.book_id,
-        member_id=borrowing.member_id,
-        due_date=(
-            datetime_to_timestamp(borrowing.due_date) if borrowing.due_date else None
-        ),
-        borrowed_date=datetime_to_timestamp(borrowing.borrowed_date),
-        status=borrowing.status,
-        returned_date=(
-            datetime_to_timestamp(borrowing.returned_date)
-            if borrowing.returned_date
-            else None
-        ),
-        book=book_to_proto(borrowing.book),
-        member=member_to_proto(borrowing.member),
-    )
+from app.repositories.unit_of_work import unit_of_work
+from app.schemas import BorrowRecord, BorrowRequest, BorrowResponse
+from app.services import BorrowingService
+
+BORROWING_FIELDS = {
+    "id": attrgetter("id"),
+    "book_id": attrgetter("book_id"),
+    "member_id": attrgetter("member_id"),
+    "due_date": lambda borrowing: optional_timestamp(borrowing.due_date),
+    "borrowed_date": lambda borrowing: timestamp_fields(borrowing.borrowed_date),
+    # Derived rather than read: the cached encoding has no status property
+    "status": lambda borrowing: "RETURNED" if borrowing.returned_date else "BORROWED",
+    "returned_date": lambda borrowing: optional_timestamp(borrowing.returned_date),
+}
+
+
+def borrowing_to_proto(
+    borrowing: models.Borrowing | BorrowResponse | dict,
+    mask: ReadMask | None = None,
+    seen: dict | None = None,
+) -> borrowings_pb2.BorrowResponse:
+    """
+    `seen` holds the books and members already converted for the same
+    response, so each appears once however many rows share it
+    """
+    if isinstance(borrowing, dict):
+        # Served from the Redis cache as the service's JSON encoding. Only the
+        # borrowing's own fields are validated; its book and member go to
+        # their converters as JSON, which the message caches usually answer
+        book, member = borrowing["book"], borrowing["member"]
+        borrowing = BorrowRecord.model_validate(borrowing)
+    else:
+        book, member = borrowing.book, borrowing.member
+    if seen is None:
+        seen = {}
+
+    fields = select_fields(BORROWING_FIELDS, borrowing, mask)
+    if mask is None or "book" in mask:
+        key = ("book", *row_version(book))
+        if key not in seen:
+            seen[key] = book_to_proto(book, mask and mask["book"])
+        fields["book"] = seen[key]
+    if mask is None or "member" in mask:
+        key = ("member", *row_version(member))
+        if key not in seen:
+            seen[key] = member_to_proto(member, mask and mask["member"])
+        fields["member"] = seen[key]
+    return borrowings_pb2.BorrowResponse(**fields)
+
+
+def borrowings_to_proto(
+    borrowings: list, mask: ReadMask | None = None
+) -> list[borrowings_pb2.BorrowResponse]:
+    seen = {}
+    return [borrowing_to_proto(borrowing, mask, seen) for borrowing in borrowings]
 
 
 def return_to_proto(borrowing: models.Borrowing) -> borrowings_pb2.ReturnResponse:
@@ -38,137 +84,140 @@ def return_to_proto(borrowing: models.Borrowing) -> borrowings_pb2.ReturnRespons
         book_id=borrowing.book_id,
         member_id=borrowing.member_id,
         status=borrowing.status,
-        returned_date=(
-            datetime_to_timestamp(borrowing.returned_date)
-            if borrowing.returned_date
-            else None
-        ),
+        returned_date=optional_timestamp(borrowing.returned_date),
         book=book_to_proto(borrowing.book),
         member=member_to_proto(borrowing.member),
     )
 
 
 class BorrowingServicer(borrowings_pb2_grpc.BorrowingServiceServicer):
+    def __init__(self, rmq_channel: aio_pika.RobustChannel | None = None):
+        self.rmq_channel = rmq_channel
+
     async def GetBorrowingsHistory(
         self,
         request: borrowings_pb2.GetBorrowRequest,
         context: grpc.aio.ServicerContext,
     ) -> borrowings_pb2.GetBorrowingsResponse:
-        await get_current_user(context)
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(models.Borrowing)
-                .options(selectinload(models.Borrowing.book))
-                .options(selectinload(models.Borrowing.member))
-                .order_by(models.Borrowing.borrowed_date.desc())
-            )
-            records = result.scalars().all()
-            return borrowings_pb2.GetBorrowingsResponse(
-                borrowings=[borrowing_to_proto(borrow) for borrow in records]
-            )
+        return await self._get_borrowings_page(request, context)
 
     async def GetCurrentBorrowings(
         self,
         request: borrowings_pb2.GetBorrowRequest,
         context: grpc.aio.ServicerContext,
     ) -> borrowings_pb2.GetBorrowingsResponse:
-        await get_current_user(context)
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(models.Borrowing)
-                .options(selectinload(models.Borrowing.book))
-                .options(selectinload(models.Borrowing.member))
-                .where(models.Borrowing.returned_date.is_(None))
-                .order_by(models.Borrowing.borrowed_date.desc())
-            )
-            records = result.scalars().all()
-            return borrowings_pb2.GetBorrowingsResponse(
-                borrowings=[borrowing_to_proto(borrow) for borrow in records]
-            )
+        return await self._get_borrowings_page(request, context, active_only=True)
 
     async def GetMemberBorrowings(
         self,
         request: borrowings_pb2.GetMemberBorrowingsRequest,
         context: grpc.aio.ServicerContext,
     ) -> borrowings_pb2.GetBorrowingsResponse:
-        await get_current_user(context)
         if request.id <= 0:
             await context.abort(
                 grpc.StatusCode.INVALID_ARGUMENT,
                 "member id must be positive.",
             )
 
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(models.Member).where(models.Member.id == request.id)
-            )
-            member = result.scalars().first()
-            if not member:
-                await context.abort(grpc.StatusCode.NOT_FOUND, "Member not found.")
-
-            result = await db.execute(
-                select(models.Borrowing)
-                .options(selectinload(models.Borrowing.book))
-                .options(selectinload(models.Borrowing.member))
-                .where(models.Borrowing.member_id == request.id)
-                .order_by(models.Borrowing.borrowed_date.desc())
-            )
-            records = result.scalars().all()
+        return await self._get_borrowings_page(request, context, member_id=request.id)
+
+    async def _get_borrowings_page(
+        self,
+        request,
+        context: grpc.aio.ServicerContext,
+        member_id: int | None = None,
+        active_only: bool = False,
+    ) -> borrowings_pb2.GetBorrowingsResponse:
+        page_size = await get_page_size(request, context)
+        mask = await get_read_mask(request, context, borrowings_pb2.BorrowResponse)
+
+        async with unit_of_work() as uow:
+            try:
+                records, next_page_token = await BorrowingService(
+                    uow, self.rmq_channel
+                ).get_borrowings_page(
+                    page_size,
+                    cursor=request.page_token or None,
+                    member_id=member_id,
+                    active_only=active_only,
+                    borrowed_from=optional_datetime(request, "borrowed_from"),
+                    borrowed_to=optional_datetime(request, "borrowed_to"),
+                )
+            except LibraryException as e:
+                await abort_with_error(context, e)
+
             return borrowings_pb2.GetBorrowingsResponse(
-                borrowings=[borrowing_to_proto(borrow) for borrow in records]
+                borrowings=borrowings_to_proto(records, mask),
+                next_page_token=next_page_token or "",
             )
 
-    async def BorrowBook(
+    async def GetOverdueBorrowings(
         self,
-        request: borrowings_pb2.BorrowRequest,
+        request: borrowings_pb2.GetOverdueBorrowingsRequest,
         context: grpc.aio.ServicerContext,
-    ) -> borrowings_pb2.BorrowResponse:
-        await get_current_user(context)
-        if request.book_id <= 0 or request.member_id <= 0:
-            await context.abort(
-                grpc.StatusCode.INVALID_ARGUMENT,
-                "book id and member id must be positive",
-            )
+    ) -> borrowings_pb2.GetBorrowingsResponse:
+        page_size = await get_page_size(request, context)
+        mask = await get_read_mask(request, context, borrowings_pb2.BorrowResponse)
+
+        page_token = request.page_token if request.HasField("page_token") else None
+        async with unit_of_work() as uow:
+            try:
+                page = await BorrowingService(
+                    uow, self.rmq_channel
+                ).get_overdue_borrowings(page_size, page_token)
+            except LibraryException as e:
+                await abort_with_error(context, e)
 
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(models.Book)
-                .where(models.Book.id == request.book_id)
-                .with_for_update()
+            return borrowings_pb2.GetBorrowingsResponse(
+                borrowings=borrowings_to_proto(page["items"], mask),
+                next_page_token=page["next_cursor"] or "",
             )
-            book = result.scalars().first()
-            if not book:
-                await context.abort(
-                    grpc.StatusCode.NOT_FOUND,
-                    "Book not found.",
-                )
 
-            if not book.is_available:
-                await context.abort(
-                    grpc.StatusCode.FAILED_PRECONDITION,
-                    "Book not available.",
+    async def StreamBorrowings(
+        self,
+        request: borrowings_pb2.StreamBorrowingsRequest,
+        context: grpc.aio.ServicerContext,
+    ):
+        batch_size = await get_batch_size(request, context)
+        mask = await get_read_mask(request, context, borrowings_pb2.BorrowResponse)
+
+        async with unit_of_work() as uow:
+            async for records in BorrowingService(
+                uow, self.rmq_channel
+            ).stream_borrowings(
+                batch_size,
+                member_id=request.member_id if request.HasField("member_id") else None,
+                book_id=request.book_id if request.HasField("book_id") else None,
+                active_only=request.active_only,
+                borrowed_from=optional_datetime(request, "borrowed_from"),
+                borrowed_to=optional_datetime(request, "borrowed_to"),
+            ):
+                yield borrowings_pb2.GetBorrowingsResponse(
+                    borrowings=borrowings_to_proto(records, mask)
                 )
 
-            result = await db.execute(
-                select(models.Member)
-                .where(models.Member.id == request.member_id)
-                .with_for_update()
-            )
-            member = result.scalars().first()
-            if not member:
-                await context.abort(grpc.StatusCode.NOT_FOUND, "Member not found.")
-
-            new_borrow_record = models.Borrowing(
+    async def BorrowBook(
+        self,
+        request: borrowings_pb2.BorrowRequest,
+        context: grpc.aio.ServicerContext,
+    ) -> borrowings_pb2.BorrowResponse:
+        try:
+            borrow = BorrowRequest(
                 book_id=request.book_id,
                 member_id=request.member_id,
-                borrowed_date=datetime.now(UTC),
+                due_date=optional_datetime(request, "due_date"),
             )
+        except ValidationError as e:
+            await abort_with_error(context, e)
 
-            db.add(new_borrow_record)
+        async with unit_of_work() as uow:
+            try:
+                new_borrow_record = await BorrowingService(
+                    uow, self.rmq_channel
+                ).borrow_book(borrow.book_id, borrow.member_id, borrow.due_date)
+            except LibraryException as e:
+                await abort_with_error(context, e)
 
-            book.is_available = False
-            await db.commit()
-            await db.refresh(new_borrow_record, attribute_names=["book", "member"])
             return borrowing_to_proto(new_borrow_record)
 
     async def ReturnBook(
@@ -176,35 +225,18 @@ class BorrowingServicer(borrowings_pb2_grpc.BorrowingServiceServicer):
         request: borrowings_pb2.ReturnRequest,
         context: grpc.aio.ServicerContext,
     ) -> borrowings_pb2.ReturnResponse:
-        await get_current_user(context)
         if request.book_id <= 0 or request.member_id <= 0:
             await context.abort(
                 grpc.StatusCode.INVALID_ARGUMENT,
                 "book id and member id must be positive",
             )
 
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(models.Borrowing)
-                .options(selectinload(models.Borrowing.book))
-                .options(selectinload(models.Borrowing.member))
-                .where(
-                    models.Borrowing.book_id == request.book_id,
-                    models.Borrowing.member_id == request.member_id,
-                    models.Borrowing.returned_date.is_(None),
+        async with unit_of_work() as uow:
+            try:
+                borrowing = await BorrowingService(uow, self.rmq_channel).return_book(
+                    request.book_id, request.member_id
                 )
-                .with_for_update()
-            )
-            borrowing = result.scalars().first()
-            if not borrowing:
-                await context.abort(
-                    grpc.StatusCode.NOT_FOUND,
-                    "No borrowing record found for provided book_id and member_id.",
-                )
-
-            borrowing.returned_date = datetime.now(UTC)
-            borrowing.book.is_available = True
+            except LibraryException as e:
+                await abort_with_error(context, e)
 
-            await db.commit()
-            await db.refresh(borrowing, attribute_names=["book", "member"])
             return return_to_proto(borrowing)
@@ -1,39 +1,226 @@
 import time
-from datetime import datetime
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
 
 import grpc
 from google.protobuf.timestamp_pb2 import Timestamp
 from prometheus_client import Counter, Histogram
+from pydantic import ValidationError
 
+from app.config import settings
+from app.database import track_queries
+from app.deadlines import request_deadline
+from app.load_shedding import (
+    LIMITER,
+    RETRY_AFTER_SECONDS,
+    AdaptiveLimiter,
+    Priority,
+)
+from app.exceptions import (
+    ActionForbiddenError,
+    AlreadyExistsError,
+    DeadlineExceededError,
+    InvalidCredentialsError,
+    InvalidCursorError,
+    LibraryException,
+    NotFoundError,
+    ServiceUnavailableError,
+    VersionConflictError,
+)
 from app.utils import verify_access_token
 
+# gRPC equivalents of the REST status codes in main.library_exception_handler
+EXCEPTION_STATUS_CODES = {
+    NotFoundError: grpc.StatusCode.NOT_FOUND,
+    AlreadyExistsError: grpc.StatusCode.ALREADY_EXISTS,
+    ActionForbiddenError: grpc.StatusCode.FAILED_PRECONDITION,
+    InvalidCredentialsError: grpc.StatusCode.UNAUTHENTICATED,
+    InvalidCursorError: grpc.StatusCode.INVALID_ARGUMENT,
+    VersionConflictError: grpc.StatusCode.ABORTED,
+    ServiceUnavailableError: grpc.StatusCode.RESOURCE_EXHAUSTED,
+    DeadlineExceededError: grpc.StatusCode.DEADLINE_EXCEEDED,
+}
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+# SQLite hands back naive datetimes; like FromDatetime, they're taken as UTC
+NAIVE_EPOCH = datetime(1970, 1, 1)
+
+
+def timestamp_fields(dt: datetime) -> dict[str, int]:
+    """
+    A Timestamp as the seconds/nanos dict message constructors accept
+    Integer arithmetic on the offset from the epoch costs a fraction of
+    building a Timestamp and calling FromDatetime
+    """
+    delta = dt - (EPOCH if dt.tzinfo else NAIVE_EPOCH)
+    return {
+        "seconds": delta.days * 86_400 + delta.seconds,
+        "nanos": delta.microseconds * 1000,
+    }
+
 
 def datetime_to_timestamp(dt: datetime) -> Timestamp:
-    ts = Timestamp()
-    ts.FromDatetime(dt)
-    return ts
+    return Timestamp(**timestamp_fields(dt))
 
 
-async def get_current_user(context: grpc.aio.ServicerContext) -> int:
-    metadata_raw = context.invocation_metadata()
-    metadata = {k: v for k, v in metadata_raw} if metadata_raw else {}
-    auth_header = metadata.get("authorization")
+def optional_timestamp(dt: datetime | None) -> dict[str, int] | None:
+    return timestamp_fields(dt) if dt else None
+
+
+def optional_datetime(message, field: str) -> datetime | None:
+    """Value of an optional Timestamp field as an aware datetime."""
+    if not message.HasField(field):
+        return None
+    return getattr(message, field).ToDatetime(tzinfo=UTC)
+
+
+def get_bearer_token(metadata) -> str | None:
+    """Token from the "authorization: Bearer ..." entry of call metadata."""
+    for key, value in metadata or ():
+        if key == "authorization":
+            if not value.startswith("Bearer "):
+                return None
+            return value[len("Bearer ") :]
+    return None
+
+
+# Staff id of the caller, set by AuthInterceptor for authenticated methods
+current_staff_id: ContextVar[int | None] = ContextVar("current_staff_id", default=None)
+
 
-    if not auth_header or not auth_header.startswith("Bearer "):
+async def get_current_user(context: grpc.aio.ServicerContext) -> int:
+    staff_id = current_staff_id.get()
+    if staff_id is None:
+        # Only reachable if the method is declared public in METHOD_POLICIES
         await context.abort(
             grpc.StatusCode.UNAUTHENTICATED,
             "Missing or invalid token",
         )
+    return staff_id
+
 
-    token = auth_header.split(" ")[1]
-    staff_id = verify_access_token(token)
+# A parsed read_mask: field name -> subfields, None for the whole field
+ReadMask = dict[str, "ReadMask | None"]
 
-    if not staff_id:
+
+async def get_read_mask(
+    request, context: grpc.aio.ServicerContext, message_class
+) -> ReadMask | None:
+    """read_mask of a request as a tree of field names; None returns everything."""
+    if not request.HasField("read_mask") or not request.read_mask.paths:
+        return None
+    if not request.read_mask.IsValidForDescriptor(message_class.DESCRIPTOR):
         await context.abort(
-            grpc.StatusCode.UNAUTHENTICATED,
-            "Missing or invalid token",
+            grpc.StatusCode.INVALID_ARGUMENT,
+            f"read_mask has fields {message_class.DESCRIPTOR.name} doesn't have.",
+        )
+
+    mask: ReadMask = {}
+    for path in request.read_mask.paths:
+        node = mask
+        *parents, leaf = path.split(".")
+        for name in parents:
+            node = node.setdefault(name, {})
+            if node is None:
+                # The whole parent is already selected
+                break
+        else:
+            node[leaf] = None
+    return mask
+
+
+def select_fields(getters: dict, obj, mask: ReadMask | None) -> dict:
+    """Message constructor arguments for the fields in mask (all without one)."""
+    if mask is None:
+        return {name: get(obj) for name, get in getters.items()}
+    return {name: getters[name](obj) for name in mask if name in getters}
+
+
+def row_version(row) -> tuple[int, datetime]:
+    """(id, updated_at) of an ORM row, its response model or its cached JSON."""
+    if isinstance(row, dict):
+        return row["id"], datetime.fromisoformat(row["updated_at"])
+    return row.id, row.updated_at
+
+
+class MessageCache:
+    """
+    LRU of full messages, serialized, keyed by the row's (id, updated_at)
+
+    Every write to a row moves its updated_at, so an entry never goes stale;
+    superseded and deleted versions just fall out. Parsing the bytes back is
+    several times cheaper than building the message from the row, and for
+    rows served from Redis it skips validating their JSON too.
+    """
+
+    def __init__(self, message_class, maxsize: int):
+        self.message_class = message_class
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+
+    def get_or_build(self, row, build):
+        key = row_version(row)
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            return self.message_class.FromString(data)
+
+        message = build(row)
+        if self.maxsize > 0:
+            self._entries[key] = message.SerializeToString()
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return message
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_SIZE = 5000
+
+
+async def get_page_size(request, context: grpc.aio.ServicerContext) -> int:
+    """page_size of a list request; 0 means the default."""
+    if request.page_size < 0 or request.page_size > MAX_PAGE_SIZE:
+        await context.abort(
+            grpc.StatusCode.INVALID_ARGUMENT,
+            f"page_size must be between 1 and {MAX_PAGE_SIZE}.",
         )
-    return int(staff_id)
+    return request.page_size or DEFAULT_PAGE_SIZE
+
+
+async def get_batch_size(request, context: grpc.aio.ServicerContext) -> int:
+    """batch_size of a streaming request; 0 means the default."""
+    if request.batch_size < 0 or request.batch_size > MAX_BATCH_SIZE:
+        await context.abort(
+            grpc.StatusCode.INVALID_ARGUMENT,
+            f"batch_size must be between 1 and {MAX_BATCH_SIZE}.",
+        )
+    return request.batch_size or DEFAULT_BATCH_SIZE
+
+
+async def abort_with_error(
+    context: grpc.aio.ServicerContext, exc: LibraryException | ValidationError
+) -> None:
+    if isinstance(exc, ValidationError):
+        # Request fields that fail the same schema checks as the REST bodies
+        details = "; ".join(
+            f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+            for error in exc.errors()
+        )
+        await context.abort(grpc.StatusCode.INVALID_ARGUMENT, details)
+
+    code = EXCEPTION_STATUS_CODES.get(type(exc), grpc.StatusCode.INTERNAL)
+    await context.abort(code, exc.message)
 
 
 # Define metrics
@@ -76,3 +263,303 @@ class AsyncPromServerInterceptor(grpc.aio.ServerInterceptor):
             GRPC_SERVER_HANDLED_TOTAL.labels(
                 grpc_service=service, grpc_method=method, grpc_code=code
             ).inc()
+
+
+PUBLIC = "public"
+AUTHENTICATED = "authenticated"
+
+# Who may call each method; anything not listed needs a valid access token
+METHOD_POLICIES = {
+    "/library.AuthService/Register": PUBLIC,
+    "/library.AuthService/Login": PUBLIC,
+    "/library.AuthService/Refresh": PUBLIC,
+    "/library.AuthService/Logout": PUBLIC,
+    "/library.AuthService/GetCurrentUser": AUTHENTICATED,
+    "/library.BookService/GetBooks": AUTHENTICATED,
+    "/library.BookService/StreamBooks": AUTHENTICATED,
+    "/library.BookService/GetBook": AUTHENTICATED,
+    "/library.BookService/CreateBook": AUTHENTICATED,
+    "/library.BookService/UpdateBook": AUTHENTICATED,
+    "/library.BookService/DeleteBook": AUTHENTICATED,
+    "/library.MemberService/GetMembers": AUTHENTICATED,
+    "/library.MemberService/StreamMembers": AUTHENTICATED,
+    "/library.MemberService/GetMember": AUTHENTICATED,
+    "/library.MemberService/CreateMember": AUTHENTICATED,
+    "/library.MemberService/UpdateMember": AUTHENTICATED,
+    "/library.MemberService/DeleteMember": AUTHENTICATED,
+    "/library.BorrowingService/GetBorrowingsHistory": AUTHENTICATED,
+    "/library.BorrowingService/GetCurrentBorrowings": AUTHENTICATED,
+    "/library.BorrowingService/GetMemberBorrowings": AUTHENTICATED,
+    "/library.BorrowingService/GetOverdueBorrowings": AUTHENTICATED,
+    "/library.BorrowingService/StreamBorrowings": AUTHENTICATED,
+    "/library.BorrowingService/BorrowBook": AUTHENTICATED,
+    "/library.BorrowingService/ReturnBook": AUTHENTICATED,
+}
+# Whole services that need no token
+PUBLIC_SERVICES = (
+    "/grpc.reflection.v1alpha.ServerReflection/",
+    "/grpc.reflection.v1.ServerReflection/",
+)
+
+
+def _unauthenticated_handler(handler):
+    """A handler of the same shape as `handler` that only rejects the call."""
+
+    async def reject(request, context):
+        await context.abort(grpc.StatusCode.UNAUTHENTICATED, "Missing or invalid token")
+
+    if handler.unary_stream is not None:
+
+        async def reject_stream(request, context):
+            await reject(request, context)
+            yield  # never reached; makes this an async generator
+
+        return grpc.unary_stream_rpc_method_handler(
+            reject_stream,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+    return grpc.unary_unary_rpc_method_handler(
+        reject,
+        request_deserializer=handler.request_deserializer,
+        response_serializer=handler.response_serializer,
+    )
+
+
+class AuthInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Authenticates each call once, from its metadata, before the handler runs
+    The staff id is left in current_staff_id for the handler; calls without a
+    valid token never reach it
+    """
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return handler
+
+        method = handler_call_details.method
+        if method.startswith(PUBLIC_SERVICES):
+            return handler
+        if METHOD_POLICIES.get(method, AUTHENTICATED) == PUBLIC:
+            return handler
+
+        token = get_bearer_token(handler_call_details.invocation_metadata)
+        staff_id = verify_access_token(token) if token else None
+        if staff_id is None:
+            return _unauthenticated_handler(handler)
+
+        # The handler runs in this same task, so it sees the value
+        current_staff_id.set(int(staff_id))
+        return handler
+
+
+def _wrap_handler(handler, scope):
+    """
+    The same handler with every call run inside `async with scope(context)`
+    Only the unary-request shapes the services use are wrapped
+    """
+    if handler.unary_unary is not None:
+        behavior = handler.unary_unary
+
+        async def unary_unary(request, context):
+            async with scope(context):
+                return await behavior(request, context)
+
+        return grpc.unary_unary_rpc_method_handler(
+            unary_unary,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+
+    if handler.unary_stream is not None:
+        stream_behavior = handler.unary_stream
+
+        async def unary_stream(request, context):
+            async with scope(context):
+                async for response in stream_behavior(request, context):
+                    yield response
+
+        return grpc.unary_stream_rpc_method_handler(
+            unary_stream,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+
+    return handler
+
+
+class QueryStatsInterceptor(grpc.aio.ServerInterceptor):
+    """Records SQL statement count, time and rows for each RPC."""
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return handler
+
+        method = handler_call_details.method
+
+        @asynccontextmanager
+        async def observed(context):
+            with track_queries() as stats:
+                try:
+                    yield
+                finally:
+                    stats.observe(method)
+
+        return _wrap_handler(handler, observed)
+
+
+class DeadlineInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Carries the client's deadline into the call's SQL and Redis work
+    (see app.deadlines), so nothing outlives a caller that gave up
+    """
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None:
+            return handler
+
+        @asynccontextmanager
+        async def deadline(context):
+            with request_deadline(context.time_remaining()):
+                yield
+
+        return _wrap_handler(handler, deadline)
+
+
+# Methods that aren't NORMAL priority for the concurrency limiter
+METHOD_PRIORITIES = {
+    "/library.BorrowingService/BorrowBook": Priority.CRITICAL,
+    "/library.BorrowingService/ReturnBook": Priority.CRITICAL,
+    "/library.BookService/GetBooks": Priority.LOW,
+    "/library.BookService/StreamBooks": Priority.LOW,
+    "/library.MemberService/GetMembers": Priority.LOW,
+    "/library.MemberService/StreamMembers": Priority.LOW,
+    "/library.BorrowingService/GetBorrowingsHistory": Priority.LOW,
+    "/library.BorrowingService/GetCurrentBorrowings": Priority.LOW,
+    "/library.BorrowingService/GetMemberBorrowings": Priority.LOW,
+    "/library.BorrowingService/GetOverdueBorrowings": Priority.LOW,
+    "/library.BorrowingService/StreamBorrowings": Priority.LOW,
+}
+
+
+class ConcurrencyLimitInterceptor(grpc.aio.ServerInterceptor):
+    """
+    Sheds calls beyond the adaptive limit (app.load_shedding) with
+    RESOURCE_EXHAUSTED and a retry pushback, before any other work
+    """
+
+    def __init__(self, limiter: AdaptiveLimiter = LIMITER):
+        self.limiter = limiter
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or handler_call_details.method.startswith(PUBLIC_SERVICES):
+            return handler
+
+        priority = METHOD_PRIORITIES.get(handler_call_details.method, Priority.NORMAL)
+        # A stream lasts as long as the client reads, so its duration says
+        # nothing about server load
+        streaming = handler.unary_stream is not None
+
+        @asynccontextmanager
+        async def limited(context):
+            if not self.limiter.try_acquire(priority):
+                await context.abort(
+                    grpc.StatusCode.RESOURCE_EXHAUSTED,
+                    "Server is overloaded, retry shortly.",
+                    trailing_metadata=(
+                        ("grpc-retry-pushback-ms", str(RETRY_AFTER_SECONDS * 1000)),
+                    ),
+                )
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.limiter.release(None if streaming else time.perf_counter() - start)
+
+        return _wrap_handler(handler, limited)
+
+
+# Responses of these methods are gzipped for clients that accept it when
+# they are at least this many bytes; smaller ones and other methods go as is
+METHOD_COMPRESSION = {
+    "/library.BookService/GetBooks": settings.grpc_gzip_min_bytes,
+    "/library.BookService/StreamBooks": settings.grpc_gzip_min_bytes,
+    "/library.MemberService/GetMembers": settings.grpc_gzip_min_bytes,
+    "/library.MemberService/StreamMembers": settings.grpc_gzip_min_bytes,
+    "/library.BorrowingService/GetBorrowingsHistory": settings.grpc_gzip_min_bytes,
+    "/library.BorrowingService/GetCurrentBorrowings": settings.grpc_gzip_min_bytes,
+    "/library.BorrowingService/GetMemberBorrowings": settings.grpc_gzip_min_bytes,
+    "/library.BorrowingService/GetOverdueBorrowings": settings.grpc_gzip_min_bytes,
+    "/library.BorrowingService/StreamBorrowings": settings.grpc_gzip_min_bytes,
+}
+
+
+# Clients list the encodings they can decode here. grpc.aio neither exposes
+# the standard grpc-accept-encoding header nor honours it, and a client
+# without gzip fails on a gzipped response, so compression is opt-in
+ACCEPT_ENCODING_KEY = "x-grpc-accept-encoding"
+
+
+def accepts_gzip(metadata) -> bool:
+    for key, value in metadata or ():
+        if key == ACCEPT_ENCODING_KEY:
+            return "gzip" in (encoding.strip() for encoding in value.split(","))
+    return False
+
+
+class CompressionInterceptor(grpc.aio.ServerInterceptor):
+    """Gzips large responses of the methods in METHOD_COMPRESSION"""
+
+    def __init__(self, methods: dict[str, int] = METHOD_COMPRESSION):
+        self.methods = methods
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        min_bytes = self.methods.get(handler_call_details.method)
+        if (
+            handler is None
+            or min_bytes is None
+            or not accepts_gzip(handler_call_details.invocation_metadata)
+        ):
+            return handler
+
+        if handler.unary_unary is not None:
+            behavior = handler.unary_unary
+
+            async def unary_unary(request, context):
+                response = await behavior(request, context)
+                if response.ByteSize() >= min_bytes:
+                    context.set_compression(grpc.Compression.Gzip)
+                    # grpc.aio only compresses a unary response whose
+                    # metadata went out on its own first
+                    await context.send_initial_metadata(())
+                return response
+
+            return grpc.unary_unary_rpc_method_handler(
+                unary_unary,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        if handler.unary_stream is not None:
+            stream_behavior = handler.unary_stream
+
+            async def unary_stream(request, context):
+                context.set_compression(grpc.Compression.Gzip)
+                async for response in stream_behavior(request, context):
+                    # Compression is per call, but each message can opt out
+                    if response.ByteSize() < min_bytes:
+                        context.disable_next_message_compression()
+                    yield response
+
+            return grpc.unary_stream_rpc_method_handler(
+                unary_stream,
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+
+        return handler
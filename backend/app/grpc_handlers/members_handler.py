@@ -1,22 +1,60 @@
+from operator import attrgetter
+
 import grpc
 from protos import common_pb2, members_pb2, members_pb2_grpc
-from sqlalchemy import func, select
+from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError
 
 from app import models
-from app.database import AsyncSessionLocal
-from app.grpc_handlers.helpers import datetime_to_timestamp, get_current_user
-
-
-def member_to_proto(member: models.Member) -> members_pb2.Member:
-    return members_pb2.Member(
-        id=member.id,
-        name=member.name or "",
-        email=member.email,
-        phone=member.phone or "",
-        created_at=datetime_to_timestamp(member.created_at),
-        updated_at=datetime_to_timestamp(member.updated_at),
-    )
+from app.config import settings
+from app.exceptions import LibraryException
+from app.grpc_handlers.helpers import (
+    MessageCache,
+    ReadMask,
+    abort_with_error,
+    get_batch_size,
+    get_page_size,
+    get_read_mask,
+    optional_timestamp,
+    select_fields,
+    timestamp_fields,
+)
+from app.repositories.member_repository_pg import MEMBER_ORDERINGS
+from app.repositories.unit_of_work import unit_of_work
+from app.schemas import MemberCreate, MemberResponse, MemberUpdate
+from app.services import MemberService
+
+MEMBER_FIELDS = {
+    "id": attrgetter("id"),
+    "name": lambda member: member.name or "",
+    "email": attrgetter("email"),
+    "phone": lambda member: member.phone or "",
+    "created_at": lambda member: timestamp_fields(member.created_at),
+    "updated_at": lambda member: timestamp_fields(member.updated_at),
+    "total_borrows": attrgetter("total_borrows"),
+    "active_loans": attrgetter("active_loans"),
+    "last_borrowed_at": lambda member: optional_timestamp(member.last_borrowed_at),
+    "version": attrgetter("version"),
+}
+
+
+MEMBER_MESSAGES = MessageCache(members_pb2.Member, settings.grpc_message_cache_size)
+
+
+def member_to_proto(
+    member: models.Member | MemberResponse | dict, mask: ReadMask | None = None
+) -> members_pb2.Member:
+    if mask is None:
+        return MEMBER_MESSAGES.get_or_build(member, _build_member)
+    return _build_member(member, mask)
+
+
+def _build_member(
+    member: models.Member | MemberResponse | dict, mask: ReadMask | None = None
+) -> members_pb2.Member:
+    if isinstance(member, dict):
+        member = MemberResponse.model_validate(member)
+    return members_pb2.Member(**select_fields(MEMBER_FIELDS, member, mask))
 
 
 class MemberServicer(members_pb2_grpc.MemberServiceServicer):
@@ -25,79 +63,96 @@ class MemberServicer(members_pb2_grpc.MemberServiceServicer):
         request: members_pb2.GetMembersRequest,
         context: grpc.aio.ServicerContext,
     ) -> members_pb2.GetMembersResponse:
-        await get_current_user(context)
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(select(models.Member))
-            members = result.scalars().all()
-            return members_pb2.GetMembersResponse(
-                members=[member_to_proto(member) for member in members]
+        page_size = await get_page_size(request, context)
+        order_by = request.order_by if request.HasField("order_by") else "id"
+        if order_by not in MEMBER_ORDERINGS:
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"order_by must be one of: {', '.join(MEMBER_ORDERINGS)}",
+            )
+        search = request.query if request.HasField("query") else None
+        mask = await get_read_mask(request, context, members_pb2.Member)
+
+        async with unit_of_work() as uow:
+            service = MemberService(uow)
+            try:
+                members, next_page_token = await service.get_members(
+                    page_size,
+                    cursor=request.page_token or None,
+                    order_by=order_by,
+                    search=search,
+                )
+            except LibraryException as e:
+                await abort_with_error(context, e)
+
+            response = members_pb2.GetMembersResponse(
+                members=[member_to_proto(member, mask) for member in members],
+                next_page_token=next_page_token or "",
             )
+            if request.include_total:
+                total, estimated = await service.count_members(search)
+                response.total_count = total
+                response.total_count_estimated = estimated
+            return response
+
+    async def StreamMembers(
+        self,
+        request: members_pb2.StreamMembersRequest,
+        context: grpc.aio.ServicerContext,
+    ):
+        batch_size = await get_batch_size(request, context)
+        search = request.query if request.HasField("query") else None
+        mask = await get_read_mask(request, context, members_pb2.Member)
+
+        async with unit_of_work() as uow:
+            async for members in MemberService(uow).stream_members(batch_size, search):
+                yield members_pb2.GetMembersResponse(
+                    members=[member_to_proto(member, mask) for member in members]
+                )
 
     async def GetMember(
         self,
         request: members_pb2.GetMemberRequest,
         context: grpc.aio.ServicerContext,
     ) -> members_pb2.Member:
-        await get_current_user(context)
         if request.id <= 0:
             await context.abort(
                 grpc.StatusCode.INVALID_ARGUMENT, "member_id must be positive"
             )
+        mask = await get_read_mask(request, context, members_pb2.Member)
 
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(models.Member).where(models.Member.id == request.id)
-            )
-            member = result.scalars().first()
-            if not member:
-                await context.abort(grpc.StatusCode.NOT_FOUND, "Member not found")
-            return member_to_proto(member)
+        async with unit_of_work() as uow:
+            try:
+                member = await MemberService(uow).get_member_by_id(request.id)
+            except LibraryException as e:
+                await abort_with_error(context, e)
+
+            return member_to_proto(member, mask)
 
     async def CreateMember(
         self,
         request: members_pb2.CreateMemberRequest,
         context: grpc.aio.ServicerContext,
     ) -> members_pb2.Member:
-        await get_current_user(context)
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(models.Member).where(
-                    func.lower(models.Member.email) == request.email.lower()
-                )
-            )
-            existing_member = result.scalars().first()
-            if existing_member:
-                await context.abort(
-                    grpc.StatusCode.ALREADY_EXISTS, "Email or Phone already in use."
-                )
-
-            if request.HasField("phone"):
-                result = await db.execute(
-                    select(models.Member).where(models.Member.phone == request.phone)
-                )
-
-                phone_in_use = result.scalars().first()
-                if phone_in_use:
-                    await context.abort(
-                        grpc.StatusCode.ALREADY_EXISTS, "Email or Phone already in use."
-                    )
-
-            new_member = models.Member(
+        try:
+            member = MemberCreate(
                 name=request.name if request.HasField("name") else None,
                 email=request.email.lower(),
                 phone=request.phone if request.HasField("phone") else None,
             )
+        except ValidationError as e:
+            await abort_with_error(context, e)
 
-            db.add(new_member)
+        async with unit_of_work() as uow:
             try:
-                await db.commit()
+                new_member = await MemberService(uow).create_member(member)
+            except LibraryException as e:
+                await abort_with_error(context, e)
             except IntegrityError:
-                await db.rollback()
                 await context.abort(
                     grpc.StatusCode.ALREADY_EXISTS, "Email or Phone already in use."
                 )
 
-            await db.refresh(new_member)
             return member_to_proto(new_member)
 
     async def UpdateMember(
@@ -105,80 +160,50 @@ class MemberServicer(members_pb2_grpc.MemberServiceServicer):
         request: members_pb2.UpdateMemberRequest,
         context: grpc.aio.ServicerContext,
     ) -> members_pb2.Member:
-        await get_current_user(context)
         if request.id <= 0:
             await context.abort(
                 grpc.StatusCode.INVALID_ARGUMENT, "member_id must be positive"
             )
 
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(models.Member)
-                .where(models.Member.id == request.id)
-                .with_for_update()
-            )
-            existing_member = result.scalars().first()
-            if not existing_member:
-                await context.abort(grpc.StatusCode.NOT_FOUND, "Member not found")
-
-            if request.HasField("phone"):
-                result = await db.execute(
-                    select(models.Member)
-                    .where(
-                        models.Member.phone == request.phone,
-                        models.Member.id != request.id,
-                    )
-                    .with_for_update()
-                )
-                phone_in_use = result.scalars().first()
-                if phone_in_use:
-                    await context.abort(
-                        grpc.StatusCode.ALREADY_EXISTS, "Phone already in use."
-                    )
-                existing_member.phone = request.phone
+        member = MemberUpdate(
+            **{
+                field: getattr(request, field)
+                for field in ("name", "phone")
+                if request.HasField(field)
+            }
+        )
+        expected_version = request.version if request.HasField("version") else None
 
-            if request.HasField("name"):
-                existing_member.name = request.name
+        async with unit_of_work() as uow:
+            try:
+                updated_member = await MemberService(uow).update_member(
+                    request.id, member, expected_version
+                )
+            except LibraryException as e:
+                await abort_with_error(context, e)
+            except IntegrityError:
+                await context.abort(
+                    grpc.StatusCode.ALREADY_EXISTS, "Phone already in use."
+                )
 
-            await db.commit()
-            await db.refresh(existing_member)
-            return member_to_proto(existing_member)
+            return member_to_proto(updated_member)
 
     async def DeleteMember(
         self,
         request: members_pb2.DeleteMemberRequest,
         context: grpc.aio.ServicerContext,
     ) -> common_pb2.Empty:
-        await get_current_user(context)
         if request.id <= 0:
             await context.abort(
                 grpc.StatusCode.INVALID_ARGUMENT, "member_id must be positive"
             )
 
-        async with AsyncSessionLocal() as db:
-            result = await db.execute(
-                select(models.Member)
-                .where(models.Member.id == request.id)
-                .with_for_update()
-            )
-            member = result.scalars().first()
-            if not member:
-                await context.abort(grpc.StatusCode.NOT_FOUND, "Member not found")
-
-            result = await db.execute(
-                select(models.Borrowing.member_id)
-                .where(models.Borrowing.member_id == request.id)
-                .with_for_update()
-            )
-            has_history = result.scalars().first()
+        expected_version = request.version if request.HasField("version") else None
 
-            if has_history:
-                await context.abort(
-                    grpc.StatusCode.FAILED_PRECONDITION,
-                    "Cannot delete member with borrowing history",
-                )
-
-            await db.delete(member)
-            await db.commit()
+        async with unit_of_work() as uow:
+            try:
+                await MemberService(uow).delete_member(request.id, expected_version)
+            except LibraryException as e:
+                await abort_with_error(context, e)
 
             return common_pb2.Empty()
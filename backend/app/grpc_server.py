@@ -1,6 +1,10 @@
 import asyncio
 import logging
-from concurrent import futures
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import wait
 
 import grpc
 from grpc_reflection.v1alpha import reflection
@@ -15,43 +19,98 @@ from protos import (
     members_pb2,
     members_pb2_grpc,
 )
+from pubsub import get_connection
 
+from app.config import settings
+from app.deadlines import install_deadlines
+from app.metrics import (
+    mark_worker_dead,
+    multiprocess_registry,
+    prepare_multiprocess_dir,
+)
 from app.grpc_handlers import (
     AsyncPromServerInterceptor,
+    AuthInterceptor,
     AuthServicer,
     BookServicer,
     BorrowingServicer,
+    CompressionInterceptor,
+    ConcurrencyLimitInterceptor,
+    DeadlineInterceptor,
     MemberServicer,
+    QueryStatsInterceptor,
 )
+from app.partitions import maintain_partitions
+from app.redis_client import close_redis, init_redis
+from app.revocation import sync_revocations
+from app.slow_query_log import install_slow_query_log
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-async def serve():
+LISTEN_ADDR = "0.0.0.0:50052"
+METRICS_PORT = 9000
+SHUTDOWN_GRACE_SECONDS = 5
+# How often the supervisor wakes to check shutdown deadlines
+SUPERVISOR_POLL_SECONDS = 1
+
+
+async def serve(worker: bool = False):
     """
     Main function that creates and runs the gRPC server
     This is similar to how FastAPI creates an app with app = FastAPI()
+
+    As one of several workers (worker=True) it shares the port with the
+    others and leaves the metrics endpoint to the supervisor
     """
 
     # ============================================
     # 1. CREATE THE SERVER
     # ============================================
     server = grpc.aio.server(
-        # ThreadPoolExecutor: Manages worker threads for handling requests
-        # max_workers=10 means up to 10 requests can be processed simultaneously
-        futures.ThreadPoolExecutor(max_workers=100),
-        interceptors=[AsyncPromServerInterceptor()],
+        # Handlers are all coroutines on this process's event loop; more
+        # cores means more processes (see run_workers), not threads
+        # Shedding and auth come first so rejected calls cost next to nothing
+        interceptors=[
+            AsyncPromServerInterceptor(),
+            *(
+                [ConcurrencyLimitInterceptor()]
+                if settings.concurrency_limit_enabled
+                else []
+            ),
+            AuthInterceptor(),
+            DeadlineInterceptor(),
+            QueryStatsInterceptor(),
+            *([CompressionInterceptor()] if settings.grpc_compression_enabled else []),
+        ],
         # Options: Configuration for the server
         options=[
             # Maximum message size: 10MB (default is 4MB)
             # Useful if you're sending/receiving large data
             ("grpc.max_send_message_length", 10 * 1024 * 1024),
             ("grpc.max_receive_message_length", 10 * 1024 * 1024),
-            # Don't reuse port (Windows compatibility)
-            ("grpc.so_reuseport", 0),
+            # Workers bind the same port and the kernel spreads connections
+            # across them; a single process doesn't reuse it (Windows
+            # compatibility)
+            ("grpc.so_reuseport", 1 if worker else 0),
         ],
     )
+    # Servicers go through the same services as the REST API, so they need
+    # the same Redis cache and RabbitMQ channel (see main.lifespan)
+    await init_redis()
+    revocation_sync = asyncio.create_task(sync_revocations())
+    try:
+        rmq_conn = await get_connection(
+            settings.rabbitmq_url,
+            connection_name=f"library-grpc-{os.getpid()}",
+            timeout=5,
+        )
+        rmq_channel = await rmq_conn.channel()
+    except Exception as e:
+        logger.warning(f"   RabbitMQ unreachable, events disabled: {e}")
+        rmq_conn = rmq_channel = None
+
     # ============================================
     # 2. REGISTER YOUR SERVICES
     # ============================================
@@ -64,7 +123,7 @@ async def serve():
         server,
     )
     books_pb2_grpc.add_BookServiceServicer_to_server(
-        BookServicer(),  # Your handler class (the implementation)
+        BookServicer(rmq_channel),  # Your handler class (the implementation)
         server,  # The server to add it to
     )
     members_pb2_grpc.add_MemberServiceServicer_to_server(
@@ -72,7 +131,7 @@ async def serve():
         server,
     )
     borrowings_pb2_grpc.add_BorrowingServiceServicer_to_server(
-        BorrowingServicer(),
+        BorrowingServicer(rmq_channel),
         server,
     )
     # ============================================
@@ -101,16 +160,25 @@ async def serve():
     #   - 50052 = the port number
     #
     # Similar to: uvicorn.run(app, host="0.0.0.0", port=8000)
-    listen_addr = "0.0.0.0:50052"
-    server.add_insecure_port(listen_addr)
+    server.add_insecure_port(LISTEN_ADDR)
     # Note: "insecure" means no TLS/SSL encryption
     # For production, you'd use add_secure_port() with certificates
 
     # ============================================
     # 5. START HTTP SERVER FOR PROMETHEUS
     # ============================================
-    start_http_server(9000)
-    logger.info("   Prometheus metric available on port 9000")
+    if not worker:
+        start_http_server(METRICS_PORT)
+        logger.info(f"   Prometheus metric available on port {METRICS_PORT}")
+
+    # SET LOCAL statement_timeout from each call's deadline
+    install_deadlines()
+
+    if install_slow_query_log():
+        logger.info("   Slow query log enabled")
+
+    # Keep upcoming borrowing_records partitions in place while we run
+    partition_maintenance = asyncio.create_task(maintain_partitions())
 
     # ============================================
     # 6. START THE SERVER
@@ -123,23 +191,102 @@ async def serve():
 
     async def shutdown():
         logger.info("   Shutting down gRPC server...")
-        await server.stop(grace=5)  # 5 second grace period
+        await server.stop(grace=SHUTDOWN_GRACE_SECONDS)
+        revocation_sync.cancel()
+        partition_maintenance.cancel()
+        if rmq_conn:
+            await rmq_conn.close()
+        await close_redis()
         logger.info("   Server stopped!")
 
     # ============================================
     # 7. KEEP THE SERVER RUNNING
     # ============================================
-    # This blocks forever, keeping the server alive
-    # until you press Ctrl+C or the process is killed
+    # This blocks until Ctrl+C or SIGTERM (from docker or the supervisor),
+    # then lets in-flight calls finish before closing connections
+    stop_requested = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_requested.set)
     try:
-        await server.wait_for_termination()
-    except KeyboardInterrupt:
+        await stop_requested.wait()
         await shutdown()
     except Exception as e:
         logger.error(f"   Server error: {e}", exc_info=True)
         raise
 
 
+def _run_worker():
+    logging.basicConfig(level=logging.INFO)
+    # The supervisor handles Ctrl+C for the whole group and relays SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(serve(worker=True))
+
+
+def run_workers(count: int):
+    """
+    Supervise `count` server processes that share the gRPC port
+    Each worker is a fresh interpreter ("spawn", not fork) with its own event
+    loop, database pool, Redis and RabbitMQ connections; this process only
+    restarts workers that die, serves their merged metrics and relays
+    shutdown
+    """
+    metrics_dir = prepare_multiprocess_dir("grpc-metrics-")
+    # Workers size their database pools from this
+    os.environ["DB_POOL_WORKERS"] = str(count)
+    start_http_server(METRICS_PORT, registry=multiprocess_registry())
+    logger.info(f"   Prometheus metric available on port {METRICS_PORT}")
+    logger.info(f"   Starting {count} gRPC workers (metrics in {metrics_dir})")
+
+    ctx = multiprocessing.get_context("spawn")
+    stopping = False
+    # On shutdown, when to stop waiting for graceful exits and kill
+    kill_at = None
+
+    def stop_workers(signum, frame):
+        nonlocal stopping, kill_at
+        stopping = True
+        kill_at = time.monotonic() + SHUTDOWN_GRACE_SECONDS + 10
+        for process in workers:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+    def start_worker():
+        process = ctx.Process(target=_run_worker, name="grpc-worker")
+        process.start()
+        return process
+
+    signal.signal(signal.SIGINT, stop_workers)
+    signal.signal(signal.SIGTERM, stop_workers)
+
+    workers = [start_worker() for _ in range(count)]
+    while workers:
+        # The signal handler runs inside wait(), which then resumes with its
+        # original timeout; poll so a kill_at set by SIGTERM is noticed
+        wait([process.sentinel for process in workers], SUPERVISOR_POLL_SECONDS)
+        if kill_at is not None and time.monotonic() >= kill_at:
+            for process in [p for p in workers if p.is_alive()]:
+                logger.warning(f"   Worker {process.pid} did not stop, killing")
+                process.kill()
+            kill_at = None
+        for process in [p for p in workers if not p.is_alive()]:
+            workers.remove(process)
+            mark_worker_dead(process.pid)
+            if not stopping:
+                logger.warning(
+                    f"   Worker {process.pid} exited with {process.exitcode}, "
+                    "restarting"
+                )
+                # Don't spin if workers die on startup
+                time.sleep(1)
+                workers.append(start_worker())
+
+    logger.info("   All workers stopped")
+
+
 if __name__ == "__main__":
-    # asyncio.run() creates an event loop and runs the serve() function
-    asyncio.run(serve())
+    if settings.grpc_workers > 1:
+        run_workers(settings.grpc_workers)
+    else:
+        # asyncio.run() creates an event loop and runs the serve() function
+        asyncio.run(serve())
@@ -0,0 +1,199 @@
+"""
+Adaptive concurrency limit.
+
+Each server process admits at most `limit` requests at a time and answers
+the rest at once with 503 / RESOURCE_EXHAUSTED and a retry hint, rather than
+letting them queue on the connection pool for up to DB_POOL_TIMEOUT while
+everyone's latency climbs. The limit is not a fixed number: it follows the
+ratio of long-term to recent latency (after Netflix's Gradient2 limiter),
+growing while requests are as fast as usual and shrinking as soon as they
+start to queue.
+
+Requests carry a priority. Lower priorities may only fill part of the limit,
+so list browsing is shed first and borrow/return keep working longest.
+"""
+
+import math
+import re
+import time
+from enum import IntEnum
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from prometheus_client import Counter, Gauge
+
+from app.config import settings
+
+CONCURRENCY_LIMIT = Gauge(
+    "concurrency_limit",
+    "Current adaptive limit on requests in flight",
+    multiprocess_mode="livesum",
+)
+CONCURRENCY_IN_FLIGHT = Gauge(
+    "concurrency_in_flight",
+    "Requests currently admitted by the concurrency limiter",
+    multiprocess_mode="livesum",
+)
+CONCURRENCY_REJECTED = Counter(
+    "concurrency_rejected_total",
+    "Requests shed because the concurrency limit was reached",
+    ["priority"],
+)
+
+RETRY_AFTER_SECONDS = 1
+
+
+class Priority(IntEnum):
+    LOW = 0
+    NORMAL = 1
+    CRITICAL = 2
+
+
+# Share of the limit each priority may fill
+PRIORITY_SHARE = {
+    Priority.LOW: 0.75,
+    Priority.NORMAL: 0.9,
+    Priority.CRITICAL: 1.0,
+}
+
+
+class AdaptiveLimiter:
+    """
+    Gradient concurrency limit
+
+    Latency is averaged over short windows and compared with a slow moving
+    average of those windows. While recent latency stays within `tolerance`
+    of the long-term one the limit grows by about sqrt(limit) per window;
+    beyond that it is scaled down by long/recent, at most halving per window.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        window_seconds: float = 0.25,
+        window_min_samples: int = 10,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.window_seconds = window_seconds
+        self.window_min_samples = window_min_samples
+        self.in_flight = 0
+        self._long_rtt: float | None = None
+        self._reset_window()
+        CONCURRENCY_LIMIT.set(self.limit)
+
+    def _reset_window(self) -> None:
+        self._window_start = time.monotonic()
+        self._window_samples = 0
+        self._window_rtt = 0.0
+        self._window_max_in_flight = 0
+
+    def try_acquire(self, priority: Priority) -> bool:
+        if self.in_flight >= max(self.limit * PRIORITY_SHARE[priority], 1):
+            CONCURRENCY_REJECTED.labels(priority.name.lower()).inc()
+            return False
+        self.in_flight += 1
+        CONCURRENCY_IN_FLIGHT.inc()
+        return True
+
+    def release(self, latency: float | None) -> None:
+        """Finish an admitted request; None for calls whose time isn't a signal."""
+        self._window_max_in_flight = max(self._window_max_in_flight, self.in_flight)
+        self.in_flight -= 1
+        CONCURRENCY_IN_FLIGHT.dec()
+        if latency is None:
+            return
+
+        self._window_samples += 1
+        self._window_rtt += latency
+        if (
+            self._window_samples >= self.window_min_samples
+            and time.monotonic() - self._window_start >= self.window_seconds
+        ):
+            self._update(
+                self._window_rtt / self._window_samples, self._window_max_in_flight
+            )
+            self._reset_window()
+
+    def _update(self, short_rtt: float, max_in_flight: int) -> None:
+        if self._long_rtt is None:
+            self._long_rtt = short_rtt
+            return
+        self._long_rtt += 0.02 * (short_rtt - self._long_rtt)
+        # After a long overload the baseline is inflated; let it recover
+        if self._long_rtt > 2 * short_rtt:
+            self._long_rtt *= 0.95
+
+        # A limit the traffic doesn't come near says nothing about capacity
+        if max_in_flight < self.limit / 2:
+            return
+
+        gradient = max(0.5, min(1.0, self.tolerance * self._long_rtt / short_rtt))
+        new_limit = self.limit * gradient + math.sqrt(self.limit)
+        limit = self.limit * (1 - self.smoothing) + new_limit * self.smoothing
+        self.limit = min(max(limit, self.min_limit), self.max_limit)
+        CONCURRENCY_LIMIT.set(self.limit)
+
+
+LIMITER = AdaptiveLimiter(
+    settings.concurrency_limit_initial,
+    settings.concurrency_limit_min,
+    settings.concurrency_limit_max,
+)
+
+
+# REST routes that aren't NORMAL priority, matched before routing
+ROUTE_PRIORITIES = [
+    ("POST", re.compile(r"/api/borrowings/borrow"), Priority.CRITICAL),
+    ("PUT", re.compile(r"/api/borrowings/return"), Priority.CRITICAL),
+    ("GET", re.compile(r"/api/(books|members|borrowings)"), Priority.LOW),
+    ("GET", re.compile(r"/api/borrowings/(history|overdue)"), Priority.LOW),
+    ("GET", re.compile(r"/api/borrowings/(members|books)/\d+"), Priority.LOW),
+    ("GET", re.compile(r"/api/admin/.*"), Priority.LOW),
+]
+# Probes and docs are never shed
+EXEMPT_PATHS = {"/", "/ready", "/metrics", "/docs", "/redoc", "/openapi.json"}
+
+
+def route_priority(method: str, path: str) -> Priority:
+    path = path.rstrip("/") or "/"
+    for route_method, pattern, priority in ROUTE_PRIORITIES:
+        if method == route_method and pattern.fullmatch(path):
+            return priority
+    return Priority.NORMAL
+
+
+class ConcurrencyLimitMiddleware:
+    """ASGI middleware applying LIMITER to HTTP requests."""
+
+    def __init__(self, app, limiter: AdaptiveLimiter = LIMITER):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        priority = route_priority(scope["method"], scope["path"])
+        if not self.limiter.try_acquire(priority):
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Server is overloaded, retry shortly."},
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+            await response(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release(time.perf_counter() - start)
@@ -1,22 +1,37 @@
+import asyncio
+import math
+import os
 from contextlib import asynccontextmanager
 
+import uvicorn
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from prometheus_fastapi_instrumentator import Instrumentator
 from pubsub import get_connection
 
+from app import redis_client
 from app.config import settings
-from app.database import engine
+from app.database import engine, track_queries, warm_pool
+from app.deadlines import install_deadlines, request_deadline
 from app.exceptions import (
     ActionForbiddenError,
     AlreadyExistsError,
+    DeadlineExceededError,
     InvalidCredentialsError,
+    InvalidCursorError,
     LibraryException,
     NotFoundError,
+    ServiceUnavailableError,
+    VersionConflictError,
 )
+from app.load_shedding import ConcurrencyLimitMiddleware
+from app.metrics import mark_worker_dead, multiprocess_enabled, prepare_multiprocess_dir
+from app.partitions import maintain_partitions
 from app.redis_client import close_redis, init_redis
-from app.routers import auth, books, borrowings, members
+from app.revocation import sync_revocations
+from app.slow_query_log import install_slow_query_log
+from app.routers import admin, auth, books, borrowings, members
 
 
 @asynccontextmanager
@@ -25,26 +40,58 @@ async def lifespan(_app: FastAPI):
     Lifespan context manager for FastAPI application.
     Handles startup and shutdown events.
     Database schema is managed via Alembic migrations.
+
+    Every worker process runs this for itself and only starts accepting
+    requests once it returns, so its pool, Redis and RabbitMQ connections
+    are open before the first request; GET /ready reports what came up.
     """
+    readiness = _app.state.readiness = {
+        "database": False,
+        "redis": False,
+        "rabbitmq": False,
+    }
     try:
         await init_redis()
     except Exception as e:
         print("WARNING :: Redis Unreachble: ", e)
+    readiness["redis"] = redis_client.redis_client is not None
+    revocation_sync = asyncio.create_task(sync_revocations())
+
+    install_slow_query_log()
+    install_deadlines()
+
+    try:
+        await warm_pool()
+        readiness["database"] = True
+    except Exception as e:
+        print("WARNING: Could not warm the database pool: ", e)
+
+    # Keep upcoming borrowing_records partitions in place while we run
+    partition_maintenance = asyncio.create_task(maintain_partitions())
 
     # RMQ
     try:
-        rmq_conn = await get_connection(settings.rabbitmq_url)
+        rmq_conn = await get_connection(
+            settings.rabbitmq_url,
+            connection_name=f"library-api-{os.getpid()}",
+            timeout=5,
+        )
         _app.state.rmq_channel = await rmq_conn.channel()
+        readiness["rabbitmq"] = True
     except Exception as e:
         print("WARNING: RabbitMQ Unreachable: ", e)
         rmq_conn = None
 
     yield
 
+    revocation_sync.cancel()
+    partition_maintenance.cancel()
     if rmq_conn:
         await rmq_conn.close()
     await close_redis()
     await engine.dispose()
+    if multiprocess_enabled():
+        mark_worker_dead(os.getpid())
 
 
 # Initialize FastAPI application
@@ -54,6 +101,10 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan,
 )
+# Innermost of the middleware, so shed requests still get CORS headers
+# and show up in the HTTP metrics
+if settings.concurrency_limit_enabled:
+    app.add_middleware(ConcurrencyLimitMiddleware)
 Instrumentator().instrument(app).expose(app)
 
 # Configure CORS to allow frontend to communicate with backend
@@ -63,12 +114,55 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser clients read concurrency and pagination headers
+    expose_headers=[
+        "ETag",
+        "X-Next-Cursor",
+        "X-Total-Count",
+        "X-Total-Count-Estimated",
+    ],
 )
 
+
+@app.middleware("http")
+async def request_timeout(request: Request, call_next):
+    """Apply an X-Request-Timeout header (seconds) to the request's SQL and Redis"""
+    header = request.headers.get("x-request-timeout")
+    if header is None:
+        return await call_next(request)
+
+    try:
+        seconds = float(header)
+    except ValueError:
+        seconds = 0
+    if not (seconds > 0 and math.isfinite(seconds)):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "detail": "X-Request-Timeout must be a positive number of seconds"
+            },
+        )
+
+    with request_deadline(seconds):
+        return await call_next(request)
+
+
+@app.middleware("http")
+async def sql_instrumentation(request: Request, call_next):
+    with track_queries() as stats:
+        response = await call_next(request)
+
+    # Label by route template so ids in the path don't explode cardinality
+    route = request.scope.get("route")
+    stats.observe(f"{request.method} {route.path}" if route else "unmatched")
+    return response
+
+
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(books.router, prefix="/api/books", tags=["books"])
 app.include_router(members.router, prefix="/api/members", tags=["members"])
 app.include_router(borrowings.router, prefix="/api/borrowings", tags=["borrowings"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
 
 @app.exception_handler(LibraryException)
@@ -83,6 +177,18 @@ async def library_exception_handler(request: Request, exc: LibraryException):
         status_code = status.HTTP_400_BAD_REQUEST
     elif isinstance(exc, InvalidCredentialsError):
         status_code = status.HTTP_401_UNAUTHORIZED
+    elif isinstance(exc, InvalidCursorError):
+        status_code = status.HTTP_400_BAD_REQUEST
+    elif isinstance(exc, VersionConflictError):
+        status_code = status.HTTP_409_CONFLICT
+    elif isinstance(exc, DeadlineExceededError):
+        status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    elif isinstance(exc, ServiceUnavailableError):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": exc.message},
+            headers={"Retry-After": "1"},
+        )
 
     return JSONResponse(
         status_code=status_code,
@@ -90,6 +196,29 @@ async def library_exception_handler(request: Request, exc: LibraryException):
     )
 
 
+@app.get("/ready", include_in_schema=False)
+async def ready(request: Request):
+    """
+    Readiness probe: 503 until this worker can reach the database
+    Redis and RabbitMQ are reported but optional, the API degrades without
+    them (no caching, no events)
+    """
+    readiness = request.app.state.readiness
+    if not readiness["database"]:
+        try:
+            await warm_pool()
+            readiness["database"] = True
+        except Exception:
+            pass
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK
+        if readiness["database"]
+        else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=readiness,
+    )
+
+
 @app.get("/", include_in_schema=False)
 async def root():
     """Root endpoint to verify API is running"""
@@ -97,3 +226,12 @@ async def root():
         "message": "Welcome to Neighborhood Library API",
         "docs": "/docs",
     }
+
+
+if __name__ == "__main__":
+    if settings.web_workers > 1:
+        # uvicorn spawns the workers, which read these on import: metrics go
+        # to shared files and the database budget is split between them
+        prepare_multiprocess_dir("api-metrics-")
+        os.environ["DB_POOL_WORKERS"] = str(settings.web_workers)
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, workers=settings.web_workers)
@@ -0,0 +1,43 @@
+"""
+Prometheus metrics across worker processes.
+
+Each worker process keeps its own metric values, so a supervisor running
+several of them points PROMETHEUS_MULTIPROC_DIR at a shared directory before
+they start. prometheus_client then keeps every value in a memory-mapped file
+there, and one collector merges the files at scrape time.
+"""
+
+import os
+import tempfile
+
+from prometheus_client import CollectorRegistry, multiprocess
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def multiprocess_enabled() -> bool:
+    return MULTIPROC_DIR_ENV in os.environ
+
+
+def prepare_multiprocess_dir(prefix: str) -> str:
+    """Point this process's future children at an empty metrics directory."""
+    path = os.environ.get(MULTIPROC_DIR_ENV) or tempfile.mkdtemp(prefix=prefix)
+    os.makedirs(path, exist_ok=True)
+    # Files left by a previous run would be merged into this one's totals
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+    os.environ[MULTIPROC_DIR_ENV] = path
+    return path
+
+
+def multiprocess_registry() -> CollectorRegistry:
+    """Registry that reports the merged values of every worker."""
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop a stopped worker's live gauges from the merged values."""
+    multiprocess.mark_process_dead(pid)
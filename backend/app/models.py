@@ -2,21 +2,67 @@ from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
+LOAN_PERIOD = timedelta(days=14)
+
+
+def _default_due_date(context) -> datetime:
+    return context.get_current_parameters()["borrowed_date"] + LOAN_PERIOD
+
 
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        CheckConstraint(
+            "available_copies >= 0 AND available_copies <= total_copies",
+            name="ck_books_available_copies",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(100), nullable=False)
     author: Mapped[str] = mapped_column(String(100), nullable=False)
     isbn: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
     description: Mapped[str] = mapped_column(String(200), nullable=True)
+    # Bumped on every edit; updates compare-and-swap on it
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
     is_available: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # Copies held of this title; borrow/return adjust available_copies with
+    # conditional UPDATEs instead of locking the row first
+    total_copies: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+    available_copies: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+    # Circulation counters, maintained by BorrowingRepository
+    total_borrows: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    active_loans: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    last_borrowed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(UTC)
     )
@@ -31,8 +77,23 @@ class Book(Base):
 
 class Borrowing(Base):
     __tablename__ = "borrowing_records"
+    # Range-partitioned by month on borrowed_date, so the partition key has to
+    # be part of the primary key. See app/partitions.py for partition upkeep.
+    __table_args__ = (
+        Index("ix_borrowing_records_borrowed_date", "borrowed_date"),
+        # Only active loans can be overdue; keeps the index small
+        Index(
+            "ix_borrowing_records_active_due_date",
+            "due_date",
+            "id",
+            postgresql_where=text("returned_date IS NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (borrowed_date)"},
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True, index=True
+    )
     book_id: Mapped[int] = mapped_column(
         ForeignKey("books.id"), nullable=False, index=True
     )
@@ -40,7 +101,12 @@ class Borrowing(Base):
         ForeignKey("members.id"), nullable=False, index=True
     )
     borrowed_date: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=True
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(UTC),
+    )
+    due_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=_default_due_date
     )
     returned_date: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -57,17 +123,23 @@ class Borrowing(Base):
     book: Mapped[Book] = relationship(back_populates="borrowings")
     member: Mapped[Member] = relationship(back_populates="borrowings")
 
-    @property
-    def due_date(self) -> datetime | None:
-        if self.borrowed_date:
-            return self.borrowed_date + timedelta(days=14)
-        return None
-
     @property
     def status(self) -> str:
         return "RETURNED" if self.returned_date else "BORROWED"
 
 
+# Tables created outside Alembic (seed_data.py) still need somewhere for rows
+# to land before the monthly partitions exist.
+event.listen(
+    Borrowing.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS borrowing_records_default "
+        "PARTITION OF borrowing_records DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
+
+
 class Member(Base):
     __tablename__ = "members"
 
@@ -75,6 +147,20 @@ class Member(Base):
     name: Mapped[str] = mapped_column(String(100), unique=False, nullable=False)
     email: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     phone: Mapped[str] = mapped_column(String(15), unique=True, nullable=False)
+    # Bumped on every edit; updates compare-and-swap on it
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+    # Circulation counters, maintained by BorrowingRepository
+    total_borrows: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    active_loans: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    last_borrowed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(UTC)
     )
@@ -87,6 +173,21 @@ class Member(Base):
     borrowings: Mapped[list[Borrowing]] = relationship(back_populates="member")
 
 
+# Keyset pagination ordered by name, and index-backed name/email prefix search
+# (LIKE 'abc%' can only use a text_pattern_ops index outside the C collation)
+Index("ix_members_lower_name_id", func.lower(Member.name), Member.id)
+Index(
+    "ix_members_name_prefix",
+    func.lower(Member.name).label("name_prefix"),
+    postgresql_ops={"name_prefix": "text_pattern_ops"},
+)
+Index(
+    "ix_members_email_prefix",
+    func.lower(Member.email).label("email_prefix"),
+    postgresql_ops={"email_prefix": "text_pattern_ops"},
+)
+
+
 class Staff(Base):
     __tablename__ = "staffs"
 
@@ -98,3 +199,29 @@ class Staff(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(UTC)
     )
+
+
+class RefreshToken(Base):
+    """
+    One link in a refresh token chain. Only the SHA-256 of the token is kept.
+    Every refresh revokes the presented token and issues the next one in the
+    same family, so a revoked token coming back means the chain leaked.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    staff_id: Mapped[int] = mapped_column(
+        ForeignKey("staffs.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    family_id: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
+    revoked_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+    )
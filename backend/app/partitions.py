@@ -0,0 +1,214 @@
+"""
+Partition maintenance for borrowing_records.
+
+borrowing_records is range-partitioned by month on borrowed_date. This module
+creates upcoming monthly partitions (once at server startup and periodically
+after that, see maintain_partitions) and moves old, fully returned partitions
+into the archive schema so that live queries only touch recent data.
+
+Usage:
+    python -m app.partitions ensure [--months-ahead N]
+    python -m app.partitions archive [--older-than-years N]
+"""
+
+import argparse
+import asyncio
+import logging
+import re
+from datetime import UTC, date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.config import settings
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "borrowing_records"
+ARCHIVE_SCHEMA = "borrowing_archive"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_(\d{{4}})_(\d{{2}})$")
+# pg_advisory_xact_lock key serialising partition changes across processes
+_LOCK_KEY = 0x626F72726F77
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_{month.year:04d}_{month.month:02d}"
+
+
+async def _create_partition(conn: AsyncConnection, month: date) -> bool:
+    lower = _add_months(month, 0)
+    upper = _add_months(month, 1)
+    name = partition_name(lower)
+    start, end = (
+        f"'{lower.isoformat()} 00:00:00+00'",
+        f"'{upper.isoformat()} 00:00:00+00'",
+    )
+    create = (
+        f'CREATE TABLE "{name}" PARTITION OF {PARENT_TABLE} '
+        f"FOR VALUES FROM ({start}) TO ({end})"
+    )
+    try:
+        async with conn.begin():
+            # Every server process runs this; one at a time
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY}
+            )
+            if await conn.scalar(text("SELECT to_regclass(:name)"), {"name": name}):
+                return True
+
+            stranded = await conn.execute(
+                text(
+                    f"SELECT 1 FROM {DEFAULT_PARTITION} "
+                    f"WHERE borrowed_date >= {start} AND borrowed_date < {end} LIMIT 1"
+                )
+            )
+            if stranded.first() is None:
+                await conn.execute(text(create))
+                return True
+
+            # Loans for this month already landed in the default partition,
+            # which rules out a partition for it. Move them over while the
+            # default is detached, all in one transaction.
+            await conn.execute(
+                text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+            )
+            await conn.execute(text(create))
+            moved = await conn.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                    f"WHERE borrowed_date >= {start} AND borrowed_date < {end} "
+                    f'RETURNING *) INSERT INTO "{name}" SELECT * FROM moved'
+                )
+            )
+            await conn.execute(
+                text(
+                    f"ALTER TABLE {PARENT_TABLE} "
+                    f"ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"
+                )
+            )
+            logger.info(
+                f"Moved {moved.rowcount} loan(s) for {lower:%Y-%m} "
+                f"out of {DEFAULT_PARTITION} into {name}"
+            )
+    except DBAPIError as e:
+        logger.warning(f"Could not create partition for {lower:%Y-%m}: {e}")
+        return False
+    return True
+
+
+async def ensure_partitions(
+    months_ahead: int | None = None,
+    start: datetime | None = None,
+) -> None:
+    """Create monthly partitions from `start` (default: now) up to `months_ahead`."""
+    if months_ahead is None:
+        months_ahead = settings.borrowing_partitions_ahead
+
+    first = (start or datetime.now(UTC)).date().replace(day=1)
+    last = _add_months(datetime.now(UTC).date().replace(day=1), months_ahead)
+
+    async with engine.connect() as conn:
+        month = first
+        while month <= last:
+            await _create_partition(conn, month)
+            month = _add_months(month, 1)
+
+
+async def maintain_partitions() -> None:
+    """
+    Run ensure_partitions now and then every BORROWING_PARTITIONS_CHECK_HOURS
+    until cancelled, so a long-running server never outruns its partitions.
+    """
+    while True:
+        try:
+            await ensure_partitions()
+        except Exception as e:
+            logger.warning(f"Could not ensure borrowing partitions: {e}")
+        await asyncio.sleep(settings.borrowing_partitions_check_hours * 3600)
+
+
+async def archive_partitions(
+    older_than_years: int | None = None,
+) -> list[str]:
+    """
+    Detach monthly partitions that ended more than `older_than_years` ago and
+    contain no active loans, and move them into the archive schema.
+    """
+    if older_than_years is None:
+        older_than_years = settings.borrowing_archive_after_years
+
+    this_month = datetime.now(UTC).date().replace(day=1)
+    cutoff = _add_months(this_month, -12 * older_than_years)
+    archived = []
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+
+        result = await conn.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+                "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+                "WHERE parent.relname = :parent ORDER BY child.relname"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+        for name in result.scalars().all():
+            match = _PARTITION_NAME.match(name)
+            if not match:
+                continue
+
+            month = date(int(match.group(1)), int(match.group(2)), 1)
+            if _add_months(month, 1) > cutoff:
+                continue
+
+            active = await conn.execute(
+                text(f'SELECT 1 FROM "{name}" WHERE returned_date IS NULL LIMIT 1')
+            )
+            if active.first():
+                logger.warning(f"Skipping {name}: it still has active loans")
+                continue
+
+            await conn.execute(
+                text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"')
+            )
+            await conn.execute(
+                text(f'ALTER TABLE "{name}" SET SCHEMA {ARCHIVE_SCHEMA}')
+            )
+            logger.info(f"Archived partition {name}")
+            archived.append(name)
+
+    return archived
+
+
+async def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    ensure = commands.add_parser("ensure", help="create upcoming partitions")
+    ensure.add_argument("--months-ahead", type=int, default=None)
+    archive = commands.add_parser("archive", help="archive old returned loans")
+    archive.add_argument("--older-than-years", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "ensure":
+            await ensure_partitions(args.months_ahead)
+        else:
+            archived = await archive_partitions(args.older_than_years)
+            logger.info(f"Archived {len(archived)} partition(s)")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""
+Argon2 hashing off the event loop.
+
+An argon2 hash or verify takes tens of milliseconds of CPU. Run inline, each
+one stalls every other request on the loop. Calls here go to a small
+dedicated thread pool instead. argon2-cffi releases the GIL while hashing, so
+the workers really run in parallel. Once PASSWORD_HASH_MAX_QUEUE calls are
+already waiting, new ones are refused with ServiceUnavailableError. A login
+storm then gets fast 503s instead of queueing without bound.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.config import settings
+from app.exceptions import ServiceUnavailableError
+from app.utils import hash_password as _hash_password
+from app.utils import verify_password as _verify_password
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Password hash/verify calls waiting for a worker",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_IN_PROGRESS = Gauge(
+    "password_hash_in_progress",
+    "Password hash/verify calls running on a worker",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds",
+    "Time spent hashing or verifying a password, including queueing",
+    ["operation"],
+    buckets=[0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Password hash/verify calls refused because the queue was full",
+    ["operation"],
+)
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash",
+)
+# Submitted but not yet finished; only touched from the event loop
+_pending = 0
+
+
+def _leave_queue(dequeued: threading.Lock) -> None:
+    # Called by the worker when the job starts and by the caller when it is
+    # done; whichever comes first takes the job off the queue gauge. A job
+    # cancelled while still queued never reaches a worker.
+    if dequeued.acquire(blocking=False):
+        PASSWORD_HASH_QUEUE_DEPTH.dec()
+
+
+def _run(dequeued: threading.Lock, func, *args):
+    _leave_queue(dequeued)
+    PASSWORD_HASH_IN_PROGRESS.inc()
+    try:
+        return func(*args)
+    finally:
+        PASSWORD_HASH_IN_PROGRESS.dec()
+
+
+async def _submit(operation: str, func, *args):
+    global _pending
+    if _pending >= settings.password_hash_workers + settings.password_hash_max_queue:
+        PASSWORD_HASH_REJECTED.labels(operation=operation).inc()
+        raise ServiceUnavailableError(
+            message="Too many authentication requests, try again shortly."
+        )
+
+    _pending += 1
+    PASSWORD_HASH_QUEUE_DEPTH.inc()
+    dequeued = threading.Lock()
+    start = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _executor, _run, dequeued, func, *args
+        )
+    finally:
+        _pending -= 1
+        _leave_queue(dequeued)
+        PASSWORD_HASH_SECONDS.labels(operation=operation).observe(
+            time.perf_counter() - start
+        )
+
+
+async def hash_password(password: str) -> str:
+    return await _submit("hash", _hash_password, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _submit("verify", _verify_password, plain_password, hashed_password)
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 from typing import Optional
@@ -5,6 +6,7 @@ from typing import Optional
 from redis import asyncio as redis
 
 from app.config import settings
+from app.deadlines import time_remaining
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +39,9 @@ async def close_redis():
 async def set_cache(key: str, value, expire: int = 3600):
     if redis_client:
         try:
-            await redis_client.set(key, json.dumps(value), ex=expire)
+            # Give up when the request's deadline does (no deadline: no limit)
+            async with asyncio.timeout(time_remaining()):
+                await redis_client.set(key, json.dumps(value), ex=expire)
         except Exception as e:
             logger.warning(f"Error setting cache for key {key}: {e}")
 
@@ -45,7 +49,8 @@ async def set_cache(key: str, value, expire: int = 3600):
 async def get_cache(key: str):
     if redis_client:
         try:
-            data = await redis_client.get(key)
+            async with asyncio.timeout(time_remaining()):
+                data = await redis_client.get(key)
             if data:
                 return json.loads(data)
         except Exception as e:
@@ -64,6 +69,7 @@ async def delete_cache(key: str):
 async def invalidate_prefix(prefix: str):
     if redis_client:
         try:
+            # No deadline here: the write is committed, the cache must follow
             keys = await redis_client.keys(f"{prefix}*")
             if keys:
                 await redis_client.delete(*keys)
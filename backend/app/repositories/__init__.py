@@ -6,6 +6,7 @@ from .protocols import (
 from .book_repository_pg import BookRepository
 from .borrowing_repository_pg import BorrowingRepository
 from .member_repository_pg import MemberRepository
+from .refresh_token_repository_pg import RefreshTokenRepository
 from .staff_repository_pg import StaffRepository
 
 __all__ = [
@@ -15,5 +16,6 @@ __all__ = [
     "BookRepository",
     "BorrowingRepository",
     "MemberRepository",
+    "RefreshTokenRepository",
     "StaffRepository",
 ]
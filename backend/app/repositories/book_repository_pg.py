@@ -1,39 +1,93 @@
-from sqlalchemy import select
+from collections.abc import AsyncIterator, Sequence
+
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
+from app.config import settings
+from app.repositories.statements import BOOK_BY_ID, BOOK_BY_ISBN, TABLE_ROW_ESTIMATE
 from app.schemas import BookCreate, BookUpdate
+from app.utils import decode_cursor, encode_cursor
 from app.exceptions import (
     AlreadyExistsError,
     ActionForbiddenError,
+    InvalidCursorError,
     NotFoundError,
+    VersionConflictError,
 )
 
 
+def _filter_books(query, title: str | None, author: str | None):
+    if title:
+        query = query.where(models.Book.title.ilike(f"%{title}%"))
+    if author:
+        query = query.where(models.Book.author.ilike(f"%{author}%"))
+    return query
+
+
 class BookRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
     async def get_books(
-        self, title: str | None, author: str | None, limit: int, offset: int
-    ) -> list[models.Book]:
-        query = select(models.Book)
-        if title:
-            query = query.where(models.Book.title.ilike(f"%{title}%"))
-        if author:
-            query = query.where(models.Book.author.ilike(f"%{author}%"))
+        self,
+        title: str | None,
+        author: str | None,
+        limit: int,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> tuple[list[models.Book], str | None]:
+        query = _filter_books(select(models.Book), title, author)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 1 or not isinstance(values[0], int):
+                raise InvalidCursorError(message="Invalid pagination cursor")
+            query = query.where(models.Book.id > values[0])
+        elif offset:
+            query = query.offset(offset)
+
+        # One extra row tells us whether there is a next page
+        result = await self.db.execute(query.order_by(models.Book.id).limit(limit + 1))
+        books = result.scalars().all()
 
-        query = query.limit(limit).offset(offset)
+        next_cursor = None
+        if len(books) > limit:
+            books = books[:limit]
+            next_cursor = encode_cursor(books[-1].id)
+        return books, next_cursor
+
+    async def stream_books(
+        self, title: str | None, author: str | None, batch_size: int
+    ) -> AsyncIterator[Sequence[models.Book]]:
+        """Matching books in id order, fetched in batches from a server-side cursor."""
+        result = await self.db.stream_scalars(
+            _filter_books(select(models.Book), title, author)
+            .order_by(models.Book.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for batch in result.partitions():
+            yield batch
+
+    async def count_books(
+        self, title: str | None = None, author: str | None = None
+    ) -> tuple[int, bool]:
+        """Total matching books and whether it is an estimate."""
+        if not title and not author:
+            result = await self.db.execute(
+                TABLE_ROW_ESTIMATE, {"table_name": models.Book.__tablename__}
+            )
+            estimate = result.scalar_one_or_none() or 0
+            if estimate >= settings.count_estimate_threshold:
+                return estimate, True
 
+        query = _filter_books(
+            select(func.count()).select_from(models.Book), title, author
+        )
         result = await self.db.execute(query)
-        books = result.scalars().all()
-
-        return books
+        return result.scalar_one(), False
 
     async def get_book_by_id(self, book_id: int) -> models.Book:
-        result = await self.db.execute(
-            select(models.Book).where(models.Book.id == book_id),
-        )
+        result = await self.db.execute(BOOK_BY_ID, {"book_id": book_id})
 
         book = result.scalars().first()
         if not book:
@@ -42,16 +96,14 @@ class BookRepository:
         return book
 
     async def create_book(self, book: BookCreate) -> models.Book:
-        result = await self.db.execute(
-            select(models.Book).where(models.Book.isbn == book.isbn)
-        )
+        result = await self.db.execute(BOOK_BY_ISBN, {"isbn": book.isbn})
         existing_book = result.scalars().first()
         if existing_book:
             raise AlreadyExistsError(
                 message="Book with this ISBN already exists",
             )
 
-        new_book = models.Book(**book.model_dump())
+        new_book = models.Book(**book.model_dump(), available_copies=book.total_copies)
 
         self.db.add(new_book)
 
@@ -61,37 +113,62 @@ class BookRepository:
         self,
         book_id: int,
         book: BookUpdate,
+        expected_version: int | None = None,
     ) -> models.Book:
+        updated_data = book.model_dump(exclude_unset=True)
+        conditions = [models.Book.id == book_id]
+        total_copies = updated_data.get("total_copies")
+        if total_copies is not None:
+            # Copies on loan stay on loan; the rest of the new total is on the
+            # shelf. The total may not drop below what is already lent out.
+            conditions.append(models.Book.active_loans <= total_copies)
+            updated_data["available_copies"] = total_copies - models.Book.active_loans
+            updated_data.setdefault(
+                "is_available", models.Book.active_loans < total_copies
+            )
+        if expected_version is not None:
+            conditions.append(models.Book.version == expected_version)
+
+        # Compare-and-swap instead of SELECT ... FOR UPDATE, so concurrent
+        # writers never wait on each other
         result = await self.db.execute(
-            select(models.Book).where(models.Book.id == book_id)
+            update(models.Book)
+            .where(*conditions)
+            .values(**updated_data, version=models.Book.version + 1)
+            .returning(models.Book)
+            .execution_options(populate_existing=True)
         )
-        existing_book = result.scalars().first()
+        updated_book = result.scalars().first()
+        if updated_book:
+            return updated_book
+
+        existing_book = await self.db.get(models.Book, book_id, populate_existing=True)
         if not existing_book:
             raise NotFoundError(message="Book not found")
-
-        result = await self.db.execute(
-            select(models.Borrowing).where(
-                models.Borrowing.book_id == book_id,
-                models.Borrowing.returned_date.is_(None),
-            )
-        )
-        is_borrowed = result.scalars().first()
-        if is_borrowed:
+        if total_copies is not None and existing_book.active_loans > total_copies:
             raise ActionForbiddenError(
-                message="Cannot update a borrowed book",
+                message=f"Cannot reduce total copies below the {existing_book.active_loans} on loan",
             )
+        raise VersionConflictError(
+            message="Book was modified by another request",
+        )
 
-        updated_data = book.model_dump(exclude_unset=True)
-        for field, value in updated_data.items():
-            setattr(existing_book, field, value)
-
-        return existing_book
+    async def delete_book(self, book_id: int, expected_version: int | None = None):
+        conditions = [
+            models.Book.id == book_id,
+            models.Book.is_available.is_(True),
+            models.Book.total_borrows == 0,
+        ]
+        if expected_version is not None:
+            conditions.append(models.Book.version == expected_version)
 
-    async def delete_book(self, book_id):
         result = await self.db.execute(
-            select(models.Book).where(models.Book.id == book_id)
+            delete(models.Book).where(*conditions).returning(models.Book.id)
         )
-        existing_book = result.scalars().first()
+        if result.scalar_one_or_none() is not None:
+            return
+
+        existing_book = await self.db.get(models.Book, book_id, populate_existing=True)
         if not existing_book:
             raise NotFoundError(message="Book not found")
 
@@ -100,13 +177,11 @@ class BookRepository:
                 message="Cannot delete book that is currently borrowed or marked as unavailable.",
             )
 
-        result = await self.db.execute(
-            select(models.Borrowing).where(models.Borrowing.book_id == existing_book.id)
-        )
-        has_borrowing_history = result.scalars().first()
-        if has_borrowing_history:
+        if existing_book.total_borrows > 0:
             raise ActionForbiddenError(
                 message="Cannot delete book with borrowing history.",
             )
 
-        await self.db.delete(existing_book)
+        raise VersionConflictError(
+            message="Book was modified by another request",
+        )
@@ -1,11 +1,28 @@
+from collections.abc import AsyncIterator, Sequence
 from datetime import UTC, datetime
 
-from sqlalchemy import select
+from sqlalchemy import Select, func, select, tuple_, update
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
-from app.exceptions import NotFoundError
+from app.repositories.statements import BOOK_BY_ID, MEMBER_BY_ID
+from app.exceptions import ActionForbiddenError, InvalidCursorError, NotFoundError
+from app.utils import decode_cursor, encode_cursor
+
+
+def _in_window(
+    query: Select,
+    borrowed_from: datetime | None,
+    borrowed_to: datetime | None,
+) -> Select:
+    # borrowing_records is partitioned by borrowed_date, so bounding it lets
+    # Postgres prune partitions outside the window.
+    if borrowed_from:
+        query = query.where(models.Borrowing.borrowed_date >= borrowed_from)
+    if borrowed_to:
+        query = query.where(models.Borrowing.borrowed_date < borrowed_to)
+    return query
 
 
 class BorrowingRepository:
@@ -27,20 +44,26 @@ class BorrowingRepository:
         return records.scalars().all()
 
     async def get_borrowings_by_member_id(
-        self, member_id: int, limit: int, offset: int
+        self,
+        member_id: int,
+        limit: int,
+        offset: int,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
     ) -> list[models.Borrowing]:
-        records = await self.db.execute(
-            select(models.Member).where(models.Member.id == member_id)
-        )
+        records = await self.db.execute(MEMBER_BY_ID, {"member_id": member_id})
         member = records.scalars().first()
         if not member:
             raise NotFoundError(message="Member not found.")
 
-        records = await self.db.execute(
+        query = (
             select(models.Borrowing)
             .options(selectinload(models.Borrowing.book))
             .options(selectinload(models.Borrowing.member))
             .where(models.Borrowing.member_id == member_id)
+        )
+        records = await self.db.execute(
+            _in_window(query, borrowed_from, borrowed_to)
             .order_by(models.Borrowing.borrowed_date.desc())
             .limit(limit)
             .offset(offset)
@@ -48,20 +71,26 @@ class BorrowingRepository:
         return records.scalars().all()
 
     async def get_borrowings_by_book_id(
-        self, book_id: int, limit: int, offset: int
+        self,
+        book_id: int,
+        limit: int,
+        offset: int,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
     ) -> list[models.Borrowing]:
-        records = await self.db.execute(
-            select(models.Book).where(models.Book.id == book_id)
-        )
+        records = await self.db.execute(BOOK_BY_ID, {"book_id": book_id})
         book = records.scalars().first()
         if not book:
             raise NotFoundError(message="Book not found.")
 
-        records = await self.db.execute(
+        query = (
             select(models.Borrowing)
             .options(selectinload(models.Borrowing.book))
             .options(selectinload(models.Borrowing.member))
             .where(models.Borrowing.book_id == book_id)
+        )
+        records = await self.db.execute(
+            _in_window(query, borrowed_from, borrowed_to)
             .order_by(models.Borrowing.borrowed_date.desc())
             .limit(limit)
             .offset(offset)
@@ -69,27 +98,263 @@ class BorrowingRepository:
         return records.scalars().all()
 
     async def get_all_borrowings_history(
-        self, limit: int, offset: int
+        self,
+        limit: int,
+        offset: int,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
     ) -> list[models.Borrowing]:
-        records = await self.db.execute(
+        query = (
             select(models.Borrowing)
             .options(selectinload(models.Borrowing.book))
             .options(selectinload(models.Borrowing.member))
+        )
+        records = await self.db.execute(
+            _in_window(query, borrowed_from, borrowed_to)
             .order_by(models.Borrowing.borrowed_date.desc())
             .limit(limit)
             .offset(offset)
         )
         return records.scalars().all()
 
-    async def create_record(self, book_id: int, member_id: int) -> models.Borrowing:
+    async def get_borrowings_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        member_id: int | None = None,
+        active_only: bool = False,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
+    ) -> tuple[list[models.Borrowing], str | None]:
+        """Newest first, keyset paginated on (borrowed_date, id)."""
+        query = (
+            select(models.Borrowing)
+            .options(selectinload(models.Borrowing.book))
+            .options(selectinload(models.Borrowing.member))
+        )
+        if member_id is not None:
+            query = query.where(models.Borrowing.member_id == member_id)
+        if active_only:
+            query = query.where(models.Borrowing.returned_date.is_(None))
+        if cursor:
+            try:
+                borrowed_date, record_id = decode_cursor(cursor)
+                borrowed_date = datetime.fromisoformat(borrowed_date)
+                record_id = int(record_id)
+            except (TypeError, ValueError):
+                raise InvalidCursorError(message="Invalid pagination cursor")
+            query = query.where(
+                tuple_(models.Borrowing.borrowed_date, models.Borrowing.id)
+                < tuple_(borrowed_date, record_id)
+            )
+
+        # One extra row tells us whether there is a next page
+        records = await self.db.execute(
+            _in_window(query, borrowed_from, borrowed_to)
+            .order_by(models.Borrowing.borrowed_date.desc(), models.Borrowing.id.desc())
+            .limit(limit + 1)
+        )
+        records = records.scalars().all()
+
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            next_cursor = encode_cursor(records[-1].borrowed_date, records[-1].id)
+        return records, next_cursor
+
+    async def stream_borrowings(
+        self,
+        batch_size: int,
+        member_id: int | None = None,
+        book_id: int | None = None,
+        active_only: bool = False,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
+    ) -> AsyncIterator[Sequence[models.Borrowing]]:
+        """
+        Matching records, newest first, fetched in batches from a server-side
+        cursor. Books and members are loaded once per batch.
+        """
+        query = (
+            select(models.Borrowing)
+            .options(selectinload(models.Borrowing.book))
+            .options(selectinload(models.Borrowing.member))
+        )
+        if member_id is not None:
+            query = query.where(models.Borrowing.member_id == member_id)
+        if book_id is not None:
+            query = query.where(models.Borrowing.book_id == book_id)
+        if active_only:
+            query = query.where(models.Borrowing.returned_date.is_(None))
+
+        result = await self.db.stream_scalars(
+            _in_window(query, borrowed_from, borrowed_to)
+            .order_by(models.Borrowing.borrowed_date.desc(), models.Borrowing.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        async for batch in result.partitions():
+            yield batch
+
+    async def get_overdue_borrowings(
+        self, limit: int, cursor: str | None = None
+    ) -> tuple[list[models.Borrowing], str | None]:
+        query = (
+            select(models.Borrowing)
+            .options(selectinload(models.Borrowing.book))
+            .options(selectinload(models.Borrowing.member))
+            .where(
+                models.Borrowing.returned_date.is_(None),
+                models.Borrowing.due_date < datetime.now(UTC),
+            )
+        )
+        if cursor:
+            try:
+                due_date, record_id = decode_cursor(cursor)
+                due_date, record_id = datetime.fromisoformat(due_date), int(record_id)
+            except (TypeError, ValueError):
+                raise InvalidCursorError(message="Invalid pagination cursor")
+            query = query.where(
+                tuple_(models.Borrowing.due_date, models.Borrowing.id)
+                > tuple_(due_date, record_id)
+            )
+
+        # Most overdue first; one extra row tells us whether there is a next page
+        records = await self.db.execute(
+            query.order_by(models.Borrowing.due_date, models.Borrowing.id).limit(
+                limit + 1
+            )
+        )
+        records = records.scalars().all()
+
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            next_cursor = encode_cursor(records[-1].due_date, records[-1].id)
+        return records, next_cursor
+
+    async def create_record(
+        self, book_id: int, member_id: int, due_date: datetime | None = None
+    ) -> models.Borrowing:
+        borrowed_date = datetime.now(UTC)
+
+        # Take a copy only if one is left; concurrent borrowers never wait on
+        # a SELECT ... FOR UPDATE, they just see zero rows updated
+        result = await self.db.execute(
+            update(models.Book)
+            .where(
+                models.Book.id == book_id,
+                models.Book.available_copies > 0,
+                models.Book.is_available.is_(True),
+            )
+            .values(
+                available_copies=models.Book.available_copies - 1,
+                is_available=models.Book.available_copies > 1,
+                total_borrows=models.Book.total_borrows + 1,
+                active_loans=models.Book.active_loans + 1,
+                last_borrowed_at=borrowed_date,
+            )
+            .returning(models.Book.id)
+        )
+        if result.scalar_one_or_none() is None:
+            if await self.db.get(models.Book, book_id) is None:
+                raise NotFoundError(message="Book not found")
+            raise ActionForbiddenError(message="Book not available")
+
+        await self.db.execute(
+            update(models.Member)
+            .where(models.Member.id == member_id)
+            .values(
+                total_borrows=models.Member.total_borrows + 1,
+                active_loans=models.Member.active_loans + 1,
+                last_borrowed_at=borrowed_date,
+            )
+        )
+
         new_record = models.Borrowing(
             book_id=book_id,
             member_id=member_id,
-            borrowed_date=datetime.now(UTC),
+            borrowed_date=borrowed_date,
+            due_date=due_date or borrowed_date + models.LOAN_PERIOD,
         )
         self.db.add(new_record)
         return new_record
 
+    async def close_record(self, record: models.Borrowing) -> models.Borrowing:
+        # Only one concurrent return of the same loan may adjust the counters
+        result = await self.db.execute(
+            update(models.Borrowing)
+            .where(
+                models.Borrowing.id == record.id,
+                models.Borrowing.borrowed_date == record.borrowed_date,
+                models.Borrowing.returned_date.is_(None),
+            )
+            .values(returned_date=datetime.now(UTC))
+            .returning(models.Borrowing.id)
+        )
+        if result.scalar_one_or_none() is None:
+            raise NotFoundError(message="Borrowing record already returned.")
+
+        await self.db.execute(
+            update(models.Book)
+            .where(models.Book.id == record.book_id)
+            .values(
+                available_copies=models.Book.available_copies + 1,
+                is_available=True,
+                active_loans=models.Book.active_loans - 1,
+            )
+        )
+        await self.db.execute(
+            update(models.Member)
+            .where(models.Member.id == record.member_id)
+            .values(active_loans=models.Member.active_loans - 1)
+        )
+        return record
+
+    async def recalculate_counters(self):
+        """
+        Rebuild the book/member circulation counters and available copies
+        from borrowing_records.
+        """
+        for model, key in (
+            (models.Book, models.Borrowing.book_id),
+            (models.Member, models.Borrowing.member_id),
+        ):
+            stats = (
+                select(
+                    key.label("entity_id"),
+                    func.count().label("total_borrows"),
+                    func.count()
+                    .filter(models.Borrowing.returned_date.is_(None))
+                    .label("active_loans"),
+                    func.max(models.Borrowing.borrowed_date).label("last_borrowed_at"),
+                )
+                .group_by(key)
+                .subquery()
+            )
+            await self.db.execute(
+                update(model)
+                .values(total_borrows=0, active_loans=0, last_borrowed_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.execute(
+                update(model)
+                .where(model.id == stats.c.entity_id)
+                .values(
+                    total_borrows=stats.c.total_borrows,
+                    active_loans=stats.c.active_loans,
+                    last_borrowed_at=stats.c.last_borrowed_at,
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        await self.db.execute(
+            update(models.Book)
+            .values(
+                available_copies=models.Book.total_copies - models.Book.active_loans
+            )
+            .execution_options(synchronize_session=False)
+        )
+
     async def get_active_record(
         self, book_id: int, member_id: int
     ) -> models.Borrowing | None:
@@ -1,11 +1,54 @@
+from collections.abc import AsyncIterator, Sequence
+
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, or_, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
+from app.config import settings
+from app.repositories.statements import (
+    MEMBER_BY_EMAIL,
+    MEMBER_BY_ID,
+    MEMBER_BY_PHONE,
+    TABLE_ROW_ESTIMATE,
+)
 from app.schemas import MemberCreate, MemberUpdate
 
-from app.exceptions import AlreadyExistsError, ActionForbiddenError, NotFoundError
+from app.exceptions import (
+    AlreadyExistsError,
+    ActionForbiddenError,
+    InvalidCursorError,
+    NotFoundError,
+    VersionConflictError,
+)
+from app.utils import decode_cursor, encode_cursor
+
+# Sort keys for each supported ordering; id breaks ties so keysets are unique
+MEMBER_ORDERINGS = {
+    "id": (models.Member.id,),
+    "name": (func.lower(models.Member.name), models.Member.id),
+}
+# Python type of each sort key value, to reject cursors before they reach SQL
+MEMBER_CURSOR_TYPES = {
+    "id": (int,),
+    "name": (str, int),
+}
+
+
+def _search_members(query, search: str | None):
+    """Prefix match on name or email, served by the text_pattern_ops indexes."""
+    if not search:
+        return query
+    escaped = (
+        search.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    )
+    pattern = f"{escaped}%"
+    return query.where(
+        or_(
+            func.lower(models.Member.name).like(pattern, escape="\\"),
+            func.lower(models.Member.email).like(pattern, escape="\\"),
+        )
+    )
 
 
 class MemberRepository:
@@ -16,19 +59,67 @@ class MemberRepository:
         self,
         limit: int = 10,
         offset: int = 0,
-    ) -> list[models.Member]:
-        result = await self.db.execute(
-            select(models.Member).limit(limit).offset(offset)
+        cursor: str | None = None,
+        order_by: str = "id",
+        search: str | None = None,
+    ) -> tuple[list[models.Member], str | None]:
+        sort_key = MEMBER_ORDERINGS[order_by]
+        # Select the sort key too so the cursor holds the database's values
+        query = _search_members(select(models.Member, *sort_key), search)
+
+        if cursor:
+            values = decode_cursor(cursor)
+            types = MEMBER_CURSOR_TYPES[order_by]
+            if len(values) != len(types) or not all(
+                isinstance(v, t) and not isinstance(v, bool)
+                for v, t in zip(values, types)
+            ):
+                raise InvalidCursorError(message="Invalid pagination cursor")
+            query = query.where(tuple_(*sort_key) > tuple_(*values))
+        elif offset:
+            query = query.offset(offset)
+
+        # One extra row tells us whether there is a next page
+        result = await self.db.execute(query.order_by(*sort_key).limit(limit + 1))
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(*rows[-1][1:])
+        return [row[0] for row in rows], next_cursor
+
+    async def stream_members(
+        self, batch_size: int, search: str | None = None
+    ) -> AsyncIterator[Sequence[models.Member]]:
+        """Members in id order, fetched in batches from a server-side cursor."""
+        result = await self.db.stream_scalars(
+            _search_members(select(models.Member), search)
+            .order_by(models.Member.id)
+            .execution_options(yield_per=batch_size)
         )
-        return result.scalars().all()
+        async for batch in result.partitions():
+            yield batch
+
+    async def count_members(self, search: str | None = None) -> tuple[int, bool]:
+        """Total matching members and whether it is an estimate."""
+        if not search:
+            result = await self.db.execute(
+                TABLE_ROW_ESTIMATE, {"table_name": models.Member.__tablename__}
+            )
+            estimate = result.scalar_one_or_none() or 0
+            if estimate >= settings.count_estimate_threshold:
+                return estimate, True
+
+        query = _search_members(select(func.count()).select_from(models.Member), search)
+        result = await self.db.execute(query)
+        return result.scalar_one(), False
 
     async def get_member_by_id(
         self,
         member_id: int,
     ) -> models.Member:
-        result = await self.db.execute(
-            select(models.Member).where(models.Member.id == member_id)
-        )
+        result = await self.db.execute(MEMBER_BY_ID, {"member_id": member_id})
         member = result.scalars().first()
         if not member:
             raise NotFoundError(message="Member not found.")
@@ -38,20 +129,14 @@ class MemberRepository:
         self,
         member: MemberCreate,
     ) -> models.Member:
-        result = await self.db.execute(
-            select(models.Member).where(
-                func.lower(models.Member.email) == member.email.lower()
-            )
-        )
+        result = await self.db.execute(MEMBER_BY_EMAIL, {"email": member.email.lower()})
         existing_member = result.scalars().first()
         if existing_member:
             raise AlreadyExistsError(message="Email already in use.")
 
         if member.phone:
             result = await self.db.execute(
-                select(models.Member).where(
-                    func.lower(models.Member.phone) == member.phone.lower()
-                )
+                MEMBER_BY_PHONE, {"phone": member.phone.lower()}
             )
             existing_member = result.scalars().first()
             if existing_member:
@@ -66,14 +151,8 @@ class MemberRepository:
         self,
         member_id: int,
         member: MemberUpdate,
+        expected_version: int | None = None,
     ) -> models.Member:
-        result = await self.db.execute(
-            select(models.Member).where(models.Member.id == member_id)
-        )
-        existing_member = result.scalars().first()
-        if not existing_member:
-            raise NotFoundError(message="Member not found.")
-
         if member.email:
             result = await self.db.execute(
                 select(models.Member).where(
@@ -96,15 +175,33 @@ class MemberRepository:
             if phone_conflict:
                 raise AlreadyExistsError(message="Phone already in use.")
 
-        updated_data = member.model_dump(exclude_unset=True)
-        for field, value in updated_data.items():
-            setattr(existing_member, field, value)
+        conditions = [models.Member.id == member_id]
+        if expected_version is not None:
+            conditions.append(models.Member.version == expected_version)
 
-        return existing_member
+        # Compare-and-swap instead of locking the row first
+        result = await self.db.execute(
+            update(models.Member)
+            .where(*conditions)
+            .values(
+                **member.model_dump(exclude_unset=True),
+                version=models.Member.version + 1,
+            )
+            .returning(models.Member)
+            .execution_options(populate_existing=True)
+        )
+        updated_member = result.scalars().first()
+        if updated_member:
+            return updated_member
+
+        if await self.db.get(models.Member, member_id) is None:
+            raise NotFoundError(message="Member not found.")
+        raise VersionConflictError(message="Member was modified by another request.")
 
     async def delete_member(
         self,
         member_id: int,
+        expected_version: int | None = None,
     ):
         if member_id <= 0:
             raise HTTPException(
@@ -112,22 +209,23 @@ class MemberRepository:
                 detail="member_id must be positive",
             )
 
+        conditions = [models.Member.id == member_id, models.Member.total_borrows == 0]
+        if expected_version is not None:
+            conditions.append(models.Member.version == expected_version)
+
         result = await self.db.execute(
-            select(models.Member).where(models.Member.id == member_id)
+            delete(models.Member).where(*conditions).returning(models.Member.id)
         )
-        member = result.scalars().first()
+        if result.scalar_one_or_none() is not None:
+            return
+
+        member = await self.db.get(models.Member, member_id, populate_existing=True)
         if not member:
             raise NotFoundError(message="Member not found.")
 
-        result = await self.db.execute(
-            select(models.Borrowing.member_id).where(
-                models.Borrowing.member_id == member.id,
-            )
-        )
-        borrowings = result.scalars().first()
-        if borrowings:
+        if member.total_borrows > 0:
             raise ActionForbiddenError(
                 message="Cannot delete member with borrowing history.",
             )
 
-        await self.db.delete(member)
+        raise VersionConflictError(message="Member was modified by another request.")
@@ -1,3 +1,5 @@
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 from typing import Protocol
 
 from app import models
@@ -15,8 +17,17 @@ class BookRepositoryProtocol(Protocol):
         title: str | None,
         author: str | None,
         limit: int,
-        offset: int,
-    ) -> list[models.Book]: ...
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> tuple[list[models.Book], str | None]: ...
+
+    def stream_books(
+        self, title: str | None, author: str | None, batch_size: int
+    ) -> AsyncIterator[Sequence[models.Book]]: ...
+
+    async def count_books(
+        self, title: str | None = None, author: str | None = None
+    ) -> tuple[int, bool]: ...
 
     async def get_book_by_id(self, book_id: int) -> models.Book: ...
 
@@ -26,23 +37,42 @@ class BookRepositoryProtocol(Protocol):
         self,
         book_id: int,
         book: BookUpdate,
+        expected_version: int | None = None,
     ) -> models.Book: ...
 
-    async def delete_book(self, book_id): ...
+    async def delete_book(self, book_id: int, expected_version: int | None = None): ...
 
 
 class MemberRepositoryProtocol(Protocol):
-    async def get_members(self, limit: int, offset: int) -> list[models.Member]: ...
+    async def get_members(
+        self,
+        limit: int,
+        offset: int,
+        cursor: str | None = None,
+        order_by: str = "id",
+        search: str | None = None,
+    ) -> tuple[list[models.Member], str | None]: ...
+
+    def stream_members(
+        self, batch_size: int, search: str | None = None
+    ) -> AsyncIterator[Sequence[models.Member]]: ...
+
+    async def count_members(self, search: str | None = None) -> tuple[int, bool]: ...
 
     async def get_member_by_id(self, member_id: int) -> models.Member: ...
 
     async def create_member(self, member: MemberCreate) -> models.Member: ...
 
     async def update_member(
-        self, member_id: int, member: MemberUpdate
+        self,
+        member_id: int,
+        member: MemberUpdate,
+        expected_version: int | None = None,
     ) -> models.Member: ...
 
-    async def delete_member(self, member_id: int): ...
+    async def delete_member(
+        self, member_id: int, expected_version: int | None = None
+    ): ...
 
 
 class BorrowingRepositoryProtocol(Protocol):
@@ -51,18 +81,62 @@ class BorrowingRepositoryProtocol(Protocol):
     ) -> list[models.Borrowing]: ...
 
     async def get_borrowings_by_member_id(
-        self, member_id: int, limit: int, offset: int
+        self,
+        member_id: int,
+        limit: int,
+        offset: int,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
     ) -> list[models.Borrowing]: ...
 
     async def get_borrowings_by_book_id(
-        self, book_id: int, limit: int, offset: int
+        self,
+        book_id: int,
+        limit: int,
+        offset: int,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
     ) -> list[models.Borrowing]: ...
 
     async def get_all_borrowings_history(
-        self, limit: int, offset: int
+        self,
+        limit: int,
+        offset: int,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
     ) -> list[models.Borrowing]: ...
 
-    async def create_record(self, book_id: int, member_id: int) -> models.Borrowing: ...
+    async def get_borrowings_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        member_id: int | None = None,
+        active_only: bool = False,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
+    ) -> tuple[list[models.Borrowing], str | None]: ...
+
+    def stream_borrowings(
+        self,
+        batch_size: int,
+        member_id: int | None = None,
+        book_id: int | None = None,
+        active_only: bool = False,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
+    ) -> AsyncIterator[Sequence[models.Borrowing]]: ...
+
+    async def get_overdue_borrowings(
+        self, limit: int, cursor: str | None = None
+    ) -> tuple[list[models.Borrowing], str | None]: ...
+
+    async def create_record(
+        self, book_id: int, member_id: int, due_date: datetime | None = None
+    ) -> models.Borrowing: ...
+
+    async def close_record(self, record: models.Borrowing) -> models.Borrowing: ...
+
+    async def recalculate_counters(self): ...
 
     async def get_active_record(
         self, book_id: int, member_id: int
@@ -0,0 +1,80 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import models
+
+
+class RefreshTokenRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_token(
+        self,
+        staff_id: int,
+        family_id: str,
+        token_hash: str,
+        expires_at: datetime,
+    ) -> models.RefreshToken:
+        token = models.RefreshToken(
+            staff_id=staff_id,
+            family_id=family_id,
+            token_hash=token_hash,
+            expires_at=expires_at,
+        )
+        self.db.add(token)
+        return token
+
+    async def get_token_by_hash(self, token_hash: str) -> models.RefreshToken | None:
+        result = await self.db.execute(
+            select(models.RefreshToken).where(
+                models.RefreshToken.token_hash == token_hash
+            )
+        )
+        return result.scalars().first()
+
+    async def use_token(self, token_hash: str) -> models.RefreshToken | None:
+        """
+        Revoke a live token and return it, or None if it is unknown, expired or
+        already used. The conditional UPDATE lets only one of two concurrent
+        refreshes with the same token win.
+        """
+        now = datetime.now(UTC)
+        result = await self.db.execute(
+            update(models.RefreshToken)
+            .where(
+                models.RefreshToken.token_hash == token_hash,
+                models.RefreshToken.revoked_at.is_(None),
+                models.RefreshToken.expires_at > now,
+            )
+            .values(revoked_at=now)
+            .returning(models.RefreshToken)
+        )
+        return result.scalars().first()
+
+    async def revoke_family(self, family_id: str) -> None:
+        await self.db.execute(
+            update(models.RefreshToken)
+            .where(
+                models.RefreshToken.family_id == family_id,
+                models.RefreshToken.revoked_at.is_(None),
+            )
+            .values(revoked_at=datetime.now(UTC))
+        )
+
+    async def delete_expired(self, limit: int) -> int:
+        """
+        Delete up to `limit` expired tokens and return how many went. Expired
+        tokens can no longer be used, so only reuse detection for them is lost.
+        """
+        expired = (
+            select(models.RefreshToken.id)
+            .where(models.RefreshToken.expires_at <= datetime.now(UTC))
+            .limit(limit)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            delete(models.RefreshToken).where(models.RefreshToken.id.in_(expired))
+        )
+        return result.rowcount
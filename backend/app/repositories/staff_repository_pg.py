@@ -1,10 +1,10 @@
-from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import models
+from app.repositories.statements import STAFF_BY_EMAIL, STAFF_BY_ID, STAFF_BY_USERNAME
 from app.schemas import StaffCreate
 from app.exceptions import AlreadyExistsError, NotFoundError
-from app.utils import hash_password
 
 
 class StaffRepository:
@@ -13,28 +13,24 @@ class StaffRepository:
 
     async def get_staff_by_username(self, username: str) -> models.Staff | None:
         result = await self.db.execute(
-            select(models.Staff).where(
-                func.lower(models.Staff.username) == username.lower()
-            )
+            STAFF_BY_USERNAME, {"username": username.lower()}
         )
         return result.scalars().first()
 
     async def get_staff_by_email(self, email: str) -> models.Staff | None:
-        result = await self.db.execute(
-            select(models.Staff).where(func.lower(models.Staff.email) == email.lower())
-        )
+        result = await self.db.execute(STAFF_BY_EMAIL, {"email": email.lower()})
         return result.scalars().first()
 
     async def get_staff_by_id(self, staff_id: int) -> models.Staff:
-        result = await self.db.execute(
-            select(models.Staff).where(models.Staff.id == staff_id)
-        )
+        result = await self.db.execute(STAFF_BY_ID, {"staff_id": staff_id})
         staff = result.scalars().first()
         if not staff:
             raise NotFoundError(message="Staff member not found.")
         return staff
 
-    async def create_staff(self, staff: StaffCreate) -> models.Staff:
+    async def create_staff(
+        self, staff: StaffCreate, hashed_password: str
+    ) -> models.Staff:
         # Check username and email uniqueness first
         if await self.get_staff_by_username(staff.username):
             raise AlreadyExistsError(message="Username already exists")
@@ -45,8 +41,13 @@ class StaffRepository:
         new_staff = models.Staff(
             email=staff.email.lower(),
             username=staff.username,
-            hashed_password=hash_password(staff.password),
-            full_name=staff.full_name,
+            hashed_password=hashed_password,
+            full_name=staff.full_name or "",
         )
         self.db.add(new_staff)
+        try:
+            await self.db.flush()
+        except IntegrityError:
+            # Someone registered the same name or email since the checks above
+            raise AlreadyExistsError(message="Username or email already registered")
         return new_staff
@@ -0,0 +1,38 @@
+"""
+Hot lookup statements, built once at import time.
+
+Reusing the same construct with bound parameters skips rebuilding the select
+and its cache key on every call, so SQLAlchemy's compiled cache is always hit
+and asyncpg sees identical SQL text, which keeps its prepared statement cache
+warm. Pass values as parameters, e.g.
+`await db.execute(BOOK_BY_ID, {"book_id": book_id})`.
+"""
+
+from sqlalchemy import bindparam, func, select, text
+
+from app import models
+
+BOOK_BY_ID = select(models.Book).where(models.Book.id == bindparam("book_id"))
+BOOK_BY_ISBN = select(models.Book).where(models.Book.isbn == bindparam("isbn"))
+
+MEMBER_BY_ID = select(models.Member).where(models.Member.id == bindparam("member_id"))
+# Callers pass the lowercased value
+MEMBER_BY_EMAIL = select(models.Member).where(
+    func.lower(models.Member.email) == bindparam("email")
+)
+MEMBER_BY_PHONE = select(models.Member).where(
+    func.lower(models.Member.phone) == bindparam("phone")
+)
+
+# Planner estimate kept up to date by autovacuum/ANALYZE; -1 if never analyzed
+TABLE_ROW_ESTIMATE = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"
+)
+
+STAFF_BY_ID = select(models.Staff).where(models.Staff.id == bindparam("staff_id"))
+STAFF_BY_USERNAME = select(models.Staff).where(
+    func.lower(models.Staff.username) == bindparam("username")
+)
+STAFF_BY_EMAIL = select(models.Staff).where(
+    func.lower(models.Staff.email) == bindparam("email")
+)
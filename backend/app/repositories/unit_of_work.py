@@ -1,12 +1,15 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db
 from app.repositories import (
     BookRepository,
     MemberRepository,
     BorrowingRepository,
+    RefreshTokenRepository,
     StaffRepository,
 )
 
@@ -19,6 +22,7 @@ class UnitOfWork:
         self.members = MemberRepository(session)
         self.borrowings = BorrowingRepository(session)
         self.staff = StaffRepository(session)
+        self.refresh_tokens = RefreshTokenRepository(session)
 
     async def __aenter__(self):
         return self
@@ -34,3 +38,10 @@ class UnitOfWork:
 
     async def rollback(self):
         await self.session.rollback()
+
+
+@asynccontextmanager
+async def unit_of_work() -> AsyncIterator[UnitOfWork]:
+    """UnitOfWork on its own session, for callers outside FastAPI (gRPC)."""
+    async with AsyncSessionLocal() as session:
+        yield UnitOfWork(session)
@@ -0,0 +1,147 @@
+"""
+Access token revocation.
+
+Revoked token ids (the `jti` claim) live in a Redis sorted set scored by the
+token's expiry, so ids whose tokens have expired anyway are trimmed by score
+whenever a process loads the set or runs its periodic purge. Each process keeps its own copy: a Bloom filter in front of an exact
+set, loaded at startup and kept current through a Redis pub/sub channel.
+Checking a token that was never revoked is then a few hash probes in memory,
+with no Redis round trip on the request path.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+
+from app import redis_client
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+REVOKED_TOKENS_KEY = "auth:revoked"
+REVOKED_TOKENS_CHANNEL = "auth:revoked"
+# How often expired ids are dropped, here and in Redis, and the filter rebuilt
+PURGE_INTERVAL_SECONDS = 60
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationList:
+    """Revoked jti -> expiry, with a Bloom filter for the common miss."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._expiry: dict[str, float] = {}
+        self._bloom = BloomFilter(capacity)
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._expiry[jti] = expires_at
+        self._bloom.add(jti)
+        if len(self._expiry) > self.capacity:
+            self.purge()
+
+    def is_revoked(self, jti: str) -> bool:
+        if jti not in self._bloom:
+            return False
+        return jti in self._expiry
+
+    def purge(self) -> None:
+        """Forget ids whose tokens have expired and rebuild the filter."""
+        now = time.time()
+        self._expiry = {j: exp for j, exp in self._expiry.items() if exp > now}
+        # Grow rather than let the false positive rate climb
+        self.capacity = max(self.capacity, 2 * len(self._expiry))
+        self._bloom = BloomFilter(self.capacity)
+        for jti in self._expiry:
+            self._bloom.add(jti)
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+
+REVOKED_TOKENS = RevocationList(settings.revocation_filter_capacity)
+
+
+def is_revoked(jti: str | None) -> bool:
+    return jti is not None and REVOKED_TOKENS.is_revoked(jti)
+
+
+async def revoke_token(jti: str, expires_at: float) -> None:
+    """Revoke a token here at once and in every other process via Redis."""
+    REVOKED_TOKENS.add(jti, expires_at)
+
+    client = redis_client.redis_client
+    if not client:
+        return
+    try:
+        await client.zadd(REVOKED_TOKENS_KEY, {jti: expires_at})
+        await client.publish(REVOKED_TOKENS_CHANNEL, f"{jti} {expires_at}")
+    except Exception as e:
+        logger.warning(f"Could not share revocation of {jti}: {e}")
+
+
+async def _trim_revoked_tokens(client) -> None:
+    """Drop ids of tokens that have expired anyway from the shared set."""
+    await client.zremrangebyscore(REVOKED_TOKENS_KEY, "-inf", time.time())
+
+
+async def _load_revoked_tokens(client) -> None:
+    await _trim_revoked_tokens(client)
+    for jti, expires_at in await client.zrange(
+        REVOKED_TOKENS_KEY, 0, -1, withscores=True
+    ):
+        REVOKED_TOKENS.add(jti, expires_at)
+
+
+async def sync_revocations() -> None:
+    """Keep this process's revocation list in step with Redis until cancelled."""
+    while True:
+        client = redis_client.redis_client
+        if not client:
+            return
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(REVOKED_TOKENS_CHANNEL)
+                # Load after subscribing so nothing revoked in between is missed
+                await _load_revoked_tokens(client)
+                next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=PURGE_INTERVAL_SECONDS,
+                    )
+                    if message:
+                        jti, expires_at = message["data"].split()
+                        REVOKED_TOKENS.add(jti, float(expires_at))
+                    if time.monotonic() >= next_purge:
+                        REVOKED_TOKENS.purge()
+                        await _trim_revoked_tokens(client)
+                        next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Token revocation sync interrupted, retrying: {e}")
+            await asyncio.sleep(5)
@@ -0,0 +1,17 @@
+from fastapi import Query
+from fastapi.routing import APIRouter
+
+from app.routers.auth import CurrentUser
+from app.schemas import SlowQueryResponse
+from app.slow_query_log import SLOW_QUERIES
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryResponse])
+async def get_slow_queries(
+    current_user: CurrentUser,
+    limit: int = Query(default=50, gt=0, le=1000),
+):
+    """Most recent slow queries first"""
+    return list(reversed(SLOW_QUERIES))[:limit]
@@ -1,12 +1,11 @@
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, status
 from fastapi.routing import APIRouter
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app import models
-from app.schemas import StaffCreate, StaffResponse, Token
-from app.utils import oauth2_scheme
+from app.schemas import RefreshRequest, StaffCreate, StaffResponse, Token
+from app.utils import oauth2_scheme, optional_oauth2_scheme
 from app.services import AuthService
 
 router = APIRouter()
@@ -36,11 +35,30 @@ async def login_for_access_token(
     return await service.login(form_data.username, form_data.password)
 
 
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    refresh_request: RefreshRequest,
+    service: Annotated[AuthService, Depends(AuthService)],
+):
+    return await service.refresh(refresh_request.refresh_token)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    refresh_request: RefreshRequest,
+    service: Annotated[AuthService, Depends(AuthService)],
+    access_token: Annotated[str | None, Depends(optional_oauth2_scheme)],
+):
+    # Also revokes the access token when one is sent
+    await service.logout(refresh_request.refresh_token, access_token)
+
+
 async def get_current_user_dependency(
     token: Annotated[str, Depends(oauth2_scheme)],
     service: Annotated[AuthService, Depends(AuthService)],
-) -> models.Staff:
+) -> StaffResponse:
+    # Served from the token and staff caches; no query for a repeat caller
     return await service.get_current_user(token)
 
 
-CurrentUser = Annotated[models.Staff, Depends(get_current_user_dependency)]
+CurrentUser = Annotated[StaffResponse, Depends(get_current_user_dependency)]
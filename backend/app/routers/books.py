@@ -1,30 +1,43 @@
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Response, status
 from fastapi.routing import APIRouter
 
 from app.routers.auth import CurrentUser
 from app.schemas import BookCreate, BookResponse, BookUpdate
 from app.services import BookService
+from app.utils import make_etag, parse_if_match, set_total_count
 
 router = APIRouter()
 
 
 @router.get("", response_model=list[BookResponse])
 async def get_books(
+    response: Response,
     service: Annotated[BookService, Depends(BookService)],
     title: str | None = None,
     author: str | None = None,
     limit: int = 10,
     offset: int = 0,
+    cursor: str | None = None,
+    include_total: bool = False,
 ):
-    books = await service.get_books(title, author, limit, offset)
+    """
+    Books in id order. Pass the X-Next-Cursor response header back as `cursor`
+    for the next page.
+    """
+    books, next_cursor = await service.get_books(title, author, limit, offset, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if include_total:
+        set_total_count(response, *await service.count_books(title, author))
     return books
 
 
 @router.get("/{book_id}", response_model=BookResponse)
 async def get_book_by_id(
     book_id: int,
+    response: Response,
     current_user: CurrentUser,
     service: Annotated[BookService, Depends(BookService)],
 ):
@@ -33,7 +46,9 @@ async def get_book_by_id(
             status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
             detail="book_id must be positive",
         )
-    return await service.get_book_by_id(book_id)
+    book = await service.get_book_by_id(book_id)
+    response.headers["ETag"] = make_etag(book)
+    return book
 
 
 @router.post("", response_model=BookResponse)
@@ -49,8 +64,10 @@ async def create_book(
 async def update_book(
     book_id: int,
     book: BookUpdate,
+    response: Response,
     current_user: CurrentUser,
     service: Annotated[BookService, Depends(BookService)],
+    if_match: Annotated[str | None, Header()] = None,
 ):
     if book_id <= 0:
         raise HTTPException(
@@ -58,7 +75,9 @@ async def update_book(
             detail="book_id must be positive",
         )
 
-    return await service.update_book(book_id, book)
+    updated_book = await service.update_book(book_id, book, parse_if_match(if_match))
+    response.headers["ETag"] = make_etag(updated_book)
+    return updated_book
 
 
 @router.delete("/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -66,10 +85,11 @@ async def delete_book(
     book_id: int,
     current_user: CurrentUser,
     service: Annotated[BookService, Depends(BookService)],
+    if_match: Annotated[str | None, Header()] = None,
 ):
     if book_id <= 0:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
             detail="book_id must be positive",
         )
-    await service.delete_book(book_id)
+    await service.delete_book(book_id, parse_if_match(if_match))
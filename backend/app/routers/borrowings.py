@@ -1,10 +1,12 @@
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.routing import APIRouter
 
 from app.routers.auth import CurrentUser
 from app.schemas import (
+    BorrowingPage,
     BorrowRequest,
     BorrowResponse,
     ReturnRequest,
@@ -33,6 +35,8 @@ async def get_borrowing_records_by_member_id(
     member_id: int,
     limit: int = 10,
     offset: int = 0,
+    borrowed_from: datetime | None = None,
+    borrowed_to: datetime | None = None,
 ):
     if member_id <= 0:
         raise HTTPException(
@@ -40,7 +44,9 @@ async def get_borrowing_records_by_member_id(
             detail="member_id must be positive.",
         )
 
-    return await service.get_borrowing_records_by_member_id(member_id, limit, offset)
+    return await service.get_borrowing_records_by_member_id(
+        member_id, limit, offset, borrowed_from, borrowed_to
+    )
 
 
 @router.get("/history", response_model=list[BorrowResponse])
@@ -49,8 +55,22 @@ async def get_borrowing_records(
     service: Annotated[BorrowingService, Depends(BorrowingService)],
     limit: int = 10,
     offset: int = 0,
+    borrowed_from: datetime | None = None,
+    borrowed_to: datetime | None = None,
 ):
-    return await service.get_all_borrowings_history(limit, offset)
+    return await service.get_all_borrowings_history(
+        limit, offset, borrowed_from, borrowed_to
+    )
+
+
+@router.get("/overdue", response_model=BorrowingPage)
+async def get_overdue_borrowing_records(
+    current_user: CurrentUser,
+    service: Annotated[BorrowingService, Depends(BorrowingService)],
+    limit: int = Query(default=10, gt=0, le=100),
+    cursor: str | None = None,
+):
+    return await service.get_overdue_borrowings(limit, cursor)
 
 
 @router.post("/borrow", response_model=BorrowResponse)
@@ -59,7 +79,9 @@ async def borrow_book(
     current_user: CurrentUser,
     service: Annotated[BorrowingService, Depends(BorrowingService)],
 ):
-    return await service.borrow_book(borrow_request.book_id, borrow_request.member_id)
+    return await service.borrow_book(
+        borrow_request.book_id, borrow_request.member_id, borrow_request.due_date
+    )
 
 
 @router.put("/return", response_model=ReturnResponse)
@@ -78,6 +100,8 @@ async def get_borrowing_records_by_book_id(
     book_id: int,
     limit: int = 10,
     offset: int = 0,
+    borrowed_from: datetime | None = None,
+    borrowed_to: datetime | None = None,
 ):
     if book_id <= 0:
         raise HTTPException(
@@ -85,4 +109,6 @@ async def get_borrowing_records_by_book_id(
             detail="book_id must be positive.",
         )
 
-    return await service.get_borrowing_records_by_book_id(book_id, limit, offset)
+    return await service.get_borrowing_records_by_book_id(
+        book_id, limit, offset, borrowed_from, borrowed_to
+    )
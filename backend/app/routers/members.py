@@ -1,11 +1,12 @@
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Query, Response, status
 from fastapi.routing import APIRouter
 
 from app.routers.auth import CurrentUser
 from app.schemas import MemberCreate, MemberResponse, MemberUpdate
 from app.services import MemberService
+from app.utils import make_etag, parse_if_match, set_total_count
 
 router = APIRouter()
 
@@ -13,16 +14,31 @@ router = APIRouter()
 @router.get("", response_model=list[MemberResponse])
 async def get_members(
     current_user: CurrentUser,
+    response: Response,
     service: Annotated[MemberService, Depends(MemberService)],
-    limit: int = 10,
-    offset: int = 0,
+    limit: int = Query(default=10, gt=0, le=1000),
+    offset: int = Query(default=0, ge=0),
+    cursor: str | None = None,
+    order_by: Literal["id", "name"] = "id",
+    q: str | None = Query(default=None, min_length=1, max_length=100),
+    include_total: bool = False,
 ):
-    return await service.get_members(limit, offset)
+    """
+    Members ordered by id or name. Pass the X-Next-Cursor response header back
+    as `cursor` for the next page; `q` matches a name or email prefix.
+    """
+    members, next_cursor = await service.get_members(limit, offset, cursor, order_by, q)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if include_total:
+        set_total_count(response, *await service.count_members(q))
+    return members
 
 
 @router.get("/{member_id}", response_model=MemberResponse)
 async def get_member_by_id(
     member_id: int,
+    response: Response,
     current_user: CurrentUser,
     service: Annotated[MemberService, Depends(MemberService)],
 ):
@@ -31,7 +47,9 @@ async def get_member_by_id(
             status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
             detail="member_id must be positive",
         )
-    return await service.get_member_by_id(member_id)
+    member = await service.get_member_by_id(member_id)
+    response.headers["ETag"] = make_etag(member)
+    return member
 
 
 @router.post("", response_model=MemberResponse)
@@ -47,8 +65,10 @@ async def create_member(
 async def update_member(
     member_id: int,
     member: MemberUpdate,
+    response: Response,
     current_user: CurrentUser,
     service: Annotated[MemberService, Depends(MemberService)],
+    if_match: Annotated[str | None, Header()] = None,
 ):
     if member_id <= 0:
         raise HTTPException(
@@ -56,7 +76,11 @@ async def update_member(
             detail="member_id must be positive",
         )
 
-    return await service.update_member(member_id, member)
+    updated_member = await service.update_member(
+        member_id, member, parse_if_match(if_match)
+    )
+    response.headers["ETag"] = make_etag(updated_member)
+    return updated_member
 
 
 @router.delete("/{member_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -64,6 +88,7 @@ async def delete_member(
     member_id: int,
     current_user: CurrentUser,
     service: Annotated[MemberService, Depends(MemberService)],
+    if_match: Annotated[str | None, Header()] = None,
 ):
     if member_id <= 0:
         raise HTTPException(
@@ -71,4 +96,4 @@ async def delete_member(
             detail="member_id must be positive",
         )
 
-    await service.delete_member(member_id)
+    await service.delete_member(member_id, parse_if_match(if_match))
@@ -1,5 +1,7 @@
-from datetime import datetime
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from datetime import UTC, datetime
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
 
 class BookBase(BaseModel):
@@ -15,12 +17,19 @@ class BookCreate(BaseModel):
     author: str
     isbn: str
     description: str | None = None
+    total_copies: int = Field(default=1, ge=1)
 
 
 class BookResponse(BookBase):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
+    total_copies: int = 1
+    available_copies: int = 1
+    total_borrows: int = 0
+    active_loans: int = 0
+    last_borrowed_at: datetime | None = None
+    version: int = 1
     created_at: datetime
     updated_at: datetime
 
@@ -30,6 +39,7 @@ class BookUpdate(BaseModel):
     author: str | None = None
     description: str | None = None
     is_available: bool | None = None
+    total_copies: int | None = Field(default=None, ge=1)
 
 
 class MemberBase(BaseModel):
@@ -48,6 +58,10 @@ class MemberResponse(MemberBase):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
+    total_borrows: int = 0
+    active_loans: int = 0
+    last_borrowed_at: datetime | None = None
+    version: int = 1
     created_at: datetime
     updated_at: datetime
 
@@ -55,21 +69,43 @@ class MemberResponse(MemberBase):
 class MemberUpdate(MemberBase): ...
 
 
-class BorrowRequest(BaseModel):
+class BorrowBase(BaseModel):
     book_id: int = Field(gt=0)
     member_id: int = Field(gt=0)
     due_date: datetime | None = None
 
 
-class BorrowResponse(BorrowRequest):
+class BorrowRequest(BorrowBase):
+    @field_validator("due_date")
+    @classmethod
+    def due_date_in_future(cls, due_date: datetime | None) -> datetime | None:
+        if due_date is None:
+            return None
+        # A due date without an offset is taken as UTC
+        if due_date.tzinfo is None:
+            due_date = due_date.replace(tzinfo=UTC)
+        if due_date <= datetime.now(UTC):
+            raise ValueError("Due date must be in the future")
+        return due_date
+
+
+class BorrowRecord(BorrowBase):
     id: int
     borrowed_date: datetime
     status: str = "borrowed"
     returned_date: datetime | None = None
+
+
+class BorrowResponse(BorrowRecord):
     book: BookResponse
     member: MemberResponse
 
 
+class BorrowingPage(BaseModel):
+    items: list[BorrowResponse]
+    next_cursor: str | None = None
+
+
 class ReturnRequest(BaseModel):
     book_id: int = Field(gt=0)
     member_id: int = Field(gt=0)
@@ -96,8 +132,22 @@ class StaffResponse(BaseModel):
     id: int
     username: str
     email: EmailStr
+    full_name: str | None = None
 
 
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(min_length=1)
+
+
+class SlowQueryResponse(BaseModel):
+    recorded_at: datetime
+    duration_ms: float
+    statement: str
+    parameters: list[str] | None = None
+    plan: Any = None
@@ -1,14 +1,22 @@
-from datetime import timedelta
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
 from typing import Annotated
 
 from fastapi import Depends
 
+from app.auth_cache import STAFF_CACHE
 from app.config import settings
+from app.redis_client import get_cache, set_cache
+from app.revocation import revoke_token
 from app.repositories.unit_of_work import UnitOfWork
-from app.schemas import StaffCreate, Token
+from app.schemas import StaffCreate, StaffResponse, Token
+from app.password_pool import hash_password, verify_password
 from app.utils import (
     create_access_token,
-    verify_password,
+    create_refresh_token,
+    decode_access_token,
+    hash_refresh_token,
     verify_access_token,
 )
 from app.exceptions import InvalidCredentialsError
@@ -19,25 +27,81 @@ class AuthService:
         self.uow = uow
 
     async def register_staff(self, staff_data: StaffCreate):
+        # Hash before touching the database, so no pooled connection is held
+        # while waiting for a hashing worker
+        hashed_password = await hash_password(staff_data.password)
         async with self.uow:
-            new_staff = await self.uow.staff.create_staff(staff_data)
-            await self.uow.session.flush()
+            new_staff = await self.uow.staff.create_staff(staff_data, hashed_password)
             await self.uow.session.refresh(new_staff)
             return new_staff
 
     async def login(self, email: str, password: str) -> Token:
         staff = await self.uow.staff.get_staff_by_email(email)
+        # Hand the connection back to the pool before the slow hash check
+        if staff:
+            self.uow.session.expunge(staff)
+        await self.uow.rollback()
 
-        if not staff or not verify_password(password, staff.hashed_password):
+        if not staff or not await verify_password(password, staff.hashed_password):
             raise InvalidCredentialsError(message="Incorrect email or password")
 
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+        async with self.uow:
+            return await self._issue_tokens(staff.id, family_id=uuid.uuid4().hex)
+
+    async def refresh(self, refresh_token: str) -> Token:
+        """Swap a refresh token for a new access and refresh token pair."""
+        token_hash = hash_refresh_token(refresh_token)
+        async with self.uow:
+            current = await self.uow.refresh_tokens.use_token(token_hash)
+            if current:
+                return await self._issue_tokens(current.staff_id, current.family_id)
+
+            existing = await self.uow.refresh_tokens.get_token_by_hash(token_hash)
+            if existing and existing.revoked_at:
+                # An already rotated token is back: assume the chain was stolen
+                # and end the session for whoever holds the newest link too
+                await self.uow.refresh_tokens.revoke_family(existing.family_id)
+
+        raise InvalidCredentialsError(message="Invalid or expired refresh token")
+
+    async def logout(self, refresh_token: str, access_token: str | None = None) -> None:
+        if access_token:
+            claims = decode_access_token(access_token)
+            if claims and claims.get("jti"):
+                await revoke_token(claims["jti"], claims["exp"])
+
+        async with self.uow:
+            existing = await self.uow.refresh_tokens.get_token_by_hash(
+                hash_refresh_token(refresh_token)
+            )
+            if existing:
+                await self.uow.refresh_tokens.revoke_family(existing.family_id)
+
+    async def _issue_tokens(self, staff_id: int, family_id: str) -> Token:
         access_token = create_access_token(
-            data={"sub": str(staff.id)}, expires_delta=access_token_expires
+            data={"sub": str(staff_id)},
+            expires_delta=timedelta(minutes=settings.access_token_expire_minutes),
+        )
+        refresh_token, token_hash = create_refresh_token()
+        await self.uow.refresh_tokens.create_token(
+            staff_id,
+            family_id,
+            token_hash,
+            datetime.now(UTC) + timedelta(days=settings.refresh_token_expire_days),
+        )
+        # Every rotation leaves a row behind; sweep a few expired ones so the
+        # table stays bounded without a separate job
+        if settings.refresh_token_cleanup_batch:
+            await self.uow.refresh_tokens.delete_expired(
+                settings.refresh_token_cleanup_batch
+            )
+        return Token(
+            access_token=access_token,
+            token_type="bearer",
+            refresh_token=refresh_token,
         )
-        return Token(access_token=access_token, token_type="bearer")
 
-    async def get_current_user(self, token: str):
+    async def get_current_user(self, token: str) -> StaffResponse:
         staff_id = verify_access_token(token)
         if staff_id is None:
             raise InvalidCredentialsError(message="Invalid or expired token")
@@ -47,5 +111,28 @@ class AuthService:
         except (TypeError, ValueError):
             raise InvalidCredentialsError(message="Invalid or expired token")
 
-        staff = await self.uow.staff.get_staff_by_id(staff_id_int)
-        return staff
+        return await self.get_staff_principal(staff_id_int)
+
+    async def get_staff_principal(self, staff_id: int) -> StaffResponse:
+        """The authenticated staff member, from process memory, Redis or Postgres."""
+        principal = STAFF_CACHE.get(staff_id)
+        if principal is not None:
+            return principal
+
+        cache_key = f"staff:id:{staff_id}"
+        cached_staff = await get_cache(cache_key)
+        if cached_staff:
+            principal = StaffResponse.model_validate(cached_staff)
+        else:
+            staff = await self.uow.staff.get_staff_by_id(staff_id)
+            principal = StaffResponse.model_validate(staff)
+            await set_cache(
+                cache_key,
+                principal.model_dump(mode="json"),
+                expire=settings.staff_cache_ttl_seconds,
+            )
+
+        STAFF_CACHE.set(
+            staff_id, principal, time.time() + settings.staff_cache_ttl_seconds
+        )
+        return principal
@@ -15,7 +15,9 @@ class BookService:
     def __init__(
         self,
         uow: Annotated[UnitOfWork, Depends(UnitOfWork)],
-        rmq_channel: Annotated[aio_pika.RobustChannel, Depends(get_rmq_channel)],
+        rmq_channel: Annotated[
+            aio_pika.RobustChannel | None, Depends(get_rmq_channel)
+        ] = None,
     ):
         self.uow = uow
         self.rmq_channel = rmq_channel
@@ -26,18 +28,46 @@ class BookService:
         author: str | None = None,
         limit: int = 10,
         offset: int = 0,
+        cursor: str | None = None,
     ):
         cache_key = (
             f"books:list:title:{title}:author:{author}:limit:{limit}:offset:{offset}"
+            f":cursor:{cursor}"
         )
-        cached_books = await get_cache(cache_key)
-        if cached_books:
-            return cached_books
+        cached_page = await get_cache(cache_key)
+        if cached_page:
+            return cached_page["items"], cached_page["next_cursor"]
 
-        books = await self.uow.books.get_books(title, author, limit, offset)
+        books, next_cursor = await self.uow.books.get_books(
+            title, author, limit, offset, cursor
+        )
+
+        await set_cache(
+            cache_key,
+            {"items": jsonable_encoder(books), "next_cursor": next_cursor},
+            expire=600,
+        )
+        return books, next_cursor
+
+    def stream_books(self, title: str | None, author: str | None, batch_size: int):
+        # Not cached: streams are for bulk reads that would churn the cache
+        return self.uow.books.stream_books(title, author, batch_size)
+
+    async def count_books(
+        self,
+        title: str | None = None,
+        author: str | None = None,
+    ) -> tuple[int, bool]:
+        # Lives under books:list so writes invalidate it with the pages
+        cache_key = f"books:list:count:title:{title}:author:{author}"
+        cached_count = await get_cache(cache_key)
+        if cached_count:
+            return cached_count["total"], cached_count["estimated"]
 
-        await set_cache(cache_key, jsonable_encoder(books), expire=600)
-        return books
+        total, estimated = await self.uow.books.count_books(title, author)
+
+        await set_cache(cache_key, {"total": total, "estimated": estimated}, expire=600)
+        return total, estimated
 
     async def get_book_by_id(
         self,
@@ -65,27 +95,31 @@ class BookService:
 
         await invalidate_prefix("books:list")
 
-        await publish_json(
-            channel=self.rmq_channel,
-            exchange=Topology.DIRECT_EXCHANGE,
-            key=Topology.CREATION_KEY,
-            val={
-                "event": "book_created",
-                "book_id": new_book.id,
-                "title": new_book.title,
-                "author": new_book.author,
-                "description": new_book.description or "",
-            },
-        )
+        if self.rmq_channel:
+            await publish_json(
+                channel=self.rmq_channel,
+                exchange=Topology.DIRECT_EXCHANGE,
+                key=Topology.CREATION_KEY,
+                val={
+                    "event": "book_created",
+                    "book_id": new_book.id,
+                    "title": new_book.title,
+                    "author": new_book.author,
+                    "description": new_book.description or "",
+                },
+            )
         return new_book
 
     async def update_book(
         self,
         book_id: int,
         book: BookUpdate,
+        expected_version: int | None = None,
     ):
         async with self.uow:
-            updated_book = await self.uow.books.update_book(book_id, book)
+            updated_book = await self.uow.books.update_book(
+                book_id, book, expected_version
+            )
             await self.uow.session.flush()
             await self.uow.session.refresh(updated_book)
 
@@ -96,9 +130,10 @@ class BookService:
     async def delete_book(
         self,
         book_id: int,
+        expected_version: int | None = None,
     ):
         async with self.uow:
-            await self.uow.books.delete_book(book_id)
+            await self.uow.books.delete_book(book_id, expected_version)
 
         await delete_cache(f"books:id:{book_id}")
         await invalidate_prefix("books:list")
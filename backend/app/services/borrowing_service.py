@@ -1,4 +1,4 @@
-from datetime import UTC, datetime
+from datetime import datetime
 from typing import Annotated
 
 import aio_pika
@@ -8,7 +8,7 @@ from fastapi.encoders import jsonable_encoder
 from app.dependencies import get_rmq_channel
 from app.redis_client import get_cache, set_cache, delete_cache, invalidate_prefix
 from app.repositories.unit_of_work import UnitOfWork
-from app.exceptions import ActionForbiddenError, NotFoundError
+from app.exceptions import NotFoundError
 from pubsub import Topology, publish_json
 
 
@@ -16,7 +16,9 @@ class BorrowingService:
     def __init__(
         self,
         uow: Annotated[UnitOfWork, Depends(UnitOfWork)],
-        rmq_channel: Annotated[aio_pika.RobustChannel, Depends(get_rmq_channel)],
+        rmq_channel: Annotated[
+            aio_pika.RobustChannel | None, Depends(get_rmq_channel)
+        ] = None,
     ):
         self.uow = uow
         self.rmq_channel = rmq_channel
@@ -40,14 +42,19 @@ class BorrowingService:
         member_id: int,
         limit: int = 10,
         offset: int = 0,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
     ):
-        cache_key = f"borrowings:member_id:{member_id}:limit:{limit}:offset:{offset}"
+        cache_key = (
+            f"borrowings:member_id:{member_id}:limit:{limit}:offset:{offset}"
+            f":from:{borrowed_from}:to:{borrowed_to}"
+        )
         cached_borrowings = await get_cache(cache_key)
         if cached_borrowings:
             return cached_borrowings
 
         borrowings = await self.uow.borrowings.get_borrowings_by_member_id(
-            member_id, limit, offset
+            member_id, limit, offset, borrowed_from, borrowed_to
         )
         await set_cache(cache_key, jsonable_encoder(borrowings))
         return borrowings
@@ -57,14 +64,19 @@ class BorrowingService:
         book_id: int,
         limit: int = 10,
         offset: int = 0,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
     ):
-        cache_key = f"borrowings:book_id:{book_id}:limit:{limit}:offset:{offset}"
+        cache_key = (
+            f"borrowings:book_id:{book_id}:limit:{limit}:offset:{offset}"
+            f":from:{borrowed_from}:to:{borrowed_to}"
+        )
         cached_borrowings = await get_cache(cache_key)
         if cached_borrowings:
             return cached_borrowings
 
         borrowings = await self.uow.borrowings.get_borrowings_by_book_id(
-            book_id, limit, offset
+            book_id, limit, offset, borrowed_from, borrowed_to
         )
         await set_cache(cache_key, jsonable_encoder(borrowings))
         return borrowings
@@ -73,51 +85,122 @@ class BorrowingService:
         self,
         limit: int = 10,
         offset: int = 0,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
     ):
-        cache_key = f"borrowings:history:limit:{limit}:offset:{offset}"
+        cache_key = (
+            f"borrowings:history:limit:{limit}:offset:{offset}"
+            f":from:{borrowed_from}:to:{borrowed_to}"
+        )
         cached_borrowings = await get_cache(cache_key)
         if cached_borrowings:
             return cached_borrowings
 
-        borrowings = await self.uow.borrowings.get_all_borrowings_history(limit, offset)
+        borrowings = await self.uow.borrowings.get_all_borrowings_history(
+            limit, offset, borrowed_from, borrowed_to
+        )
         await set_cache(cache_key, jsonable_encoder(borrowings))
         return borrowings
 
-    async def borrow_book(self, book_id: int, member_id: int):
-        async with self.uow:
-            book = await self.uow.books.get_book_by_id(book_id)
-            if not book.is_available:
-                raise ActionForbiddenError(message="Book not available")
+    async def get_borrowings_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        member_id: int | None = None,
+        active_only: bool = False,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
+    ):
+        cache_key = (
+            f"borrowings:page:limit:{limit}:cursor:{cursor}:member_id:{member_id}"
+            f":active:{active_only}:from:{borrowed_from}:to:{borrowed_to}"
+        )
+        cached_page = await get_cache(cache_key)
+        if cached_page:
+            return cached_page["items"], cached_page["next_cursor"]
+
+        if member_id is not None:
+            _ = await self.uow.members.get_member_by_id(member_id)
+
+        borrowings, next_cursor = await self.uow.borrowings.get_borrowings_page(
+            limit, cursor, member_id, active_only, borrowed_from, borrowed_to
+        )
+
+        await set_cache(
+            cache_key,
+            {"items": jsonable_encoder(borrowings), "next_cursor": next_cursor},
+        )
+        return borrowings, next_cursor
+
+    def stream_borrowings(
+        self,
+        batch_size: int,
+        member_id: int | None = None,
+        book_id: int | None = None,
+        active_only: bool = False,
+        borrowed_from: datetime | None = None,
+        borrowed_to: datetime | None = None,
+    ):
+        return self.uow.borrowings.stream_borrowings(
+            batch_size, member_id, book_id, active_only, borrowed_from, borrowed_to
+        )
+
+    async def get_overdue_borrowings(
+        self,
+        limit: int = 10,
+        cursor: str | None = None,
+    ):
+        # Not cached: what counts as overdue changes with the clock
+        borrowings, next_cursor = await self.uow.borrowings.get_overdue_borrowings(
+            limit, cursor
+        )
+        return {"items": borrowings, "next_cursor": next_cursor}
 
+    async def borrow_book(
+        self,
+        book_id: int,
+        member_id: int,
+        due_date: datetime | None = None,
+    ):
+        async with self.uow:
             _ = await self.uow.members.get_member_by_id(member_id)
 
-            record = await self.uow.borrowings.create_record(book_id, member_id)
+            record = await self.uow.borrowings.create_record(
+                book_id, member_id, due_date
+            )
 
-            book.is_available = False
             await self.uow.session.flush()
             await self.uow.session.refresh(record, attribute_names=["book", "member"])
 
         await delete_cache(f"books:id:{book_id}")
         await invalidate_prefix("books:list")
+        # The member's circulation counters changed too
+        await delete_cache(f"members:id:{member_id}")
+        await invalidate_prefix("members:list")
         await invalidate_prefix("borrowings")
 
-        await publish_json(
-            channel=self.rmq_channel,
-            exchange=Topology.DIRECT_EXCHANGE,
-            key=Topology.BORROWING_KEY,
-            val={
-                "event": "book_borrowed",
-                "book_id": book_id,
-                "member_id": member_id,
-                "book_title": book.title,
-                "member_name": record.member.name,
-                "member_phone": record.member.phone,
-                "borrowed_date": (
-                    record.borrowed_date.isoformat() if record.borrowed_date else None
-                ),
-                "due_date": record.due_date.isoformat() if record.due_date else None,
-            },
-        )
+        if self.rmq_channel:
+            await publish_json(
+                channel=self.rmq_channel,
+                exchange=Topology.DIRECT_EXCHANGE,
+                key=Topology.BORROWING_KEY,
+                val={
+                    "event": "book_borrowed",
+                    "book_id": book_id,
+                    "member_id": member_id,
+                    "book_title": record.book.title,
+                    "member_name": record.member.name,
+                    "member_phone": record.member.phone,
+                    "borrowed_date": (
+                        record.borrowed_date.isoformat()
+                        if record.borrowed_date
+                        else None
+                    ),
+                    "due_date": (
+                        record.due_date.isoformat() if record.due_date else None
+                    ),
+                },
+            )
 
         return record
 
@@ -133,8 +216,7 @@ class BorrowingService:
                     message="No active borrowing record not found for Book and Member specified."
                 )
 
-            record.returned_date = datetime.now(UTC)
-            record.book.is_available = True
+            await self.uow.borrowings.close_record(record)
             # Keep original due date to check if it was returned late
 
             await self.uow.session.flush()
@@ -142,27 +224,37 @@ class BorrowingService:
 
         await delete_cache(f"books:id:{book_id}")
         await invalidate_prefix("books:list")
+        # The member's circulation counters changed too
+        await delete_cache(f"members:id:{member_id}")
+        await invalidate_prefix("members:list")
         await invalidate_prefix("borrowings")
 
-        await publish_json(
-            channel=self.rmq_channel,
-            exchange=Topology.DIRECT_EXCHANGE,
-            key=Topology.RETURNED_KEY,
-            val={
-                "event": "book_returned",
-                "book_id": book_id,
-                "member_id": member_id,
-                "book_title": record.book.title,
-                "member_name": record.member.name,
-                "member_phone": record.member.phone,
-                "borrowed_date": (
-                    record.borrowed_date.isoformat() if record.borrowed_date else None
-                ),
-                "due_date": record.due_date.isoformat() if record.due_date else None,
-                "returned_date": (
-                    record.returned_date.isoformat() if record.returned_date else None
-                ),
-            },
-        )
+        if self.rmq_channel:
+            await publish_json(
+                channel=self.rmq_channel,
+                exchange=Topology.DIRECT_EXCHANGE,
+                key=Topology.RETURNED_KEY,
+                val={
+                    "event": "book_returned",
+                    "book_id": book_id,
+                    "member_id": member_id,
+                    "book_title": record.book.title,
+                    "member_name": record.member.name,
+                    "member_phone": record.member.phone,
+                    "borrowed_date": (
+                        record.borrowed_date.isoformat()
+                        if record.borrowed_date
+                        else None
+                    ),
+                    "due_date": (
+                        record.due_date.isoformat() if record.due_date else None
+                    ),
+                    "returned_date": (
+                        record.returned_date.isoformat()
+                        if record.returned_date
+                        else None
+                    ),
+                },
+            )
 
         return record
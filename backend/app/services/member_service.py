@@ -16,16 +16,42 @@ class MemberService:
         self,
         limit: int = 10,
         offset: int = 0,
+        cursor: str | None = None,
+        order_by: str = "id",
+        search: str | None = None,
     ):
-        cache_key = f"members:list:limit:{limit}:offset:{offset}"
-        cached_members = await get_cache(cache_key)
-        if cached_members:
-            return cached_members
-
-        members = await self.uow.members.get_members(limit, offset)
-
-        await set_cache(cache_key, jsonable_encoder(members))
-        return members
+        cache_key = (
+            f"members:list:limit:{limit}:offset:{offset}:cursor:{cursor}"
+            f":order:{order_by}:q:{search}"
+        )
+        cached_page = await get_cache(cache_key)
+        if cached_page:
+            return cached_page["items"], cached_page["next_cursor"]
+
+        members, next_cursor = await self.uow.members.get_members(
+            limit, offset, cursor, order_by, search
+        )
+
+        await set_cache(
+            cache_key,
+            {"items": jsonable_encoder(members), "next_cursor": next_cursor},
+        )
+        return members, next_cursor
+
+    def stream_members(self, batch_size: int, search: str | None = None):
+        return self.uow.members.stream_members(batch_size, search)
+
+    async def count_members(self, search: str | None = None) -> tuple[int, bool]:
+        # Lives under members:list so writes invalidate it with the pages
+        cache_key = f"members:list:count:q:{search}"
+        cached_count = await get_cache(cache_key)
+        if cached_count:
+            return cached_count["total"], cached_count["estimated"]
+
+        total, estimated = await self.uow.members.count_members(search)
+
+        await set_cache(cache_key, {"total": total, "estimated": estimated})
+        return total, estimated
 
     async def get_member_by_id(
         self,
@@ -57,9 +83,12 @@ class MemberService:
         self,
         member_id: int,
         member: MemberUpdate,
+        expected_version: int | None = None,
     ):
         async with self.uow:
-            updated_member = await self.uow.members.update_member(member_id, member)
+            updated_member = await self.uow.members.update_member(
+                member_id, member, expected_version
+            )
             await self.uow.session.flush()
             await self.uow.session.refresh(updated_member)
 
@@ -70,9 +99,10 @@ class MemberService:
     async def delete_member(
         self,
         member_id: int,
+        expected_version: int | None = None,
     ):
         async with self.uow:
-            await self.uow.members.delete_member(member_id)
+            await self.uow.members.delete_member(member_id, expected_version)
 
         await delete_cache(f"members:id:{member_id}")
         await invalidate_prefix("members:list")
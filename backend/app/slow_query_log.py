@@ -0,0 +1,151 @@
+"""
+Opt-in slow query recorder.
+
+When SLOW_QUERY_THRESHOLD_MS is set, statements that take longer are kept in a
+bounded ring buffer (served at GET /api/admin/slow-queries) and logged as JSON,
+together with an EXPLAIN (FORMAT JSON) plan fetched on a separate connection so
+the request that ran the query is not held up. Plans are best effort: at most
+a few are fetched at once, none while the pool is exhausted, and a statement
+is explained again only after an interval.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from collections import deque
+from datetime import UTC, datetime
+
+from sqlalchemy import event
+
+from app.config import settings
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERIES: deque[dict] = deque(maxlen=settings.slow_query_log_size)
+
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+# Password and token hashes live here; their bind values are never recorded
+_SENSITIVE_TABLES = re.compile(r"\b(staffs|refresh_tokens)\b", re.IGNORECASE)
+_background_tasks: set[asyncio.Task] = set()
+# statement -> time.monotonic() of its last EXPLAIN
+_last_explained: dict[str, float] = {}
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context rather than the connection, so a statement
+    # that raises leaves nothing behind for the next one to pick up
+    if context is not None:
+        context._slow_query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_slow_query_start_time", None)
+    if start is None:
+        return
+    duration_ms = (time.perf_counter() - start) * 1000
+    if duration_ms < settings.slow_query_threshold_ms:
+        return
+    if not context.execution_options.get("slow_query_log", True):
+        return
+
+    entry = {
+        "recorded_at": datetime.now(UTC).isoformat(),
+        "duration_ms": round(duration_ms, 3),
+        "statement": " ".join(statement.split()),
+        "parameters": _recorded_parameters(statement, parameters, executemany),
+        "plan": None,
+    }
+    SLOW_QUERIES.append(entry)
+
+    explainable = not executemany and entry["statement"].upper().startswith(
+        _EXPLAINABLE
+    )
+    if (
+        not settings.slow_query_explain
+        or not explainable
+        or not _may_explain(statement)
+    ):
+        logger.warning(json.dumps({"event": "slow_query", **entry}, default=str))
+        return
+    _last_explained[statement] = time.monotonic()
+
+    # Event handlers run synchronously inside the engine's greenlet, so the
+    # plan is fetched by a task on the running loop rather than awaited here.
+    task = asyncio.get_running_loop().create_task(
+        _explain(entry, statement, parameters)
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _recorded_parameters(statement: str, parameters, executemany: bool):
+    if not settings.slow_query_log_parameters or executemany:
+        return None
+    if _SENSITIVE_TABLES.search(statement):
+        return ["<redacted>"] * len(parameters)
+    return [repr(p) for p in parameters]
+
+
+def _may_explain(statement: str) -> bool:
+    """
+    Whether a plan can be fetched now without adding to the pool's trouble
+    Slow queries come in bursts when the database is struggling, which is
+    exactly when the pool has no connections to spare
+    """
+    if len(_background_tasks) >= settings.slow_query_explain_max_in_flight:
+        return False
+    checkedin = getattr(engine.pool, "checkedin", None)
+    if checkedin is not None and checkedin() == 0:
+        return False
+
+    now = time.monotonic()
+    last = _last_explained.get(statement)
+    if last is not None and now - last < settings.slow_query_explain_interval_seconds:
+        return False
+    if len(_last_explained) >= settings.slow_query_log_size:
+        # Forget statements whose interval has passed
+        for key, at in list(_last_explained.items()):
+            if now - at >= settings.slow_query_explain_interval_seconds:
+                del _last_explained[key]
+    return True
+
+
+async def _explain(entry: dict, statement: str, parameters) -> None:
+    options = "ANALYZE, FORMAT JSON"
+    # ANALYZE runs the statement, so only do it for reads; the connection is
+    # rolled back either way.
+    if not settings.slow_query_explain_analyze or not entry[
+        "statement"
+    ].upper().startswith(("SELECT", "WITH")):
+        options = "FORMAT JSON"
+
+    try:
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(slow_query_log=False)
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN ({options}) {statement}", parameters
+            )
+            plan = result.scalar()
+            entry["plan"] = json.loads(plan) if isinstance(plan, str) else plan
+            await conn.rollback()
+    except Exception as e:
+        logger.warning(f"Could not EXPLAIN slow query: {e}")
+
+    logger.warning(json.dumps({"event": "slow_query", **entry}, default=str))
+
+
+def install_slow_query_log() -> bool:
+    """Start recording slow queries if SLOW_QUERY_THRESHOLD_MS is configured."""
+    if settings.slow_query_threshold_ms is None:
+        return False
+    if event.contains(
+        engine.sync_engine, "after_cursor_execute", _after_cursor_execute
+    ):
+        return True
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    return True
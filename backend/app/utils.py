@@ -1,15 +1,28 @@
+import base64
+import hashlib
+import json
+import secrets
+import time
+import uuid
 from datetime import UTC, datetime, timedelta
 
 import jwt
+from fastapi import Response
 from fastapi.security import OAuth2PasswordBearer
 from pwdlib import PasswordHash
 
+from app.auth_cache import TOKEN_CACHE
 from app.config import settings
+from app.exceptions import InvalidCursorError, VersionConflictError
+from app.revocation import is_revoked
 
 
 password_hash = PasswordHash.recommended()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl="api/auth/login", auto_error=False
+)
 
 
 def hash_password(password: str) -> str:
@@ -28,7 +41,8 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
         expire = datetime.now(UTC) + timedelta(
             minutes=settings.access_token_expire_minutes
         )
-    to_encode.update({"exp": expire})
+    # jti lets a single token be revoked before it expires
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
     return jwt.encode(
         payload=to_encode,
         key=settings.secret_key.get_secret_value(),
@@ -36,9 +50,20 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     )
 
 
-def verify_access_token(token: str) -> str | None:
+def create_refresh_token() -> tuple[str, str]:
+    """A new opaque refresh token and the hash that is stored for it."""
+    token = secrets.token_urlsafe(32)
+    return token, hash_refresh_token(token)
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def decode_access_token(token: str) -> dict | None:
+    """Claims of a validly signed, unexpired token; revocation not checked."""
     try:
-        payload = jwt.decode(
+        return jwt.decode(
             jwt=token,
             key=settings.secret_key.get_secret_value(),
             algorithms=[settings.algorithm],
@@ -46,5 +71,72 @@ def verify_access_token(token: str) -> str | None:
         )
     except jwt.InvalidTokenError:
         return None
+
+
+def verify_access_token(token: str) -> str | None:
+    # Keyed by hash so the cache never holds usable tokens
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = TOKEN_CACHE.get(cache_key)
+    if cached is None:
+        payload = decode_access_token(token)
+        if payload is None or payload.get("sub") is None:
+            return None
+        cached = (payload["sub"], payload.get("jti"))
+        # Never outlive the token itself
+        expires_at = min(payload["exp"], time.time() + settings.token_cache_ttl_seconds)
+        TOKEN_CACHE.set(cache_key, cached, expires_at)
+
+    subject, jti = cached
+    # Checked on every call, cached or not, so revocation applies at once
+    if is_revoked(jti):
+        return None
+    return subject
+
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset pagination cursor for the last row of a page."""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise InvalidCursorError(message="Invalid pagination cursor")
+    if not isinstance(values, list):
+        raise InvalidCursorError(message="Invalid pagination cursor")
+    return values
+
+
+def set_total_count(response: Response, total: int, estimated: bool) -> None:
+    response.headers["X-Total-Count"] = str(total)
+    if estimated:
+        response.headers["X-Total-Count-Estimated"] = "true"
+
+
+def make_etag(entity) -> str:
+    """
+    Weak ETag for a versioned row (ORM object or cached dict). The version only
+    moves on edits, while borrows and returns change the counters in the body
+    without bumping it, so the tag guards edits via If-Match and nothing more.
+    """
+    if isinstance(entity, dict):
+        version = entity.get("version", 1)
     else:
-        return payload.get("sub")
+        version = entity.version
+    return f'W/"{version}"'
+
+
+def parse_if_match(if_match: str | None) -> int | None:
+    """Expected row version from an If-Match header; None means unconditional."""
+    if not if_match or if_match.strip() == "*":
+        return None
+    tag = if_match.split(",")[0].strip().removeprefix("W/").strip('"')
+    try:
+        return int(tag)
+    except ValueError:
+        raise VersionConflictError(message="If-Match does not match any version")
@@ -4,6 +4,7 @@ import grpc
 import warnings
 
 from protos import auth_pb2 as protos_dot_auth__pb2
+from protos import common_pb2 as protos_dot_common__pb2
 
 GRPC_GENERATED_VERSION = '1.78.0'
 GRPC_VERSION = grpc.__version__
@@ -49,6 +50,16 @@ class AuthServiceStub(object):
                 request_serializer=protos_dot_auth__pb2.GetCurrentUserRequest.SerializeToString,
                 response_deserializer=protos_dot_auth__pb2.Staff.FromString,
                 _registered_method=True)
+        self.Refresh = channel.unary_unary(
+                '/library.AuthService/Refresh',
+                request_serializer=protos_dot_auth__pb2.RefreshRequest.SerializeToString,
+                response_deserializer=protos_dot_auth__pb2.LoginResponse.FromString,
+                _registered_method=True)
+        self.Logout = channel.unary_unary(
+                '/library.AuthService/Logout',
+                request_serializer=protos_dot_auth__pb2.LogoutRequest.SerializeToString,
+                response_deserializer=protos_dot_common__pb2.Empty.FromString,
+                _registered_method=True)
 
 
 class AuthServiceServicer(object):
@@ -72,6 +83,18 @@ class AuthServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def Refresh(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Logout(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_AuthServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -90,6 +113,16 @@ def add_AuthServiceServicer_to_server(servicer, server):
                     request_deserializer=protos_dot_auth__pb2.GetCurrentUserRequest.FromString,
                     response_serializer=protos_dot_auth__pb2.Staff.SerializeToString,
             ),
+            'Refresh': grpc.unary_unary_rpc_method_handler(
+                    servicer.Refresh,
+                    request_deserializer=protos_dot_auth__pb2.RefreshRequest.FromString,
+                    response_serializer=protos_dot_auth__pb2.LoginResponse.SerializeToString,
+            ),
+            'Logout': grpc.unary_unary_rpc_method_handler(
+                    servicer.Logout,
+                    request_deserializer=protos_dot_auth__pb2.LogoutRequest.FromString,
+                    response_serializer=protos_dot_common__pb2.Empty.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'library.AuthService', rpc_method_handlers)
@@ -181,3 +214,57 @@ class AuthService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def Refresh(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.AuthService/Refresh',
+            protos_dot_auth__pb2.RefreshRequest.SerializeToString,
+            protos_dot_auth__pb2.LoginResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Logout(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.AuthService/Logout',
+            protos_dot_auth__pb2.LogoutRequest.SerializeToString,
+            protos_dot_common__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
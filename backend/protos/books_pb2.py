@@ -22,31 +22,34 @@ _runtime_version.ValidateProtobufRuntimeVersion(
 _sym_db = _symbol_database.Default()
 
 
+from google.protobuf import field_mask_pb2 as google_dot_protobuf_dot_field__mask__pb2
 from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
 from protos import common_pb2 as protos_dot_common__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12protos/books.proto\x12\x07library\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x13protos/common.proto\"\xdf\x01\n\x04\x42ook\x12\n\n\x02id\x18\x01 \x01(\x05\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x03 \x01(\t\x12\x0c\n\x04isbn\x18\x04 \x01(\t\x12\x18\n\x0b\x64\x65scription\x18\x05 \x01(\tH\x00\x88\x01\x01\x12\x14\n\x0cis_available\x18\x06 \x01(\x08\x12.\n\ncreated_at\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12.\n\nupdated_at\x18\x08 \x01(\x0b\x32\x1a.google.protobuf.TimestampB\x0e\n\x0c_description\"j\n\x11\x43reateBookRequest\x12\r\n\x05title\x18\x01 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x02 \x01(\t\x12\x0c\n\x04isbn\x18\x03 \x01(\t\x12\x18\n\x0b\x64\x65scription\x18\x04 \x01(\tH\x00\x88\x01\x01\x42\x0e\n\x0c_description\"\xb3\x01\n\x11UpdateBookRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x12\n\x05title\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x13\n\x06\x61uthor\x18\x03 \x01(\tH\x01\x88\x01\x01\x12\x18\n\x0b\x64\x65scription\x18\x04 \x01(\tH\x02\x88\x01\x01\x12\x19\n\x0cis_available\x18\x05 \x01(\x08H\x03\x88\x01\x01\x42\x08\n\x06_titleB\t\n\x07_authorB\x0e\n\x0c_descriptionB\x0f\n\r_is_available\"O\n\x0fGetBooksRequest\x12\x12\n\x05title\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x13\n\x06\x61uthor\x18\x02 \x01(\tH\x01\x88\x01\x01\x42\x08\n\x06_titleB\t\n\x07_author\"0\n\x10GetBooksResponse\x12\x1c\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\r.library.Book\"\x1c\n\x0eGetBookRequest\x12\n\n\x02id\x18\x01 \x01(\x05\"\x1f\n\x11\x44\x65leteBookRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x32\xad\x02\n\x0b\x42ookService\x12?\n\x08GetBooks\x12\x18.library.GetBooksRequest\x1a\x19.library.GetBooksResponse\x12\x31\n\x07GetBook\x12\x17.library.GetBookRequest\x1a\r.library.Book\x12\x37\n\nCreateBook\x12\x1a.library.CreateBookRequest\x1a\r.library.Book\x12\x37\n\nUpdateBook\x12\x1a.library.UpdateBookRequest\x1a\r.library.Book\x12\x38\n\nDeleteBook\x12\x1a.library.DeleteBookRequest\x1a\x0e.library.Emptyb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x12protos/books.proto\x12\x07library\x1a google/protobuf/field_mask.proto\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x13protos/common.proto\"\x9d\x03\n\x04\x42ook\x12\n\n\x02id\x18\x01 \x01(\x05\x12\r\n\x05title\x18\x02 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x03 \x01(\t\x12\x0c\n\x04isbn\x18\x04 \x01(\t\x12\x18\n\x0b\x64\x65scription\x18\x05 \x01(\tH\x00\x88\x01\x01\x12\x14\n\x0cis_available\x18\x06 \x01(\x08\x12.\n\ncreated_at\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12.\n\nupdated_at\x18\x08 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x15\n\rtotal_borrows\x18\t \x01(\x05\x12\x14\n\x0c\x61\x63tive_loans\x18\n \x01(\x05\x12\x39\n\x10last_borrowed_at\x18\x0b \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x01\x88\x01\x01\x12\x14\n\x0ctotal_copies\x18\x0c \x01(\x05\x12\x18\n\x10\x61vailable_copies\x18\r \x01(\x05\x12\x0f\n\x07version\x18\x0e \x01(\x05\x42\x0e\n\x0c_descriptionB\x13\n\x11_last_borrowed_at\"\x96\x01\n\x11\x43reateBookRequest\x12\r\n\x05title\x18\x01 \x01(\t\x12\x0e\n\x06\x61uthor\x18\x02 \x01(\t\x12\x0c\n\x04isbn\x18\x03 \x01(\t\x12\x18\n\x0b\x64\x65scription\x18\x04 \x01(\tH\x00\x88\x01\x01\x12\x19\n\x0ctotal_copies\x18\x05 \x01(\x05H\x01\x88\x01\x01\x42\x0e\n\x0c_descriptionB\x0f\n\r_total_copies\"\x81\x02\n\x11UpdateBookRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x12\n\x05title\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x13\n\x06\x61uthor\x18\x03 \x01(\tH\x01\x88\x01\x01\x12\x18\n\x0b\x64\x65scription\x18\x04 \x01(\tH\x02\x88\x01\x01\x12\x19\n\x0cis_available\x18\x05 \x01(\x08H\x03\x88\x01\x01\x12\x19\n\x0ctotal_copies\x18\x06 \x01(\x05H\x04\x88\x01\x01\x12\x14\n\x07version\x18\x07 \x01(\x05H\x05\x88\x01\x01\x42\x08\n\x06_titleB\t\n\x07_authorB\x0e\n\x0c_descriptionB\x0f\n\r_is_availableB\x0f\n\r_total_copiesB\n\n\x08_version\"\xd0\x01\n\x0fGetBooksRequest\x12\x12\n\x05title\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x13\n\x06\x61uthor\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x15\n\rinclude_total\x18\x03 \x01(\x08\x12\x11\n\tpage_size\x18\x04 \x01(\x05\x12\x17\n\npage_token\x18\x05 \x01(\tH\x02\x88\x01\x01\x12-\n\tread_mask\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.FieldMaskB\x08\n\x06_titleB\t\n\x07_authorB\r\n\x0b_page_token\"\x92\x01\n\x10GetBooksResponse\x12\x1c\n\x05\x62ooks\x18\x01 \x03(\x0b\x32\r.library.Book\x12\x18\n\x0btotal_count\x18\x02 \x01(\x03H\x00\x88\x01\x01\x12\x1d\n\x15total_count_estimated\x18\x03 \x01(\x08\x12\x17\n\x0fnext_page_token\x18\x04 \x01(\tB\x0e\n\x0c_total_count\"\x95\x01\n\x12StreamBooksRequest\x12\x12\n\x05title\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x13\n\x06\x61uthor\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x12\n\nbatch_size\x18\x03 \x01(\x05\x12-\n\tread_mask\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.FieldMaskB\x08\n\x06_titleB\t\n\x07_author\"K\n\x0eGetBookRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12-\n\tread_mask\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"A\n\x11\x44\x65leteBookRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x14\n\x07version\x18\x02 \x01(\x05H\x00\x88\x01\x01\x42\n\n\x08_version2\xf6\x02\n\x0b\x42ookService\x12?\n\x08GetBooks\x12\x18.library.GetBooksRequest\x1a\x19.library.GetBooksResponse\x12G\n\x0bStreamBooks\x12\x1b.library.StreamBooksRequest\x1a\x19.library.GetBooksResponse0\x01\x12\x31\n\x07GetBook\x12\x17.library.GetBookRequest\x1a\r.library.Book\x12\x37\n\nCreateBook\x12\x1a.library.CreateBookRequest\x1a\r.library.Book\x12\x37\n\nUpdateBook\x12\x1a.library.UpdateBookRequest\x1a\r.library.Book\x12\x38\n\nDeleteBook\x12\x1a.library.DeleteBookRequest\x1a\x0e.library.Emptyb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'protos.books_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_BOOK']._serialized_start=86
-  _globals['_BOOK']._serialized_end=309
-  _globals['_CREATEBOOKREQUEST']._serialized_start=311
-  _globals['_CREATEBOOKREQUEST']._serialized_end=417
-  _globals['_UPDATEBOOKREQUEST']._serialized_start=420
-  _globals['_UPDATEBOOKREQUEST']._serialized_end=599
-  _globals['_GETBOOKSREQUEST']._serialized_start=601
-  _globals['_GETBOOKSREQUEST']._serialized_end=680
-  _globals['_GETBOOKSRESPONSE']._serialized_start=682
-  _globals['_GETBOOKSRESPONSE']._serialized_end=730
-  _globals['_GETBOOKREQUEST']._serialized_start=732
-  _globals['_GETBOOKREQUEST']._serialized_end=760
-  _globals['_DELETEBOOKREQUEST']._serialized_start=762
-  _globals['_DELETEBOOKREQUEST']._serialized_end=793
-  _globals['_BOOKSERVICE']._serialized_start=796
-  _globals['_BOOKSERVICE']._serialized_end=1097
+  _globals['_BOOK']._serialized_start=120
+  _globals['_BOOK']._serialized_end=533
+  _globals['_CREATEBOOKREQUEST']._serialized_start=536
+  _globals['_CREATEBOOKREQUEST']._serialized_end=686
+  _globals['_UPDATEBOOKREQUEST']._serialized_start=689
+  _globals['_UPDATEBOOKREQUEST']._serialized_end=946
+  _globals['_GETBOOKSREQUEST']._serialized_start=949
+  _globals['_GETBOOKSREQUEST']._serialized_end=1157
+  _globals['_GETBOOKSRESPONSE']._serialized_start=1160
+  _globals['_GETBOOKSRESPONSE']._serialized_end=1306
+  _globals['_STREAMBOOKSREQUEST']._serialized_start=1309
+  _globals['_STREAMBOOKSREQUEST']._serialized_end=1458
+  _globals['_GETBOOKREQUEST']._serialized_start=1460
+  _globals['_GETBOOKREQUEST']._serialized_end=1535
+  _globals['_DELETEBOOKREQUEST']._serialized_start=1537
+  _globals['_DELETEBOOKREQUEST']._serialized_end=1602
+  _globals['_BOOKSERVICE']._serialized_start=1605
+  _globals['_BOOKSERVICE']._serialized_end=1979
 # @@protoc_insertion_point(module_scope)
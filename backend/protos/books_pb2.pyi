@@ -1,5 +1,6 @@
 import datetime
 
+from google.protobuf import field_mask_pb2 as _field_mask_pb2
 from google.protobuf import timestamp_pb2 as _timestamp_pb2
 from protos import common_pb2 as _common_pb2
 from google.protobuf.internal import containers as _containers
@@ -11,7 +12,7 @@ from typing import ClassVar as _ClassVar, Optional as _Optional, Union as _Union
 DESCRIPTOR: _descriptor.FileDescriptor
 
 class Book(_message.Message):
-    __slots__ = ("id", "title", "author", "isbn", "description", "is_available", "created_at", "updated_at")
+    __slots__ = ("id", "title", "author", "isbn", "description", "is_available", "created_at", "updated_at", "total_borrows", "active_loans", "last_borrowed_at", "total_copies", "available_copies", "version")
     ID_FIELD_NUMBER: _ClassVar[int]
     TITLE_FIELD_NUMBER: _ClassVar[int]
     AUTHOR_FIELD_NUMBER: _ClassVar[int]
@@ -20,6 +21,12 @@ class Book(_message.Message):
     IS_AVAILABLE_FIELD_NUMBER: _ClassVar[int]
     CREATED_AT_FIELD_NUMBER: _ClassVar[int]
     UPDATED_AT_FIELD_NUMBER: _ClassVar[int]
+    TOTAL_BORROWS_FIELD_NUMBER: _ClassVar[int]
+    ACTIVE_LOANS_FIELD_NUMBER: _ClassVar[int]
+    LAST_BORROWED_AT_FIELD_NUMBER: _ClassVar[int]
+    TOTAL_COPIES_FIELD_NUMBER: _ClassVar[int]
+    AVAILABLE_COPIES_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
     id: int
     title: str
     author: str
@@ -28,56 +35,98 @@ class Book(_message.Message):
     is_available: bool
     created_at: _timestamp_pb2.Timestamp
     updated_at: _timestamp_pb2.Timestamp
-    def __init__(self, id: _Optional[int] = ..., title: _Optional[str] = ..., author: _Optional[str] = ..., isbn: _Optional[str] = ..., description: _Optional[str] = ..., is_available: bool = ..., created_at: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., updated_at: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ...) -> None: ...
+    total_borrows: int
+    active_loans: int
+    last_borrowed_at: _timestamp_pb2.Timestamp
+    total_copies: int
+    available_copies: int
+    version: int
+    def __init__(self, id: _Optional[int] = ..., title: _Optional[str] = ..., author: _Optional[str] = ..., isbn: _Optional[str] = ..., description: _Optional[str] = ..., is_available: bool = ..., created_at: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., updated_at: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., total_borrows: _Optional[int] = ..., active_loans: _Optional[int] = ..., last_borrowed_at: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., total_copies: _Optional[int] = ..., available_copies: _Optional[int] = ..., version: _Optional[int] = ...) -> None: ...
 
 class CreateBookRequest(_message.Message):
-    __slots__ = ("title", "author", "isbn", "description")
+    __slots__ = ("title", "author", "isbn", "description", "total_copies")
     TITLE_FIELD_NUMBER: _ClassVar[int]
     AUTHOR_FIELD_NUMBER: _ClassVar[int]
     ISBN_FIELD_NUMBER: _ClassVar[int]
     DESCRIPTION_FIELD_NUMBER: _ClassVar[int]
+    TOTAL_COPIES_FIELD_NUMBER: _ClassVar[int]
     title: str
     author: str
     isbn: str
     description: str
-    def __init__(self, title: _Optional[str] = ..., author: _Optional[str] = ..., isbn: _Optional[str] = ..., description: _Optional[str] = ...) -> None: ...
+    total_copies: int
+    def __init__(self, title: _Optional[str] = ..., author: _Optional[str] = ..., isbn: _Optional[str] = ..., description: _Optional[str] = ..., total_copies: _Optional[int] = ...) -> None: ...
 
 class UpdateBookRequest(_message.Message):
-    __slots__ = ("id", "title", "author", "description", "is_available")
+    __slots__ = ("id", "title", "author", "description", "is_available", "total_copies", "version")
     ID_FIELD_NUMBER: _ClassVar[int]
     TITLE_FIELD_NUMBER: _ClassVar[int]
     AUTHOR_FIELD_NUMBER: _ClassVar[int]
     DESCRIPTION_FIELD_NUMBER: _ClassVar[int]
     IS_AVAILABLE_FIELD_NUMBER: _ClassVar[int]
+    TOTAL_COPIES_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
     id: int
     title: str
     author: str
     description: str
     is_available: bool
-    def __init__(self, id: _Optional[int] = ..., title: _Optional[str] = ..., author: _Optional[str] = ..., description: _Optional[str] = ..., is_available: bool = ...) -> None: ...
+    total_copies: int
+    version: int
+    def __init__(self, id: _Optional[int] = ..., title: _Optional[str] = ..., author: _Optional[str] = ..., description: _Optional[str] = ..., is_available: bool = ..., total_copies: _Optional[int] = ..., version: _Optional[int] = ...) -> None: ...
 
 class GetBooksRequest(_message.Message):
-    __slots__ = ("title", "author")
+    __slots__ = ("title", "author", "include_total", "page_size", "page_token", "read_mask")
     TITLE_FIELD_NUMBER: _ClassVar[int]
     AUTHOR_FIELD_NUMBER: _ClassVar[int]
+    INCLUDE_TOTAL_FIELD_NUMBER: _ClassVar[int]
+    PAGE_SIZE_FIELD_NUMBER: _ClassVar[int]
+    PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    READ_MASK_FIELD_NUMBER: _ClassVar[int]
     title: str
     author: str
-    def __init__(self, title: _Optional[str] = ..., author: _Optional[str] = ...) -> None: ...
+    include_total: bool
+    page_size: int
+    page_token: str
+    read_mask: _field_mask_pb2.FieldMask
+    def __init__(self, title: _Optional[str] = ..., author: _Optional[str] = ..., include_total: bool = ..., page_size: _Optional[int] = ..., page_token: _Optional[str] = ..., read_mask: _Optional[_Union[_field_mask_pb2.FieldMask, _Mapping]] = ...) -> None: ...
 
 class GetBooksResponse(_message.Message):
-    __slots__ = ("books",)
+    __slots__ = ("books", "total_count", "total_count_estimated", "next_page_token")
     BOOKS_FIELD_NUMBER: _ClassVar[int]
+    TOTAL_COUNT_FIELD_NUMBER: _ClassVar[int]
+    TOTAL_COUNT_ESTIMATED_FIELD_NUMBER: _ClassVar[int]
+    NEXT_PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
     books: _containers.RepeatedCompositeFieldContainer[Book]
-    def __init__(self, books: _Optional[_Iterable[_Union[Book, _Mapping]]] = ...) -> None: ...
+    total_count: int
+    total_count_estimated: bool
+    next_page_token: str
+    def __init__(self, books: _Optional[_Iterable[_Union[Book, _Mapping]]] = ..., total_count: _Optional[int] = ..., total_count_estimated: bool = ..., next_page_token: _Optional[str] = ...) -> None: ...
+
+class StreamBooksRequest(_message.Message):
+    __slots__ = ("title", "author", "batch_size", "read_mask")
+    TITLE_FIELD_NUMBER: _ClassVar[int]
+    AUTHOR_FIELD_NUMBER: _ClassVar[int]
+    BATCH_SIZE_FIELD_NUMBER: _ClassVar[int]
+    READ_MASK_FIELD_NUMBER: _ClassVar[int]
+    title: str
+    author: str
+    batch_size: int
+    read_mask: _field_mask_pb2.FieldMask
+    def __init__(self, title: _Optional[str] = ..., author: _Optional[str] = ..., batch_size: _Optional[int] = ..., read_mask: _Optional[_Union[_field_mask_pb2.FieldMask, _Mapping]] = ...) -> None: ...
 
 class GetBookRequest(_message.Message):
-    __slots__ = ("id",)
+    __slots__ = ("id", "read_mask")
     ID_FIELD_NUMBER: _ClassVar[int]
+    READ_MASK_FIELD_NUMBER: _ClassVar[int]
     id: int
-    def __init__(self, id: _Optional[int] = ...) -> None: ...
+    read_mask: _field_mask_pb2.FieldMask
+    def __init__(self, id: _Optional[int] = ..., read_mask: _Optional[_Union[_field_mask_pb2.FieldMask, _Mapping]] = ...) -> None: ...
 
 class DeleteBookRequest(_message.Message):
-    __slots__ = ("id",)
+    __slots__ = ("id", "version")
     ID_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
     id: int
-    def __init__(self, id: _Optional[int] = ...) -> None: ...
+    version: int
+    def __init__(self, id: _Optional[int] = ..., version: _Optional[int] = ...) -> None: ...
@@ -44,6 +44,11 @@ class BookServiceStub(object):
                 request_serializer=protos_dot_books__pb2.GetBooksRequest.SerializeToString,
                 response_deserializer=protos_dot_books__pb2.GetBooksResponse.FromString,
                 _registered_method=True)
+        self.StreamBooks = channel.unary_stream(
+                '/library.BookService/StreamBooks',
+                request_serializer=protos_dot_books__pb2.StreamBooksRequest.SerializeToString,
+                response_deserializer=protos_dot_books__pb2.GetBooksResponse.FromString,
+                _registered_method=True)
         self.GetBook = channel.unary_unary(
                 '/library.BookService/GetBook',
                 request_serializer=protos_dot_books__pb2.GetBookRequest.SerializeToString,
@@ -80,6 +85,13 @@ class BookServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamBooks(self, request, context):
+        """Stream all matching books in batches, read from a server-side cursor
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetBook(self, request, context):
         """Get a single book by id
         """
@@ -116,6 +128,11 @@ def add_BookServiceServicer_to_server(servicer, server):
                     request_deserializer=protos_dot_books__pb2.GetBooksRequest.FromString,
                     response_serializer=protos_dot_books__pb2.GetBooksResponse.SerializeToString,
             ),
+            'StreamBooks': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamBooks,
+                    request_deserializer=protos_dot_books__pb2.StreamBooksRequest.FromString,
+                    response_serializer=protos_dot_books__pb2.GetBooksResponse.SerializeToString,
+            ),
             'GetBook': grpc.unary_unary_rpc_method_handler(
                     servicer.GetBook,
                     request_deserializer=protos_dot_books__pb2.GetBookRequest.FromString,
@@ -178,6 +195,33 @@ class BookService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def StreamBooks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/library.BookService/StreamBooks',
+            protos_dot_books__pb2.StreamBooksRequest.SerializeToString,
+            protos_dot_books__pb2.GetBooksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetBook(request,
             target,
@@ -22,32 +22,37 @@ _runtime_version.ValidateProtobufRuntimeVersion(
 _sym_db = _symbol_database.Default()
 
 
+from google.protobuf import field_mask_pb2 as google_dot_protobuf_dot_field__mask__pb2
 from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
 from protos import books_pb2 as protos_dot_books__pb2
 from protos import members_pb2 as protos_dot_members__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17protos/borrowings.proto\x12\x07library\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x12protos/books.proto\x1a\x14protos/members.proto\"s\n\rBorrowRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\x05\x12\x11\n\tmember_id\x18\x02 \x01(\x05\x12\x31\n\x08\x64ue_date\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x00\x88\x01\x01\x42\x0b\n\t_due_date\"\xcb\x02\n\x0e\x42orrowResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\x05\x12\x11\n\tmember_id\x18\x03 \x01(\x05\x12\x31\n\x08\x64ue_date\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x00\x88\x01\x01\x12\x31\n\rborrowed_date\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x0e\n\x06status\x18\x06 \x01(\t\x12\x36\n\rreturned_date\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x01\x88\x01\x01\x12\x1b\n\x04\x62ook\x18\x08 \x01(\x0b\x32\r.library.Book\x12\x1f\n\x06member\x18\t \x01(\x0b\x32\x0f.library.MemberB\x0b\n\t_due_dateB\x10\n\x0e_returned_date\"D\n\x15GetBorrowingsResponse\x12+\n\nborrowings\x18\x01 \x03(\x0b\x32\x17.library.BorrowResponse\"3\n\rReturnRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\x05\x12\x11\n\tmember_id\x18\x02 \x01(\x05\"\xc1\x01\n\x0eReturnResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\x05\x12\x11\n\tmember_id\x18\x03 \x01(\x05\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x31\n\rreturned_date\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x1b\n\x04\x62ook\x18\x06 \x01(\x0b\x32\r.library.Book\x12\x1f\n\x06member\x18\x07 \x01(\x0b\x32\x0f.library.Member\"\x12\n\x10GetBorrowRequest\"(\n\x1aGetMemberBorrowingsRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x32\x92\x03\n\x10\x42orrowingService\x12Q\n\x14GetBorrowingsHistory\x12\x19.library.GetBorrowRequest\x1a\x1e.library.GetBorrowingsResponse\x12Q\n\x14GetCurrentBorrowings\x12\x19.library.GetBorrowRequest\x1a\x1e.library.GetBorrowingsResponse\x12Z\n\x13GetMemberBorrowings\x12#.library.GetMemberBorrowingsRequest\x1a\x1e.library.GetBorrowingsResponse\x12=\n\nBorrowBook\x12\x16.library.BorrowRequest\x1a\x17.library.BorrowResponse\x12=\n\nReturnBook\x12\x16.library.ReturnRequest\x1a\x17.library.ReturnResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17protos/borrowings.proto\x12\x07library\x1a google/protobuf/field_mask.proto\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x12protos/books.proto\x1a\x14protos/members.proto\"s\n\rBorrowRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\x05\x12\x11\n\tmember_id\x18\x02 \x01(\x05\x12\x31\n\x08\x64ue_date\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x00\x88\x01\x01\x42\x0b\n\t_due_date\"\xcb\x02\n\x0e\x42orrowResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\x05\x12\x11\n\tmember_id\x18\x03 \x01(\x05\x12\x31\n\x08\x64ue_date\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x00\x88\x01\x01\x12\x31\n\rborrowed_date\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x0e\n\x06status\x18\x06 \x01(\t\x12\x36\n\rreturned_date\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x01\x88\x01\x01\x12\x1b\n\x04\x62ook\x18\x08 \x01(\x0b\x32\r.library.Book\x12\x1f\n\x06member\x18\t \x01(\x0b\x32\x0f.library.MemberB\x0b\n\t_due_dateB\x10\n\x0e_returned_date\"]\n\x15GetBorrowingsResponse\x12+\n\nborrowings\x18\x01 \x03(\x0b\x32\x17.library.BorrowResponse\x12\x17\n\x0fnext_page_token\x18\x02 \x01(\t\"3\n\rReturnRequest\x12\x0f\n\x07\x62ook_id\x18\x01 \x01(\x05\x12\x11\n\tmember_id\x18\x02 \x01(\x05\"\xc1\x01\n\x0eReturnResponse\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x0f\n\x07\x62ook_id\x18\x02 \x01(\x05\x12\x11\n\tmember_id\x18\x03 \x01(\x05\x12\x0e\n\x06status\x18\x04 \x01(\t\x12\x31\n\rreturned_date\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x1b\n\x04\x62ook\x18\x06 \x01(\x0b\x32\r.library.Book\x12\x1f\n\x06member\x18\x07 \x01(\x0b\x32\x0f.library.Member\"\x8c\x02\n\x10GetBorrowRequest\x12\x11\n\tpage_size\x18\x01 \x01(\x05\x12\x17\n\npage_token\x18\x02 \x01(\tH\x00\x88\x01\x01\x12\x36\n\rborrowed_from\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x01\x88\x01\x01\x12\x34\n\x0b\x62orrowed_to\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x02\x88\x01\x01\x12-\n\tread_mask\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.FieldMaskB\r\n\x0b_page_tokenB\x10\n\x0e_borrowed_fromB\x0e\n\x0c_borrowed_to\"\xa2\x02\n\x1aGetMemberBorrowingsRequest\x12\n\n\x02id\x18\x01 \x01(\x05\x12\x11\n\tpage_size\x18\x02 \x01(\x05\x12\x17\n\npage_token\x18\x03 \x01(\tH\x00\x88\x01\x01\x12\x36\n\rborrowed_from\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x01\x88\x01\x01\x12\x34\n\x0b\x62orrowed_to\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x02\x88\x01\x01\x12-\n\tread_mask\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.FieldMaskB\r\n\x0b_page_tokenB\x10\n\x0e_borrowed_fromB\x0e\n\x0c_borrowed_to\"\x87\x01\n\x1bGetOverdueBorrowingsRequest\x12\x11\n\tpage_size\x18\x01 \x01(\x05\x12\x17\n\npage_token\x18\x02 \x01(\tH\x00\x88\x01\x01\x12-\n\tread_mask\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.FieldMaskB\r\n\x0b_page_token\"\xc9\x02\n\x17StreamBorrowingsRequest\x12\x12\n\nbatch_size\x18\x01 \x01(\x05\x12\x16\n\tmember_id\x18\x02 \x01(\x05H\x00\x88\x01\x01\x12\x14\n\x07\x62ook_id\x18\x03 \x01(\x05H\x01\x88\x01\x01\x12\x13\n\x0b\x61\x63tive_only\x18\x04 \x01(\x08\x12\x36\n\rborrowed_from\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x02\x88\x01\x01\x12\x34\n\x0b\x62orrowed_to\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x03\x88\x01\x01\x12-\n\tread_mask\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.FieldMaskB\x0c\n\n_member_idB\n\n\x08_book_idB\x10\n\x0e_borrowed_fromB\x0e\n\x0c_borrowed_to2\xc8\x04\n\x10\x42orrowingService\x12Q\n\x14GetBorrowingsHistory\x12\x19.library.GetBorrowRequest\x1a\x1e.library.GetBorrowingsResponse\x12Q\n\x14GetCurrentBorrowings\x12\x19.library.GetBorrowRequest\x1a\x1e.library.GetBorrowingsResponse\x12Z\n\x13GetMemberBorrowings\x12#.library.GetMemberBorrowingsRequest\x1a\x1e.library.GetBorrowingsResponse\x12\\\n\x14GetOverdueBorrowings\x12$.library.GetOverdueBorrowingsRequest\x1a\x1e.library.GetBorrowingsResponse\x12V\n\x10StreamBorrowings\x12 .library.StreamBorrowingsRequest\x1a\x1e.library.GetBorrowingsResponse0\x01\x12=\n\nBorrowBook\x12\x16.library.BorrowRequest\x1a\x17.library.BorrowResponse\x12=\n\nReturnBook\x12\x16.library.ReturnRequest\x1a\x17.library.ReturnResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'protos.borrowings_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_BORROWREQUEST']._serialized_start=111
-  _globals['_BORROWREQUEST']._serialized_end=226
-  _globals['_BORROWRESPONSE']._serialized_start=229
-  _globals['_BORROWRESPONSE']._serialized_end=560
-  _globals['_GETBORROWINGSRESPONSE']._serialized_start=562
-  _globals['_GETBORROWINGSRESPONSE']._serialized_end=630
-  _globals['_RETURNREQUEST']._serialized_start=632
-  _globals['_RETURNREQUEST']._serialized_end=683
-  _globals['_RETURNRESPONSE']._serialized_start=686
-  _globals['_RETURNRESPONSE']._serialized_end=879
-  _globals['_GETBORROWREQUEST']._serialized_start=881
-  _globals['_GETBORROWREQUEST']._serialized_end=899
-  _globals['_GETMEMBERBORROWINGSREQUEST']._serialized_start=901
-  _globals['_GETMEMBERBORROWINGSREQUEST']._serialized_end=941
-  _globals['_BORROWINGSERVICE']._serialized_start=944
-  _globals['_BORROWINGSERVICE']._serialized_end=1346
+  _globals['_BORROWREQUEST']._serialized_start=145
+  _globals['_BORROWREQUEST']._serialized_end=260
+  _globals['_BORROWRESPONSE']._serialized_start=263
+  _globals['_BORROWRESPONSE']._serialized_end=594
+  _globals['_GETBORROWINGSRESPONSE']._serialized_start=596
+  _globals['_GETBORROWINGSRESPONSE']._serialized_end=689
+  _globals['_RETURNREQUEST']._serialized_start=691
+  _globals['_RETURNREQUEST']._serialized_end=742
+  _globals['_RETURNRESPONSE']._serialized_start=745
+  _globals['_RETURNRESPONSE']._serialized_end=938
+  _globals['_GETBORROWREQUEST']._serialized_start=941
+  _globals['_GETBORROWREQUEST']._serialized_end=1209
+  _globals['_GETMEMBERBORROWINGSREQUEST']._serialized_start=1212
+  _globals['_GETMEMBERBORROWINGSREQUEST']._serialized_end=1502
+  _globals['_GETOVERDUEBORROWINGSREQUEST']._serialized_start=1505
+  _globals['_GETOVERDUEBORROWINGSREQUEST']._serialized_end=1640
+  _globals['_STREAMBORROWINGSREQUEST']._serialized_start=1643
+  _globals['_STREAMBORROWINGSREQUEST']._serialized_end=1972
+  _globals['_BORROWINGSERVICE']._serialized_start=1975
+  _globals['_BORROWINGSERVICE']._serialized_end=2559
 # @@protoc_insertion_point(module_scope)
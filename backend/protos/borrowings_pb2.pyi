@@ -1,5 +1,6 @@
 import datetime
 
+from google.protobuf import field_mask_pb2 as _field_mask_pb2
 from google.protobuf import timestamp_pb2 as _timestamp_pb2
 from protos import books_pb2 as _books_pb2
 from protos import members_pb2 as _members_pb2
@@ -44,10 +45,12 @@ class BorrowResponse(_message.Message):
     def __init__(self, id: _Optional[int] = ..., book_id: _Optional[int] = ..., member_id: _Optional[int] = ..., due_date: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., borrowed_date: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., status: _Optional[str] = ..., returned_date: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., book: _Optional[_Union[_books_pb2.Book, _Mapping]] = ..., member: _Optional[_Union[_members_pb2.Member, _Mapping]] = ...) -> None: ...
 
 class GetBorrowingsResponse(_message.Message):
-    __slots__ = ("borrowings",)
+    __slots__ = ("borrowings", "next_page_token")
     BORROWINGS_FIELD_NUMBER: _ClassVar[int]
+    NEXT_PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
     borrowings: _containers.RepeatedCompositeFieldContainer[BorrowResponse]
-    def __init__(self, borrowings: _Optional[_Iterable[_Union[BorrowResponse, _Mapping]]] = ...) -> None: ...
+    next_page_token: str
+    def __init__(self, borrowings: _Optional[_Iterable[_Union[BorrowResponse, _Mapping]]] = ..., next_page_token: _Optional[str] = ...) -> None: ...
 
 class ReturnRequest(_message.Message):
     __slots__ = ("book_id", "member_id")
@@ -76,11 +79,59 @@ class ReturnResponse(_message.Message):
     def __init__(self, id: _Optional[int] = ..., book_id: _Optional[int] = ..., member_id: _Optional[int] = ..., status: _Optional[str] = ..., returned_date: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., book: _Optional[_Union[_books_pb2.Book, _Mapping]] = ..., member: _Optional[_Union[_members_pb2.Member, _Mapping]] = ...) -> None: ...
 
 class GetBorrowRequest(_message.Message):
-    __slots__ = ()
-    def __init__(self) -> None: ...
+    __slots__ = ("page_size", "page_token", "borrowed_from", "borrowed_to", "read_mask")
+    PAGE_SIZE_FIELD_NUMBER: _ClassVar[int]
+    PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    BORROWED_FROM_FIELD_NUMBER: _ClassVar[int]
+    BORROWED_TO_FIELD_NUMBER: _ClassVar[int]
+    READ_MASK_FIELD_NUMBER: _ClassVar[int]
+    page_size: int
+    page_token: str
+    borrowed_from: _timestamp_pb2.Timestamp
+    borrowed_to: _timestamp_pb2.Timestamp
+    read_mask: _field_mask_pb2.FieldMask
+    def __init__(self, page_size: _Optional[int] = ..., page_token: _Optional[str] = ..., borrowed_from: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., borrowed_to: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., read_mask: _Optional[_Union[_field_mask_pb2.FieldMask, _Mapping]] = ...) -> None: ...
 
 class GetMemberBorrowingsRequest(_message.Message):
-    __slots__ = ("id",)
+    __slots__ = ("id", "page_size", "page_token", "borrowed_from", "borrowed_to", "read_mask")
     ID_FIELD_NUMBER: _ClassVar[int]
+    PAGE_SIZE_FIELD_NUMBER: _ClassVar[int]
+    PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    BORROWED_FROM_FIELD_NUMBER: _ClassVar[int]
+    BORROWED_TO_FIELD_NUMBER: _ClassVar[int]
+    READ_MASK_FIELD_NUMBER: _ClassVar[int]
     id: int
-    def __init__(self, id: _Optional[int] = ...) -> None: ...
+    page_size: int
+    page_token: str
+    borrowed_from: _timestamp_pb2.Timestamp
+    borrowed_to: _timestamp_pb2.Timestamp
+    read_mask: _field_mask_pb2.FieldMask
+    def __init__(self, id: _Optional[int] = ..., page_size: _Optional[int] = ..., page_token: _Optional[str] = ..., borrowed_from: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., borrowed_to: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., read_mask: _Optional[_Union[_field_mask_pb2.FieldMask, _Mapping]] = ...) -> None: ...
+
+class GetOverdueBorrowingsRequest(_message.Message):
+    __slots__ = ("page_size", "page_token", "read_mask")
+    PAGE_SIZE_FIELD_NUMBER: _ClassVar[int]
+    PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    READ_MASK_FIELD_NUMBER: _ClassVar[int]
+    page_size: int
+    page_token: str
+    read_mask: _field_mask_pb2.FieldMask
+    def __init__(self, page_size: _Optional[int] = ..., page_token: _Optional[str] = ..., read_mask: _Optional[_Union[_field_mask_pb2.FieldMask, _Mapping]] = ...) -> None: ...
+
+class StreamBorrowingsRequest(_message.Message):
+    __slots__ = ("batch_size", "member_id", "book_id", "active_only", "borrowed_from", "borrowed_to", "read_mask")
+    BATCH_SIZE_FIELD_NUMBER: _ClassVar[int]
+    MEMBER_ID_FIELD_NUMBER: _ClassVar[int]
+    BOOK_ID_FIELD_NUMBER: _ClassVar[int]
+    ACTIVE_ONLY_FIELD_NUMBER: _ClassVar[int]
+    BORROWED_FROM_FIELD_NUMBER: _ClassVar[int]
+    BORROWED_TO_FIELD_NUMBER: _ClassVar[int]
+    READ_MASK_FIELD_NUMBER: _ClassVar[int]
+    batch_size: int
+    member_id: int
+    book_id: int
+    active_only: bool
+    borrowed_from: _timestamp_pb2.Timestamp
+    borrowed_to: _timestamp_pb2.Timestamp
+    read_mask: _field_mask_pb2.FieldMask
+    def __init__(self, batch_size: _Optional[int] = ..., member_id: _Optional[int] = ..., book_id: _Optional[int] = ..., active_only: bool = ..., borrowed_from: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., borrowed_to: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., read_mask: _Optional[_Union[_field_mask_pb2.FieldMask, _Mapping]] = ...) -> None: ...
@@ -49,6 +49,16 @@ class BorrowingServiceStub(object):
                 request_serializer=protos_dot_borrowings__pb2.GetMemberBorrowingsRequest.SerializeToString,
                 response_deserializer=protos_dot_borrowings__pb2.GetBorrowingsResponse.FromString,
                 _registered_method=True)
+        self.GetOverdueBorrowings = channel.unary_unary(
+                '/library.BorrowingService/GetOverdueBorrowings',
+                request_serializer=protos_dot_borrowings__pb2.GetOverdueBorrowingsRequest.SerializeToString,
+                response_deserializer=protos_dot_borrowings__pb2.GetBorrowingsResponse.FromString,
+                _registered_method=True)
+        self.StreamBorrowings = channel.unary_stream(
+                '/library.BorrowingService/StreamBorrowings',
+                request_serializer=protos_dot_borrowings__pb2.StreamBorrowingsRequest.SerializeToString,
+                response_deserializer=protos_dot_borrowings__pb2.GetBorrowingsResponse.FromString,
+                _registered_method=True)
         self.BorrowBook = channel.unary_unary(
                 '/library.BorrowingService/BorrowBook',
                 request_serializer=protos_dot_borrowings__pb2.BorrowRequest.SerializeToString,
@@ -82,6 +92,18 @@ class BorrowingServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetOverdueBorrowings(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamBorrowings(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def BorrowBook(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -112,6 +134,16 @@ def add_BorrowingServiceServicer_to_server(servicer, server):
                     request_deserializer=protos_dot_borrowings__pb2.GetMemberBorrowingsRequest.FromString,
                     response_serializer=protos_dot_borrowings__pb2.GetBorrowingsResponse.SerializeToString,
             ),
+            'GetOverdueBorrowings': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetOverdueBorrowings,
+                    request_deserializer=protos_dot_borrowings__pb2.GetOverdueBorrowingsRequest.FromString,
+                    response_serializer=protos_dot_borrowings__pb2.GetBorrowingsResponse.SerializeToString,
+            ),
+            'StreamBorrowings': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamBorrowings,
+                    request_deserializer=protos_dot_borrowings__pb2.StreamBorrowingsRequest.FromString,
+                    response_serializer=protos_dot_borrowings__pb2.GetBorrowingsResponse.SerializeToString,
+            ),
             'BorrowBook': grpc.unary_unary_rpc_method_handler(
                     servicer.BorrowBook,
                     request_deserializer=protos_dot_borrowings__pb2.BorrowRequest.FromString,
@@ -214,6 +246,60 @@ class BorrowingService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def GetOverdueBorrowings(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/library.BorrowingService/GetOverdueBorrowings',
+            protos_dot_borrowings__pb2.GetOverdueBorrowingsRequest.SerializeToString,
+            protos_dot_borrowings__pb2.GetBorrowingsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamBorrowings(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/library.BorrowingService/StreamBorrowings',
+            protos_dot_borrowings__pb2.StreamBorrowingsRequest.SerializeToString,
+            protos_dot_borrowings__pb2.GetBorrowingsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def BorrowBook(request,
             target,
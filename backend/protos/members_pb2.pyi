@@ -1,5 +1,6 @@
 import datetime
 
+from google.protobuf import field_mask_pb2 as _field_mask_pb2
 from google.protobuf import timestamp_pb2 as _timestamp_pb2
 from protos import common_pb2 as _common_pb2
 from google.protobuf.internal import containers as _containers
@@ -11,20 +12,28 @@ from typing import ClassVar as _ClassVar, Optional as _Optional, Union as _Union
 DESCRIPTOR: _descriptor.FileDescriptor
 
 class Member(_message.Message):
-    __slots__ = ("id", "name", "email", "phone", "created_at", "updated_at")
+    __slots__ = ("id", "name", "email", "phone", "created_at", "updated_at", "total_borrows", "active_loans", "last_borrowed_at", "version")
     ID_FIELD_NUMBER: _ClassVar[int]
     NAME_FIELD_NUMBER: _ClassVar[int]
     EMAIL_FIELD_NUMBER: _ClassVar[int]
     PHONE_FIELD_NUMBER: _ClassVar[int]
     CREATED_AT_FIELD_NUMBER: _ClassVar[int]
     UPDATED_AT_FIELD_NUMBER: _ClassVar[int]
+    TOTAL_BORROWS_FIELD_NUMBER: _ClassVar[int]
+    ACTIVE_LOANS_FIELD_NUMBER: _ClassVar[int]
+    LAST_BORROWED_AT_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
     id: int
     name: str
     email: str
     phone: str
     created_at: _timestamp_pb2.Timestamp
     updated_at: _timestamp_pb2.Timestamp
-    def __init__(self, id: _Optional[int] = ..., name: _Optional[str] = ..., email: _Optional[str] = ..., phone: _Optional[str] = ..., created_at: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., updated_at: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ...) -> None: ...
+    total_borrows: int
+    active_loans: int
+    last_borrowed_at: _timestamp_pb2.Timestamp
+    version: int
+    def __init__(self, id: _Optional[int] = ..., name: _Optional[str] = ..., email: _Optional[str] = ..., phone: _Optional[str] = ..., created_at: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., updated_at: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., total_borrows: _Optional[int] = ..., active_loans: _Optional[int] = ..., last_borrowed_at: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., version: _Optional[int] = ...) -> None: ...
 
 class CreateMemberRequest(_message.Message):
     __slots__ = ("name", "email", "phone")
@@ -37,33 +46,67 @@ class CreateMemberRequest(_message.Message):
     def __init__(self, name: _Optional[str] = ..., email: _Optional[str] = ..., phone: _Optional[str] = ...) -> None: ...
 
 class UpdateMemberRequest(_message.Message):
-    __slots__ = ("id", "name", "phone")
+    __slots__ = ("id", "name", "phone", "version")
     ID_FIELD_NUMBER: _ClassVar[int]
     NAME_FIELD_NUMBER: _ClassVar[int]
     PHONE_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
     id: int
     name: str
     phone: str
-    def __init__(self, id: _Optional[int] = ..., name: _Optional[str] = ..., phone: _Optional[str] = ...) -> None: ...
+    version: int
+    def __init__(self, id: _Optional[int] = ..., name: _Optional[str] = ..., phone: _Optional[str] = ..., version: _Optional[int] = ...) -> None: ...
 
 class DeleteMemberRequest(_message.Message):
-    __slots__ = ("id",)
+    __slots__ = ("id", "version")
     ID_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
     id: int
-    def __init__(self, id: _Optional[int] = ...) -> None: ...
+    version: int
+    def __init__(self, id: _Optional[int] = ..., version: _Optional[int] = ...) -> None: ...
 
 class GetMembersResponse(_message.Message):
-    __slots__ = ("members",)
+    __slots__ = ("members", "total_count", "total_count_estimated", "next_page_token")
     MEMBERS_FIELD_NUMBER: _ClassVar[int]
+    TOTAL_COUNT_FIELD_NUMBER: _ClassVar[int]
+    TOTAL_COUNT_ESTIMATED_FIELD_NUMBER: _ClassVar[int]
+    NEXT_PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
     members: _containers.RepeatedCompositeFieldContainer[Member]
-    def __init__(self, members: _Optional[_Iterable[_Union[Member, _Mapping]]] = ...) -> None: ...
+    total_count: int
+    total_count_estimated: bool
+    next_page_token: str
+    def __init__(self, members: _Optional[_Iterable[_Union[Member, _Mapping]]] = ..., total_count: _Optional[int] = ..., total_count_estimated: bool = ..., next_page_token: _Optional[str] = ...) -> None: ...
+
+class StreamMembersRequest(_message.Message):
+    __slots__ = ("batch_size", "query", "read_mask")
+    BATCH_SIZE_FIELD_NUMBER: _ClassVar[int]
+    QUERY_FIELD_NUMBER: _ClassVar[int]
+    READ_MASK_FIELD_NUMBER: _ClassVar[int]
+    batch_size: int
+    query: str
+    read_mask: _field_mask_pb2.FieldMask
+    def __init__(self, batch_size: _Optional[int] = ..., query: _Optional[str] = ..., read_mask: _Optional[_Union[_field_mask_pb2.FieldMask, _Mapping]] = ...) -> None: ...
 
 class GetMemberRequest(_message.Message):
-    __slots__ = ("id",)
+    __slots__ = ("id", "read_mask")
     ID_FIELD_NUMBER: _ClassVar[int]
+    READ_MASK_FIELD_NUMBER: _ClassVar[int]
     id: int
-    def __init__(self, id: _Optional[int] = ...) -> None: ...
+    read_mask: _field_mask_pb2.FieldMask
+    def __init__(self, id: _Optional[int] = ..., read_mask: _Optional[_Union[_field_mask_pb2.FieldMask, _Mapping]] = ...) -> None: ...
 
 class GetMembersRequest(_message.Message):
-    __slots__ = ()
-    def __init__(self) -> None: ...
+    __slots__ = ("include_total", "page_size", "page_token", "order_by", "query", "read_mask")
+    INCLUDE_TOTAL_FIELD_NUMBER: _ClassVar[int]
+    PAGE_SIZE_FIELD_NUMBER: _ClassVar[int]
+    PAGE_TOKEN_FIELD_NUMBER: _ClassVar[int]
+    ORDER_BY_FIELD_NUMBER: _ClassVar[int]
+    QUERY_FIELD_NUMBER: _ClassVar[int]
+    READ_MASK_FIELD_NUMBER: _ClassVar[int]
+    include_total: bool
+    page_size: int
+    page_token: str
+    order_by: str
+    query: str
+    read_mask: _field_mask_pb2.FieldMask
+    def __init__(self, include_total: bool = ..., page_size: _Optional[int] = ..., page_token: _Optional[str] = ..., order_by: _Optional[str] = ..., query: _Optional[str] = ..., read_mask: _Optional[_Union[_field_mask_pb2.FieldMask, _Mapping]] = ...) -> None: ...
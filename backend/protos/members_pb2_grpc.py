@@ -44,6 +44,11 @@ class MemberServiceStub(object):
                 request_serializer=protos_dot_members__pb2.GetMembersRequest.SerializeToString,
                 response_deserializer=protos_dot_members__pb2.GetMembersResponse.FromString,
                 _registered_method=True)
+        self.StreamMembers = channel.unary_stream(
+                '/library.MemberService/StreamMembers',
+                request_serializer=protos_dot_members__pb2.StreamMembersRequest.SerializeToString,
+                response_deserializer=protos_dot_members__pb2.GetMembersResponse.FromString,
+                _registered_method=True)
         self.GetMember = channel.unary_unary(
                 '/library.MemberService/GetMember',
                 request_serializer=protos_dot_members__pb2.GetMemberRequest.SerializeToString,
@@ -80,6 +85,13 @@ class MemberServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamMembers(self, request, context):
+        """Stream all members in batches, read from a server-side cursor
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetMember(self, request, context):
         """Get member by id
         """
@@ -116,6 +128,11 @@ def add_MemberServiceServicer_to_server(servicer, server):
                     request_deserializer=protos_dot_members__pb2.GetMembersRequest.FromString,
                     response_serializer=protos_dot_members__pb2.GetMembersResponse.SerializeToString,
             ),
+            'StreamMembers': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamMembers,
+                    request_deserializer=protos_dot_members__pb2.StreamMembersRequest.FromString,
+                    response_serializer=protos_dot_members__pb2.GetMembersResponse.SerializeToString,
+            ),
             'GetMember': grpc.unary_unary_rpc_method_handler(
                     servicer.GetMember,
                     request_deserializer=protos_dot_members__pb2.GetMemberRequest.FromString,
@@ -178,6 +195,33 @@ class MemberService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def StreamMembers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/library.MemberService/StreamMembers',
+            protos_dot_members__pb2.StreamMembersRequest.SerializeToString,
+            protos_dot_members__pb2.GetMembersResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetMember(request,
             target,
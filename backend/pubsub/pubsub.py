@@ -71,5 +71,15 @@ async def publish_json(channel: aio_pika.Channel, exchange: str, key: str, val):
 
 async def get_connection(
     connection_string: str,
+    connection_name: str | None = None,
+    timeout: float | None = None,
 ) -> aio_pika.RobustConnection:
-    return await aio_pika.connect_robust(url=connection_string)
+    # The name shows up in the management UI, one per worker process
+    client_properties = (
+        {"connection_name": connection_name} if connection_name else None
+    )
+    return await aio_pika.connect_robust(
+        url=connection_string,
+        client_properties=client_properties,
+        timeout=timeout,
+    )
@@ -14,6 +14,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import AsyncSessionLocal, engine, Base
 from app.models import Book, Member, Borrowing, Staff
+from app.partitions import ensure_partitions
+from app.repositories import BorrowingRepository
 from app.utils import hash_password
 
 
@@ -23,6 +25,8 @@ async def clear_database():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
+    # Sample borrowings go back about a month, so cover the previous months too
+    await ensure_partitions(start=datetime.now(UTC) - timedelta(days=60))
     print("Database cleared and tables recreated.")
 
 
@@ -212,6 +216,8 @@ async def seed_borrowings(
     ]
 
     session.add_all(borrowings)
+    await session.flush()
+    await BorrowingRepository(session).recalculate_counters()
     await session.commit()
     print(f"Created {len(borrowings)} borrowing records")
     print(
@@ -66,10 +66,10 @@ async def test_book_service(channel, token):
     stub = books_pb2_grpc.BookServiceStub(channel)
     metadata = [("authorization", f"Bearer {token}")]
 
-    # 1. List Books (Unprotected)
-    print("Test GetBooks (Unprotected):")
+    # 1. List Books (Protected)
+    print("Test GetBooks (Protected):")
     list_req = books_pb2.GetBooksRequest()
-    response = await stub.GetBooks(list_req)
+    response = await stub.GetBooks(list_req, metadata=metadata)
     print(f"Found {len(response.books)} books")
 
     # 2. Create Book (Protected)
@@ -0,0 +1,106 @@
+import pytest
+
+from app.load_shedding import AdaptiveLimiter, Priority, route_priority
+
+SAMPLES_PER_WINDOW = 200
+FAST, SLOW = 0.01, 0.1
+
+
+@pytest.fixture
+def limiter() -> AdaptiveLimiter:
+    # Windows close on sample count alone, so every run_window is one update
+    return AdaptiveLimiter(
+        initial=20,
+        min_limit=4,
+        max_limit=100,
+        window_seconds=0,
+        window_min_samples=SAMPLES_PER_WINDOW,
+    )
+
+
+def fill(limiter: AdaptiveLimiter, priority: Priority) -> int:
+    admitted = 0
+    while limiter.try_acquire(priority):
+        admitted += 1
+    return admitted
+
+
+def run_window(limiter: AdaptiveLimiter, latency: float) -> None:
+    """Fill the limit, then finish a full window of requests at `latency`."""
+    admitted = fill(limiter, Priority.CRITICAL)
+    for _ in range(admitted):
+        limiter.release(latency)
+    for _ in range(SAMPLES_PER_WINDOW - admitted):
+        assert limiter.try_acquire(Priority.CRITICAL)
+        limiter.release(latency)
+
+
+def test_low_priority_is_shed_before_critical(limiter):
+    assert fill(limiter, Priority.LOW) == 15
+    assert fill(limiter, Priority.NORMAL) == 3
+    assert fill(limiter, Priority.CRITICAL) == 2
+    assert not limiter.try_acquire(Priority.CRITICAL)
+
+
+def test_limit_shrinks_when_latency_rises_and_grows_back(limiter):
+    for _ in range(5):
+        run_window(limiter, FAST)
+    steady = limiter.limit
+    assert steady > 20
+
+    for _ in range(5):
+        run_window(limiter, SLOW)
+    overloaded = limiter.limit
+    assert overloaded < steady
+
+    for _ in range(5):
+        run_window(limiter, FAST)
+    assert limiter.limit > overloaded
+
+
+def test_limit_stays_within_bounds():
+    limiter = AdaptiveLimiter(
+        initial=20,
+        min_limit=16,
+        max_limit=24,
+        window_seconds=0,
+        window_min_samples=SAMPLES_PER_WINDOW,
+    )
+    run_window(limiter, FAST)
+    for _ in range(10):
+        run_window(limiter, SLOW)
+    assert limiter.limit == 16
+
+    for _ in range(50):
+        run_window(limiter, FAST)
+    assert limiter.limit == 24
+
+
+def test_releases_without_latency_do_not_feed_the_gradient(limiter):
+    run_window(limiter, FAST)
+    limit = limiter.limit
+
+    for _ in range(10 * SAMPLES_PER_WINDOW):
+        assert limiter.try_acquire(Priority.LOW)
+        limiter.release(None)
+
+    assert limiter.limit == limit
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "priority"),
+    [
+        ("POST", "/api/borrowings/borrow", Priority.CRITICAL),
+        ("PUT", "/api/borrowings/return", Priority.CRITICAL),
+        ("POST", "/api/borrowings/borrow/", Priority.CRITICAL),
+        ("GET", "/api/books", Priority.LOW),
+        ("GET", "/api/borrowings/history", Priority.LOW),
+        ("GET", "/api/borrowings/members/7", Priority.LOW),
+        ("POST", "/api/books", Priority.NORMAL),
+        ("PUT", "/api/members/7", Priority.NORMAL),
+        ("POST", "/api/auth/login", Priority.NORMAL),
+    ],
+)
+def test_route_priority(method, path, priority):
+    assert route_priority(method, path) == priority
@@ -0,0 +1,87 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app import models
+from app.exceptions import InvalidCredentialsError
+from app.repositories.unit_of_work import UnitOfWork
+from app.schemas import StaffCreate
+from app.services.auth_service import AuthService
+from app.utils import hash_refresh_token
+
+PASSWORD = "correct horse"
+
+
+@pytest.fixture
+async def auth(session) -> AuthService:
+    service = AuthService(UnitOfWork(session))
+    await service.register_staff(
+        StaffCreate(username="ada", email="ada@example.com", password=PASSWORD)
+    )
+    return service
+
+
+async def login(auth: AuthService):
+    return await auth.login("ada@example.com", PASSWORD)
+
+
+async def token_count(session) -> int:
+    return await session.scalar(select(func.count()).select_from(models.RefreshToken))
+
+
+async def test_refresh_token_works_once(auth):
+    first = await login(auth)
+
+    second = await auth.refresh(first.refresh_token)
+    assert second.refresh_token != first.refresh_token
+
+    with pytest.raises(InvalidCredentialsError):
+        await auth.refresh(first.refresh_token)
+
+
+async def test_replayed_token_revokes_the_whole_family(auth):
+    first = await login(auth)
+    second = await auth.refresh(first.refresh_token)
+    other_session = await login(auth)
+
+    with pytest.raises(InvalidCredentialsError):
+        await auth.refresh(first.refresh_token)
+
+    # The newest link dies with the chain; other logins are untouched
+    with pytest.raises(InvalidCredentialsError):
+        await auth.refresh(second.refresh_token)
+    assert await auth.refresh(other_session.refresh_token)
+
+
+async def test_expired_token_is_rejected_and_swept(auth, session):
+    token = await login(auth)
+    token_hash = hash_refresh_token(token.refresh_token)
+    await session.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.token_hash == token_hash)
+        .values(expires_at=datetime.now(UTC) - timedelta(seconds=1))
+    )
+    await session.commit()
+
+    with pytest.raises(InvalidCredentialsError):
+        await auth.refresh(token.refresh_token)
+
+    # Issuing any new token clears out expired ones
+    await login(auth)
+    assert await auth.uow.refresh_tokens.get_token_by_hash(token_hash) is None
+    assert await token_count(session) == 1
+
+
+async def test_delete_expired_honours_the_limit(session):
+    tokens = UnitOfWork(session).refresh_tokens
+    now = datetime.now(UTC)
+    for i in range(3):
+        await tokens.create_token(1, "family", f"expired-{i}", now - timedelta(days=1))
+    await tokens.create_token(1, "family", "live", now + timedelta(days=1))
+    await session.flush()
+
+    assert await tokens.delete_expired(2) == 2
+    assert await tokens.delete_expired(2) == 1
+    assert await tokens.delete_expired(2) == 0
+    assert await token_count(session) == 1
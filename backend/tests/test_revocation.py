@@ -0,0 +1,55 @@
+import pytest
+
+from app.auth_cache import TOKEN_CACHE
+from app.revocation import RevocationList, revoke_token
+from app.utils import create_access_token, decode_access_token, verify_access_token
+
+
+@pytest.fixture(autouse=True)
+def empty_token_cache():
+    TOKEN_CACHE.clear()
+    yield
+    TOKEN_CACHE.clear()
+
+
+async def revoke(token: str) -> None:
+    claims = decode_access_token(token)
+    await revoke_token(claims["jti"], claims["exp"])
+
+
+async def test_revoked_token_is_rejected():
+    token = create_access_token({"sub": "1"})
+
+    await revoke(token)
+
+    assert verify_access_token(token) is None
+
+
+async def test_revocation_applies_to_a_cached_token():
+    token = create_access_token({"sub": "1"})
+    assert verify_access_token(token) == "1"
+    assert len(TOKEN_CACHE) == 1
+
+    await revoke(token)
+
+    assert verify_access_token(token) is None
+
+
+async def test_other_tokens_stay_valid():
+    token, other = create_access_token({"sub": "1"}), create_access_token({"sub": "1"})
+
+    await revoke(token)
+
+    assert verify_access_token(other) == "1"
+
+
+def test_purge_forgets_expired_ids():
+    revoked = RevocationList(capacity=8)
+    revoked.add("expired", 0)
+    revoked.add("live", 2**40)
+
+    revoked.purge()
+
+    assert not revoked.is_revoked("expired")
+    assert revoked.is_revoked("live")
+    assert len(revoked) == 1
@@ -0,0 +1,247 @@
+"""
+Cost of turning rows into gRPC messages: the previous conversion (a
+Timestamp per datetime via FromDatetime, every nested book and member built
+again) vs the converters in app/grpc_handlers, cold and with their
+serialized-message caches warm.
+
+Run from the repository root with the backend environment configured:
+
+    python benchmarks/benchmark_proto_conversion.py
+
+Rows are built in memory, so no database is needed.
+"""
+
+import statistics
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from google.protobuf.timestamp_pb2 import Timestamp  # noqa: E402
+
+from app import models  # noqa: E402
+from app.grpc_handlers.books_handler import BOOK_MESSAGES, book_to_proto  # noqa: E402
+from app.grpc_handlers.borrowings_handler import borrowings_to_proto  # noqa: E402
+from app.grpc_handlers.members_handler import MEMBER_MESSAGES  # noqa: E402
+from app.schemas import BookResponse, BorrowResponse  # noqa: E402
+from protos import books_pb2, borrowings_pb2, members_pb2  # noqa: E402
+
+ROWS = 10_000
+BOOKS_BORROWED = 500
+MEMBERS_BORROWING = 200
+ROUNDS = 5
+
+
+def make_books(count: int) -> list[models.Book]:
+    now = datetime.now(UTC)
+    return [
+        models.Book(
+            id=i,
+            title=f"Title {i}",
+            author=f"Author {i % 300}",
+            isbn=f"978{i:010d}",
+            description="A book about books. " * 5,
+            is_available=True,
+            total_copies=3,
+            available_copies=2,
+            total_borrows=i % 40,
+            active_loans=1,
+            last_borrowed_at=now - timedelta(hours=i % 500),
+            version=1,
+            created_at=now - timedelta(days=i % 900),
+            updated_at=now - timedelta(minutes=i % 700),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_members(count: int) -> list[models.Member]:
+    now = datetime.now(UTC)
+    return [
+        models.Member(
+            id=i,
+            name=f"Member {i}",
+            email=f"member{i}@example.com",
+            phone=f"{5550000000 + i}",
+            total_borrows=i % 25,
+            active_loans=1,
+            last_borrowed_at=now - timedelta(hours=i % 300),
+            version=1,
+            created_at=now - timedelta(days=i % 700),
+            updated_at=now - timedelta(minutes=i % 500),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_borrowings(count: int) -> list[models.Borrowing]:
+    books = make_books(BOOKS_BORROWED)
+    members = make_members(MEMBERS_BORROWING)
+    now = datetime.now(UTC)
+    return [
+        models.Borrowing(
+            id=i,
+            book_id=books[i % BOOKS_BORROWED].id,
+            member_id=members[i % MEMBERS_BORROWING].id,
+            book=books[i % BOOKS_BORROWED],
+            member=members[i % MEMBERS_BORROWING],
+            borrowed_date=now - timedelta(days=i % 60),
+            due_date=now + timedelta(days=14 - i % 60),
+            returned_date=now if i % 3 == 0 else None,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+# The conversion as it was: a Timestamp per datetime, nothing shared
+
+
+def legacy_timestamp(dt: datetime) -> Timestamp:
+    ts = Timestamp()
+    ts.FromDatetime(dt)
+    return ts
+
+
+def legacy_book(book) -> books_pb2.Book:
+    if isinstance(book, dict):
+        book = BookResponse.model_validate(book)
+    return books_pb2.Book(
+        id=book.id,
+        title=book.title,
+        author=book.author,
+        isbn=book.isbn,
+        description=book.description or "",
+        is_available=book.is_available,
+        created_at=legacy_timestamp(book.created_at),
+        updated_at=legacy_timestamp(book.updated_at),
+        total_copies=book.total_copies,
+        available_copies=book.available_copies,
+        total_borrows=book.total_borrows,
+        active_loans=book.active_loans,
+        last_borrowed_at=(
+            legacy_timestamp(book.last_borrowed_at) if book.last_borrowed_at else None
+        ),
+        version=book.version,
+    )
+
+
+def legacy_member(member) -> members_pb2.Member:
+    return members_pb2.Member(
+        id=member.id,
+        name=member.name or "",
+        email=member.email,
+        phone=member.phone or "",
+        created_at=legacy_timestamp(member.created_at),
+        updated_at=legacy_timestamp(member.updated_at),
+        total_borrows=member.total_borrows,
+        active_loans=member.active_loans,
+        last_borrowed_at=(
+            legacy_timestamp(member.last_borrowed_at)
+            if member.last_borrowed_at
+            else None
+        ),
+        version=member.version,
+    )
+
+
+def legacy_borrowing(borrowing) -> borrowings_pb2.BorrowResponse:
+    if isinstance(borrowing, dict):
+        borrowing = BorrowResponse.model_validate(borrowing)
+    return borrowings_pb2.BorrowResponse(
+        id=borrowing.id,
+        book_id=borrowing.book_id,
+        member_id=borrowing.member_id,
+        due_date=(legacy_timestamp(borrowing.due_date) if borrowing.due_date else None),
+        borrowed_date=legacy_timestamp(borrowing.borrowed_date),
+        status="RETURNED" if borrowing.returned_date else "BORROWED",
+        returned_date=(
+            legacy_timestamp(borrowing.returned_date)
+            if borrowing.returned_date
+            else None
+        ),
+        book=legacy_book(borrowing.book),
+        member=legacy_member(borrowing.member),
+    )
+
+
+def clear_caches() -> None:
+    BOOK_MESSAGES.clear()
+    MEMBER_MESSAGES.clear()
+
+
+def bench(convert, rows, cold: bool = False) -> float:
+    """Median milliseconds to convert all rows."""
+    timings = []
+    for _ in range(ROUNDS):
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        convert(rows)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e3
+
+
+def report(name: str, before_ms: float, cases: list[tuple[str, float]]) -> None:
+    line = f"{name:<24} before {before_ms:7.1f}ms"
+    for label, ms in cases:
+        line += f"  {label} {ms:7.1f}ms ({before_ms / ms:4.1f}x)"
+    print(line)
+
+
+def main():
+    books = make_books(ROWS)
+    borrowings = make_borrowings(ROWS)
+    # As the services keep them in Redis
+    cached_books = jsonable_encoder(books)
+    cached_borrowings = jsonable_encoder(
+        [BorrowResponse.model_validate(b, from_attributes=True) for b in borrowings]
+    )
+
+    def legacy_books(rows):
+        return [legacy_book(book) for book in rows]
+
+    def new_books(rows):
+        return [book_to_proto(book) for book in rows]
+
+    def legacy_borrowings(rows):
+        return [legacy_borrowing(borrowing) for borrowing in rows]
+
+    # Same messages either way
+    clear_caches()
+    assert legacy_books(books) == new_books(books) == new_books(books)
+    assert legacy_borrowings(borrowings) == borrowings_to_proto(borrowings)
+    assert legacy_books(cached_books) == new_books(cached_books)
+    assert legacy_borrowings(cached_borrowings) == borrowings_to_proto(
+        cached_borrowings
+    )
+
+    print(
+        f"--- {ROWS} rows, median of {ROUNDS} rounds "
+        f"(borrowings share {BOOKS_BORROWED} books and {MEMBERS_BORROWING} members) ---"
+    )
+    for name, rows, legacy, new in (
+        ("books (ORM)", books, legacy_books, new_books),
+        ("books (Redis JSON)", cached_books, legacy_books, new_books),
+        ("borrowings (ORM)", borrowings, legacy_borrowings, borrowings_to_proto),
+        (
+            "borrowings (Redis JSON)",
+            cached_borrowings,
+            legacy_borrowings,
+            borrowings_to_proto,
+        ),
+    ):
+        report(
+            name,
+            bench(legacy, rows),
+            [("cold", bench(new, rows, cold=True)), ("warm", bench(new, rows))],
+        )
+    print(
+        f"\ncached messages: {len(BOOK_MESSAGES)} books, {len(MEMBER_MESSAGES)} members"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Per-call overhead of building lookup statements inline vs reusing the
+prebuilt statements in app/repositories/statements.py.
+
+Run from the repository root with the backend environment configured:
+
+    python benchmarks/benchmark_statements.py
+
+The statement section needs no database. The query section runs
+get_book_by_id / get_member_by_id style lookups against DATABASE_URL and is
+skipped if the database is unreachable or empty.
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from sqlalchemy import select  # noqa: E402
+
+from app import models  # noqa: E402
+from app.database import AsyncSessionLocal, engine  # noqa: E402
+from app.repositories.statements import BOOK_BY_ID, MEMBER_BY_ID  # noqa: E402
+
+ITERATIONS = 20_000
+QUERIES = 2_000
+
+
+def inline_book(book_id):
+    return select(models.Book).where(models.Book.id == book_id), {}
+
+
+def prebuilt_book(book_id):
+    return BOOK_BY_ID, {"book_id": book_id}
+
+
+def inline_member(member_id):
+    return select(models.Member).where(models.Member.id == member_id), {}
+
+
+def prebuilt_member(member_id):
+    return MEMBER_BY_ID, {"member_id": member_id}
+
+
+def bench_statements(build):
+    """Build the statement and look up its compiled-cache key, as execute() does."""
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        stmt, _ = build(i)
+        stmt._generate_cache_key()
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+async def bench_queries(build, ids):
+    latencies = []
+    async with AsyncSessionLocal() as db:
+        for i in range(QUERIES):
+            start = time.perf_counter()
+            stmt, params = build(ids[i % len(ids)])
+            result = await db.execute(stmt, params)
+            result.scalars().first()
+            latencies.append(time.perf_counter() - start)
+            db.expunge_all()
+    p95 = statistics.quantiles(latencies, n=20)[18]
+    return statistics.mean(latencies) * 1e6, p95 * 1e6
+
+
+async def main():
+    print(f"--- Statement build + cache key ({ITERATIONS} calls) ---")
+    for name, inline, prebuilt in (
+        ("book by id", inline_book, prebuilt_book),
+        ("member by id", inline_member, prebuilt_member),
+    ):
+        inline_us = bench_statements(inline)
+        prebuilt_us = bench_statements(prebuilt)
+        print(
+            f"{name:<14} inline {inline_us:7.2f}us  prebuilt {prebuilt_us:7.2f}us  "
+            f"saved {inline_us - prebuilt_us:7.2f}us/call"
+        )
+
+    print(f"\n--- Lookups against the database ({QUERIES} queries) ---")
+    try:
+        async with AsyncSessionLocal() as db:
+            book_ids = (
+                (await db.execute(select(models.Book.id).limit(100))).scalars().all()
+            )
+            member_ids = (
+                (await db.execute(select(models.Member.id).limit(100))).scalars().all()
+            )
+    except Exception as e:
+        print(f"Skipped: database unavailable ({e.__class__.__name__})")
+        await engine.dispose()
+        return
+
+    try:
+        for name, ids, inline, prebuilt in (
+            ("get_book_by_id", book_ids, inline_book, prebuilt_book),
+            ("get_member_by_id", member_ids, inline_member, prebuilt_member),
+        ):
+            if not ids:
+                print(f"{name:<17} skipped: no rows, run seed_data.py first")
+                continue
+            # Warm the pool, compiled cache and prepared statements first
+            await bench_queries(inline, ids)
+            await bench_queries(prebuilt, ids)
+            inline_avg, inline_p95 = await bench_queries(inline, ids)
+            prebuilt_avg, prebuilt_p95 = await bench_queries(prebuilt, ids)
+            print(
+                f"{name:<17} inline avg {inline_avg:8.1f}us p95 {inline_p95:8.1f}us | "
+                f"prebuilt avg {prebuilt_avg:8.1f}us p95 {prebuilt_p95:8.1f}us"
+            )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())